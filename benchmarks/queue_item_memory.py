@@ -0,0 +1,96 @@
+"""
+Memory benchmark for QueueItem.
+
+Builds queues of 10k, 100k, and 1M items shaped like real playlists,
+i.e., runs of tracks sharing the same artist, album, and artwork URL,
+and reports how many bytes each item takes up. For comparison, the same
+queues are also built out of a plain dataclass with the same fields.
+
+Each queue is built twice: once with every track distinct, and once
+with every track queued OVERLAP times, as if the same playlist were
+queued in several guilds at once.
+
+Run from the repository root:
+    python -m benchmarks.queue_item_memory [SIZE ...]
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Callable, List, Optional
+
+from dataclass.queue_item import QueueItem
+from dataclass.track_metadata import TrackMetadata
+
+# Plain dataclass with the same fields as QueueItem, i.e., with a
+# per-instance __dict__, without string interning, and without sharing
+# metadata between items
+PlainQueueItem = make_dataclass(
+    'PlainQueueItem',
+    [('requester', int), ('start_time', Optional[int], None)] +
+    [(field.name, field.type, field) for field in fields(TrackMetadata)]
+)
+
+# Number of tracks in each album
+ALBUM_SIZE = 12
+
+# Number of times each track is queued in the overlapping queues
+OVERLAP = 10
+
+
+def make_items(cls: Callable, count: int, overlap: int) -> List:
+    """
+    Builds a queue of `count` items, with each track appearing `overlap` times.
+
+    Every string is built at runtime, as it would be when parsing an API
+    response, so that equal strings are distinct objects unless interned.
+    """
+    items = []
+    for j in range(count):
+        i = j // overlap
+        album = i // ALBUM_SIZE
+        items.append(cls(
+            requester=123456789012345678,
+            spotify_id=f'{i:022d}',
+            isrc=f'USRC1{i:07d}',
+            artwork=f'https://i.scdn.co/image/ab67616d0000b273{album:024x}',
+            title=f'Track {i}',
+            artist=f'Artist {album}',
+            author=f'Artist {album}, Featured Artist {album}',
+            album=f'Album {album}',
+            duration=180000 + i % 60000
+        ))
+    return items
+
+
+def measure(cls: Callable, count: int, overlap: int = 1) -> float:
+    """
+    Returns the number of bytes allocated per item for a queue of `count` items.
+    """
+    gc.collect()
+    tracemalloc.start()
+    items = make_items(cls, count, overlap)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / count
+
+
+def main():
+    """
+    Runs the benchmark and prints a table of results.
+    """
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+
+    print(f'{"items":>10} {"overlap":>8} {"QueueItem":>12} {"plain":>12} {"saved":>8}')
+    for count in sizes:
+        for overlap in (1, OVERLAP):
+            slotted = measure(QueueItem, count, overlap)
+            plain = measure(PlainQueueItem, count, overlap)
+            saved = 1 - slotted / plain
+            print(f'{count:>10} {overlap:>7}x {slotted:>10.1f} B {plain:>10.1f} B {saved:>7.1%}')
+
+
+if __name__ == '__main__':
+    main()
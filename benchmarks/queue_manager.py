@@ -0,0 +1,464 @@
+"""
+Benchmark and randomized correctness check for QueueManager.
+
+The benchmark times extend(), insert(), remove(), move(), shuffle(),
+calc_next_index(), and current_shuffled_index at 10^3 to 10^6 items,
+for a plain queue, a shuffled queue, and a shuffled queue looping all tracks.
+
+The check runs long random sequences of queue operations against both
+QueueManager and a naive list-based reference model, and compares them
+after every step, including after reloading the queue from the database.
+
+Each QueueManager uses an in-memory SQLite database, so timings include
+the cost of persisting the queue. Importing the player cog loads the bot's
+configuration, so run this with the same config.yml or environment
+variables as the bot, from the repository root:
+    python -m benchmarks.queue_manager bench [SIZE ...]
+    python -m benchmarks.queue_manager check [--seeds N] [--steps N]
+"""
+
+import random
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Callable, List, Optional
+
+from cogs.player.queue import QueueManager
+from database import Database
+from dataclass.queue_item import QueueItem
+from utils.exceptions import EmptyQueueError, EndOfQueueError
+
+GUILD_ID = 1
+
+# How many times each cheap operation is timed per configuration
+REPETITIONS = 1000
+
+# How many times shuffle() is timed per configuration
+SHUFFLE_REPETITIONS = 3
+
+
+def make_items(start: int, count: int) -> List[QueueItem]:
+    """
+    Builds `count` distinct queue items.
+    """
+    return [QueueItem(requester=i % 5, title=f'Track {i}') for i in range(start, start + count)]
+
+
+def new_queue(database: Optional[Database] = None) -> QueueManager:
+    """
+    Creates a QueueManager for a fresh in-memory database,
+    or reloads the queue from an existing one.
+    """
+    if database is None:
+        database = Database(':memory:')
+        database.init_guild(GUILD_ID)
+    return QueueManager(GUILD_ID, database)
+
+
+def time_op(operation: Callable[[], object], repetitions: int) -> float:
+    """
+    Returns the mean time taken by an operation, in microseconds.
+    """
+    start = perf_counter()
+    for _ in range(repetitions):
+        operation()
+    return (perf_counter() - start) / repetitions * 1e6
+
+
+def bench(sizes: List[int]):
+    """
+    Times every operation at each queue size and prints a table of results.
+    """
+    columns = ('extend', 'insert', 'remove', 'move', 'next', 'shuf_idx', 'shuffle')
+    print(f'{"items":>8} {"mode":>9} ' + ' '.join(f'{col:>10}' for col in columns))
+    print(f'{"":>8} {"":>9} ' + ' '.join(f'{"us/item":>10}' if col == 'extend'
+                                          else f'{"us/op":>10}' for col in columns))
+
+    for size in sizes:
+        for mode in ('plain', 'shuffle', 'loopall'):
+            results = bench_queue(size, mode)
+            print(f'{size:>8} {mode:>9} ' + ' '.join(f'{result:>10.1f}' for result in results))
+
+
+def bench_queue(size: int, mode: str) -> List[float]:
+    """
+    Times every operation on a queue of the given size, and returns the timings
+    in microseconds, per item for extend() and per call for everything else.
+
+    :param mode: 'plain', 'shuffle', or 'loopall'.
+    """
+    rng = random.Random(size)
+    queue = new_queue()
+    items = make_items(0, size)
+
+    start = perf_counter()
+    queue.extend(items)
+    extend_us = (perf_counter() - start) / size * 1e6
+
+    if mode != 'plain':
+        queue.shuffle()
+    if mode == 'loopall':
+        # Sit on the last track so that calc_next_index() has to wrap around
+        queue.is_looping_all = True
+        queue.current_index = queue.calc_next_index(delta=-1)
+
+    next_id = size
+    def insert():
+        nonlocal next_id
+        queue.insert(make_items(next_id, 1)[0], rng.randrange(queue.size + 1))
+        next_id += 1
+
+    def remove():
+        index = rng.randrange(queue.size)
+        if index != queue.current_shuffled_index:
+            queue.remove(index)
+
+    def move():
+        source, dest = rng.sample(range(queue.size), 2)
+        if source != queue.current_shuffled_index:
+            queue.move(source, dest)
+
+    return [
+        extend_us,
+        time_op(insert, REPETITIONS),
+        time_op(remove, REPETITIONS),
+        time_op(move, REPETITIONS),
+        time_op(queue.calc_next_index, REPETITIONS),
+        time_op(lambda: queue.current_shuffled_index, REPETITIONS),
+
+        # Last, since this leaves even the plain queue shuffled
+        time_op(queue.shuffle, SHUFFLE_REPETITIONS)
+    ]
+
+
+class ReferenceQueue:
+    """
+    Naive model of QueueManager built on plain lists, where every
+    operation is as simple as possible rather than as fast as possible.
+    """
+    def __init__(self):
+        self.items: List[QueueItem] = []
+        self.order: List[QueueItem] = [] # Shuffle order, empty if not shuffling
+        self.current: Optional[QueueItem] = None
+        self.loop_one = False
+        self.loop_all = False
+
+    @property
+    def visible(self) -> List[QueueItem]:
+        """
+        Returns the items in the order they are played.
+        """
+        return self.order if len(self.order) > 0 else self.items
+
+    def next_item(self, delta: int, loop_one: Optional[bool] = None) -> QueueItem:
+        """
+        Returns the item `delta` places away from the current one in play order,
+        or the current one if looping it.
+        """
+        assert self.current is not None
+        if loop_one is None:
+            loop_one = self.loop_one
+        if loop_one:
+            return self.current
+
+        pos = self.visible.index(self.current) + delta
+        if not 0 <= pos < len(self.items):
+            if not self.loop_all:
+                raise EndOfQueueError
+            pos = 0 if delta > 0 else len(self.items) - 1
+        return self.visible[pos]
+
+    def extend(self, items: List[QueueItem]):
+        """
+        Mirrors QueueManager.extend().
+        """
+        if len(self.items) == 0:
+            self.current = items[0]
+        self.items.extend(items)
+        if len(self.order) > 0:
+            self.order.extend(items)
+
+    def insert(self, item: QueueItem, index: int):
+        """
+        Mirrors QueueManager.insert().
+        """
+        if len(self.order) > 0:
+            self.items.append(item)
+            self.order.insert(index, item)
+        else:
+            self.items.insert(index, item)
+
+    def move(self, source: int, dest: int):
+        """
+        Mirrors QueueManager.move().
+        """
+        if self.visible[source] is self.current:
+            raise IndexError('Cannot move the current track.')
+        self.visible.insert(dest, self.visible.pop(source))
+
+    def remove_item(self, item: QueueItem):
+        """
+        Removes an item from both orders.
+        """
+        self.items.remove(item)
+        if len(self.order) > 0:
+            self.order.remove(item)
+
+    def remove(self, index: int) -> QueueItem:
+        """
+        Mirrors QueueManager.remove().
+        """
+        item = self.visible[index]
+        if item is self.current:
+            if len(self.items) == 1:
+                self.current = None
+            else:
+                # Removing the current track moves on even if looping it
+                try:
+                    self.current = self.next_item(1, loop_one=False)
+                except EndOfQueueError:
+                    self.current = self.next_item(-1, loop_one=False)
+        self.remove_item(item)
+        return item
+
+    def remove_many(self, indices: List[int]) -> List[QueueItem]:
+        """
+        Mirrors QueueManager.remove_many().
+        """
+        removed = [
+            item for i, item in enumerate(self.visible)
+            if i in indices and item is not self.current
+        ]
+        for item in removed:
+            self.remove_item(item)
+        return removed
+
+
+def compare(queue: QueueManager, model: ReferenceQueue, step: int, operation: str):
+    """
+    Checks that a QueueManager and the reference model agree.
+    """
+    where = f'step {step} ({operation})'
+    assert list(queue.queue) == model.items, f'queue differs at {where}'
+    assert queue.is_shuffling == (len(model.order) > 0), f'shuffle state differs at {where}'
+    assert list(queue.shuffled_queue) == model.visible, f'shuffled queue differs at {where}'
+    if model.current is None:
+        assert queue.current_index == -1, f'current track differs at {where}'
+        return
+
+    assert queue.current is model.current, f'current track differs at {where}'
+    assert queue.current_index == model.items.index(model.current), \
+        f'current index differs at {where}'
+    assert queue.current_shuffled_index == model.visible.index(model.current), \
+        f'current shuffled index differs at {where}'
+    for delta in (1, -1):
+        try:
+            expected: Optional[QueueItem] = model.next_item(delta)
+        except EndOfQueueError:
+            expected = None
+        try:
+            actual: Optional[QueueItem] = queue.queue[queue.calc_next_index(delta=delta)]
+        except EndOfQueueError:
+            actual = None
+        assert actual is expected, f'next track ({delta:+d}) differs at {where}'
+
+
+def raises(error: type, operation: Callable[[], object]) -> bool:
+    """
+    Returns whether an operation raised the given error.
+    """
+    try:
+        operation()
+    except error:
+        return True
+    return False
+
+
+class Check:
+    """
+    Random sequence of operations on a QueueManager and the reference model.
+    Every operation is applied to both, if applicable to the current queue.
+    """
+    OPERATIONS = (
+        'extend', 'insert', 'insert', 'remove', 'remove', 'remove_many', 'move', 'move',
+        'shuffle', 'unshuffle', 'skip', 'skip', 'rewind', 'loop_one', 'loop_all', 'reload'
+    )
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.database = Database(':memory:')
+        self.database.init_guild(GUILD_ID)
+        self.queue = new_queue(self.database)
+        self.model = ReferenceQueue()
+        self.next_id = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the queue.
+        """
+        return len(self.model.items)
+
+    def run(self, steps: int):
+        """
+        Runs the given number of random operations,
+        comparing the queue and the model after every one.
+        """
+        for step in range(steps):
+            operation = self.rng.choice(self.OPERATIONS)
+            getattr(self, operation)()
+
+            try:
+                compare(self.queue, self.model, step, operation)
+            except EmptyQueueError as err:
+                raise AssertionError(f'unexpected EmptyQueueError at step {step}') from err
+
+    def new_items(self, count: int) -> List[QueueItem]:
+        """
+        Builds items that are distinct from every item built so far.
+        """
+        items = make_items(self.next_id, count)
+        self.next_id += count
+        return items
+
+    def extend(self):
+        """
+        Appends a few items.
+        """
+        items = self.new_items(self.rng.randint(1, 20))
+        self.queue.extend(items)
+        self.model.extend(items)
+
+    def insert(self):
+        """
+        Inserts an item at a random index.
+        """
+        if self.size > 0:
+            item = self.new_items(1)[0]
+            index = self.rng.randint(0, self.size)
+            self.queue.insert(item, index)
+            self.model.insert(item, index)
+
+    def remove(self):
+        """
+        Removes an item at a random index.
+        """
+        if self.size > 0:
+            index = self.rng.randrange(self.size)
+            assert self.queue.remove(index) is self.model.remove(index)
+
+    def remove_many(self):
+        """
+        Removes items at a few random indices.
+        """
+        if self.size > 0:
+            indices = self.rng.sample(range(self.size), self.rng.randint(1, min(self.size, 10)))
+            assert self.queue.remove_many(indices) == self.model.remove_many(indices)
+
+    def move(self):
+        """
+        Moves an item between two random indices.
+        """
+        if self.size > 1:
+            source, dest = self.rng.sample(range(self.size), 2)
+            expected = raises(IndexError, lambda: self.model.move(source, dest))
+            assert raises(IndexError, lambda: self.queue.move(source, dest)) == expected
+
+    def shuffle(self):
+        """
+        Shuffles the queue. The permutation is random, so the model
+        adopts it after checking that it is valid.
+        """
+        if self.size > 0:
+            self.queue.shuffle()
+            self.model.order = list(self.queue.shuffled_queue)
+            assert self.model.order[0] is self.model.current
+            assert sorted(map(id, self.model.order)) == sorted(map(id, self.model.items))
+
+    def unshuffle(self):
+        """
+        Unshuffles the queue.
+        """
+        self.queue.unshuffle()
+        self.model.order = []
+
+    def step(self, delta: int):
+        """
+        Skips forward or backward by one track.
+        """
+        if self.model.current is None:
+            return
+
+        try:
+            expected: Optional[QueueItem] = self.model.next_item(delta)
+        except EndOfQueueError:
+            expected = None
+
+        if expected is None:
+            assert raises(EndOfQueueError, self.queue.skip if delta > 0 else self.queue.rewind)
+        else:
+            assert (self.queue.skip() if delta > 0 else self.queue.rewind()) is expected
+            self.model.current = expected
+
+    def skip(self):
+        """
+        Skips to the next track.
+        """
+        self.step(1)
+
+    def rewind(self):
+        """
+        Goes back to the previous track.
+        """
+        self.step(-1)
+
+    def loop_one(self):
+        """
+        Toggles looping the current track.
+        """
+        self.model.loop_one = not self.model.loop_one
+        self.queue.is_looping_one = self.model.loop_one
+
+    def loop_all(self):
+        """
+        Toggles looping the whole queue.
+        """
+        self.model.loop_all = not self.model.loop_all
+        self.queue.is_looping_all = self.model.loop_all
+
+    def reload(self):
+        """
+        Restores the queue from the database. Restored items are new objects,
+        so the model is pointed at them.
+        """
+        self.queue = new_queue(self.database)
+        restored = {item.title: item for item in self.queue.queue}
+        self.model.items = [restored[item.title] for item in self.model.items] # type: ignore
+        self.model.order = [restored[item.title] for item in self.model.order] # type: ignore
+        if self.model.current is not None:
+            self.model.current = restored[self.model.current.title] # type: ignore
+
+
+def main():
+    """
+    Parses arguments and runs the benchmark or the check.
+    """
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('bench', help='time queue operations')
+    bench_parser.add_argument('sizes', nargs='*', type=int,
+                              default=[1_000, 10_000, 100_000, 1_000_000])
+    check_parser = subparsers.add_parser('check', help='compare against a reference model')
+    check_parser.add_argument('--seeds', type=int, default=20)
+    check_parser.add_argument('--steps', type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        bench(args.sizes)
+    else:
+        for seed in range(args.seeds):
+            Check(seed).run(args.steps)
+        print(f'OK: {args.seeds} seed(s) x {args.steps} step(s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,8 +7,10 @@ from typing import TYPE_CHECKING
 from nextcord import (Color, Permissions, Interaction, SlashOption, slash_command)
 from nextcord.ext.commands import Cog
 
+from cogs.player.jockey import Jockey
+from cogs.player.jockey_helpers import resolve_bump
 from dataclass.bump import Bump
-
+from utils.exceptions import BumpError
 from utils.url import check_url
 from utils.embeds import CustomEmbed, create_error_embed, create_success_embed
 from utils.logger import create_logger
@@ -69,6 +71,8 @@ class BumpCog(Cog):
             )
 
         self._bot.database.set_bumps_enabled(itx.guild.id, toggle)
+        if isinstance(itx.guild.voice_client, Jockey):
+            itx.guild.voice_client.bump_scheduler.is_enabled = toggle
         status = "Bump playback has been enabled." if toggle \
             else "Bump playback has been disabled."
         return await itx.response.send_message(
@@ -114,8 +118,35 @@ class BumpCog(Cog):
                 )
             )
 
-        self._bot.database.add_bump(itx.guild.id, url, title, author)
-        return await itx.response.send_message(
+        # Resolve the bump now so it can be played later without a lookup
+        if not self._bot.pool_initialized or len(self._bot.pool.nodes) == 0:
+            return await itx.response.send_message(
+                embed=create_error_embed(
+                    message='No Lavalink nodes available. Try again later.'
+                )
+            )
+        await itx.response.defer()
+
+        assert self._bot.config is not None
+        node = self._bot.pool.get_random_node()
+        requester = self._bot.user.id if self._bot.user is not None else itx.guild.me.id
+        try:
+            bump = await resolve_bump(
+                node,
+                self._bot.spotify,
+                Bump(idx=-1, guild_id=itx.guild.id, url=url, title=title, author=author),
+                requester,
+                deezer_enabled=self._bot.config.lavalink_nodes[node.label].deezer
+            )
+        except BumpError as err:
+            return await itx.followup.send(
+                embed=create_error_embed(
+                    message=f'Could not find a playable track for the given URL.\n```{err}```'
+                )
+            )
+
+        self._bot.database.add_bump(bump)
+        return await itx.followup.send(
             embed=create_success_embed(
                 title='Bump added',
                 body='Bump has been successfully added to the database.'
@@ -220,6 +251,8 @@ class BumpCog(Cog):
             )
 
         self._bot.database.set_bump_interval(itx.guild.id, interval)
+        if isinstance(itx.guild.voice_client, Jockey):
+            itx.guild.voice_client.bump_scheduler.interval = interval
         return await itx.response.send_message(
             embed=create_success_embed(
                 title='Interval Changed',
@@ -2,6 +2,8 @@
 DebugCog: Cog for debugging commands.
 """
 
+from collections import Counter
+from math import isfinite
 from typing import TYPE_CHECKING
 
 from nextcord import (Color, Interaction, PartialMessageable, SlashOption,
@@ -9,6 +11,7 @@ from nextcord import (Color, Interaction, PartialMessageable, SlashOption,
 from nextcord.ext import application_checks
 from nextcord.ext.commands import Cog
 
+from cogs.player.jockey import Jockey
 from dataclass.custom_embed import CustomEmbed
 from utils.embeds import create_success_embed
 from utils.logger import create_logger
@@ -29,6 +32,26 @@ Memory  :: {used:.0f} MiB used
 ```
 """
 
+GAP_FORMAT = """
+```asciidoc
+Gaps :: {count} measured
+Mean :: {mean:.1f} ms
+Max  :: {max:.1f} ms
+```
+"""
+
+SHARD_FORMAT = """
+```asciidoc
+{shards}
+```
+"""
+
+SHARD_LINE_FORMAT = ''.join([
+    'Shard {id:<3} :: {latency} latency, {guilds} guild(s), ',
+    '{players} player(s) ({playing} playing)'
+])
+
+
 class DebugCog(Cog):
     """
     Cog for debugging commands.
@@ -140,6 +163,51 @@ class DebugCog(Cog):
                     footer=f'{len(nodes)} total node(s)'
                 ).get())
 
+        # Add the state of every shard in this process
+        pages.append(CustomEmbed(
+            color=Color.purple(),
+            title=':bar_chart:｜Shard stats',
+            description=SHARD_FORMAT.format(shards=self._shard_stats()),
+            footer=f'{len(self._bot.shards)} of {self._bot.shard_count} shard(s) in this process'
+        ).get())
+
+        # Add the silence between tracks in this guild, if playing
+        if itx.guild is not None and isinstance(itx.guild.voice_client, Jockey):
+            gaps = itx.guild.voice_client.gap_histogram
+            pages.append(CustomEmbed(
+                color=Color.purple(),
+                title=f':bar_chart:｜Gaps between tracks in {itx.guild.name}',
+                description=GAP_FORMAT.format(count=gaps.count, mean=gaps.mean, max=gaps.max),
+                fields=[[label, str(count)] for label, count in gaps.buckets if count > 0],
+                footer='Measured from the end of each track to the start of the next'
+            ).get())
+
         # Run paginator
         paginator = Paginator(itx)
         return await paginator.run(pages)
+
+    def _shard_stats(self) -> str:
+        """
+        Lists the latency and the number of guilds and players of every shard.
+        """
+        guilds = Counter(guild.shard_id for guild in self._bot.guilds)
+        players: Counter = Counter()
+        playing: Counter = Counter()
+        for voice_client in self._bot.voice_clients:
+            if isinstance(voice_client, Jockey):
+                shard_id = voice_client.guild.shard_id
+                players[shard_id] += 1
+                if voice_client.playing:
+                    playing[shard_id] += 1
+
+        lines = []
+        for shard_id, shard in sorted(self._bot.shards.items()):
+            latency = shard.latency
+            lines.append(SHARD_LINE_FORMAT.format(
+                id=shard_id,
+                latency='unknown' if not isfinite(latency) else f'{latency * 1000:.0f} ms',
+                guilds=guilds[shard_id],
+                players=players[shard_id],
+                playing=playing[shard_id]
+            ))
+        return '\n'.join(lines)
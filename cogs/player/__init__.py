@@ -2,30 +2,37 @@
 PlayerCog: Cog for controlling the music player.
 """
 
+from asyncio import CancelledError
 from asyncio import TimeoutError as AsyncioTimeoutError
+from asyncio import get_event_loop
+from contextlib import suppress
 from typing import TYPE_CHECKING, Any, Generator, List, Optional
 
+from aiohttp import ClientResponseError
 from mafic import PlayerNotConnected
-from nextcord import (Color, Forbidden, Guild, HTTPException, Interaction,
-                      Member, SlashOption, VoiceState, slash_command)
+from nextcord import (Color, Embed, Forbidden, Guild, HTTPException,
+                      Interaction, Member, Message, SlashOption, StageChannel,
+                      VoiceChannel, VoiceState, slash_command)
 from nextcord.abc import Messageable
-from nextcord.ext import application_checks
+from nextcord.ext import application_checks, tasks
 from nextcord.ext.commands import Cog
-from requests import HTTPError
 
 from dataclass.custom_embed import CustomEmbed
-from utils.constants import RELEASE, SPOTIFY_403_ERR_MSG
+from utils.constants import POSITION_SAVE_INTERVAL, RELEASE, SPOTIFY_403_ERR_MSG
 from utils.embeds import create_error_embed, create_success_embed
 from utils.exceptions import (EmptyQueueError, EndOfQueueError, JockeyError,
                               JockeyException, SpotifyNoResultsError)
 from utils.logger import create_logger
-from utils.paginator import Paginator, list_chunks
+from utils.paginator import Paginator
 from utils.player_checks import check_mutual_voice
 from views.spotify_dropdown import SpotifyDropdownView
 
 from .jockey import Jockey
+from .jockey_helpers import parse_query
 
 if TYPE_CHECKING:
+    from asyncio import Task
+
     from dataclass.queue_item import QueueItem
     from utils.blanco import BlancoBot
 
@@ -41,12 +48,91 @@ class PlayerCog(Cog):
         self._bot = bot
         self._logger = create_logger(self.__class__.__name__)
 
-        # Initialize Lavalink client instance
+        # Initialize Lavalink client instance,
+        # then resume any players that were active before a restart
         if not bot.pool_initialized:
-            bot.loop.create_task(bot.init_pool())
+            bot.loop.create_task(self._init_pool())
+
+        # Periodically save playback positions
+        self._save_positions.start()
 
         self._logger.info('Loaded PlayerCog')
 
+    def cog_unload(self):
+        """
+        Called when the cog is unloaded.
+        """
+        self._save_positions.cancel()
+
+    async def _init_pool(self):
+        """
+        Initializes the Lavalink node pool and resumes saved players.
+        """
+        await self._bot.init_pool()
+        if len(self._bot.pool.nodes) > 0:
+            await self._resume_players()
+
+    async def _resume_players(self):
+        """
+        Reconnects to the voice channels that the bot was playing in before
+        it was restarted, and resumes playback of the saved queues.
+        """
+        for guild_id, channel_id in self._bot.database.get_resumable_guilds():
+            # Leave guilds on other shards to the processes running them
+            if not self._bot.owns_guild(guild_id):
+                continue
+
+            channel = self._bot.get_channel(channel_id)
+            if not isinstance(channel, (StageChannel, VoiceChannel)):
+                self._logger.warning('Cannot resume player in guild %d, channel gone', guild_id)
+                self._bot.database.set_voice_channel(guild_id, -1)
+                continue
+            if channel.guild.voice_client is not None:
+                continue
+
+            # Don't rejoin an empty channel
+            if not any(not member.bot for member in channel.members):
+                self._logger.info('Not resuming player in %s, channel is empty', channel.guild.name)
+                self._bot.database.set_voice_channel(guild_id, -1)
+                continue
+
+            self._logger.info('Resuming player in %s', channel.guild.name)
+            try:
+                jockey = await channel.connect(cls=Jockey) # type: ignore
+                await channel.guild.change_voice_state(channel=channel, self_deaf=True)
+                await self._deafen(channel.guild.me)
+                await jockey.resume_queue()
+            except (AsyncioTimeoutError, EmptyQueueError, JockeyError) as err:
+                self._logger.error(
+                    'Failed to resume player in %s: %s',
+                    channel.guild.name,
+                    err
+                )
+                if isinstance(channel.guild.voice_client, Jockey):
+                    await self._disconnect(
+                        jockey=channel.guild.voice_client,
+                        reason='Could not resume playback after a restart'
+                    )
+
+    @tasks.loop(seconds=POSITION_SAVE_INTERVAL)
+    async def _save_positions(self):
+        """
+        Saves the playback position of every active player.
+        """
+        for voice_client in self._bot.voice_clients:
+            if isinstance(voice_client, Jockey) and voice_client.playing:
+                if not voice_client.paused:
+                    voice_client.queue_manager.save_position(voice_client.position)
+
+    @Cog.listener()
+    async def on_message(self, message: Message):
+        """
+        Called every time a message is sent in a channel the bot can see.
+        In this cog, we use it to count the messages sent after the now playing message.
+        """
+        if message.guild is not None and isinstance(message.guild.voice_client, Jockey):
+            message.guild.voice_client.now_playing_message.count(message)
+
     @Cog.listener()
     async def on_voice_state_update(self, member: Member, before: VoiceState, after: VoiceState):
         """
@@ -84,6 +170,18 @@ class PlayerCog(Cog):
 
         return jockey
 
+    @staticmethod
+    def _discard_lookup(results: 'Task[List[QueueItem]]'):
+        """
+        Stops resolving a query whose tracks will not be played, or retrieves
+        the outcome if it's done, so a failed lookup isn't reported as unhandled.
+        """
+        if not results.done():
+            results.cancel()
+        else:
+            with suppress(CancelledError):
+                results.exception()
+
     async def _deafen(
         self,
         bot_user: Member,
@@ -138,6 +236,9 @@ class PlayerCog(Cog):
             self._logger.warning('Attempted to disconnect disconnected Jockey')
         await jockey.disconnect()
 
+        # Keep the queue, but don't rejoin this channel after a restart
+        self._bot.database.set_voice_channel(jockey.guild.id, -1)
+
         # Send disconnection message
         embed = CustomEmbed(
             title=':wave:｜Disconnected from voice',
@@ -160,6 +261,18 @@ class PlayerCog(Cog):
         # Dispatch disconnect event
         self._bot.dispatch('jockey_disconnect', jockey)
 
+    async def _send_bulk_removal(self, itx: Interaction, removed: List['QueueItem']):
+        """
+        Sends a summary of tracks removed from queue in one go.
+        """
+        if len(removed) == 0:
+            await itx.followup.send(embed=create_error_embed('No tracks to remove'))
+            return
+        await itx.followup.send(embed=create_success_embed(
+            title='Removed from queue',
+            body=f'{len(removed)} track(s)'
+        ))
+
     @slash_command(name='jump')
     @application_checks.check(check_mutual_voice)
     async def jump(
@@ -200,7 +313,7 @@ class PlayerCog(Cog):
             jockey.queue_manager.is_looping_one = True
 
             # Update now playing message
-            await jockey.update_now_playing()
+            jockey.update_now_playing()
 
         return await itx.response.send_message(embed=create_success_embed('Looping current track'))
 
@@ -215,7 +328,7 @@ class PlayerCog(Cog):
             jockey.queue_manager.is_looping_all = True
 
             # Update now playing message
-            await jockey.update_now_playing()
+            jockey.update_now_playing()
 
         return await itx.response.send_message(embed=create_success_embed('Looping entire queue'))
 
@@ -279,7 +392,16 @@ class PlayerCog(Cog):
         # Connect to voice
         await itx.response.defer()
         voice_channel = itx.user.voice.channel
+        results: Optional['Task[List[QueueItem]]'] = None
         if itx.guild.voice_client is None:
+            # Resolve the query in the meantime, on the node the player will most likely use.
+            # Resolved tracks are not tied to a node, so they can be played on any other.
+            node = self._bot.pool.get_node(guild_id=guild_id, endpoint=None)
+            results = get_event_loop().create_task(
+                parse_query(node, self._bot.spotify, query, itx.user.id)
+            )
+
+            connected = False
             try:
                 await voice_channel.connect(cls=Jockey) # type: ignore
                 await voice_channel.guild.change_voice_state(
@@ -287,15 +409,24 @@ class PlayerCog(Cog):
                     self_deaf=True
                 )
                 await self._deafen(itx.guild.me, channel=channel)
+                connected = True
             except AsyncioTimeoutError:
                 return await itx.followup.send(embed=create_error_embed(
                     message='Timed out while connecting to voice. Try again later.'
                 ))
+            finally:
+                if not connected:
+                    self._discard_lookup(results)
 
         # Dispatch to jockey
-        jockey = await self._get_jockey(itx)
         try:
-            track_name = await jockey.play_impl(query, itx.user.id)
+            jockey = await self._get_jockey(itx)
+        except RuntimeError:
+            if results is not None:
+                self._discard_lookup(results)
+            raise
+        try:
+            track_name = await jockey.play_impl(query, itx.user.id, results)
         except JockeyError as err:
             # Disconnect if we're not playing anything
             if not jockey.playing:
@@ -313,14 +444,14 @@ class PlayerCog(Cog):
             self._bot.config.lastfm_api_key is not None and
             self._bot.config.lastfm_shared_secret is not None):
             # Check if the user has connected their Last.fm account
-            if self._bot.database.get_lastfm_credentials(itx.user.id) is not None:
+            if self._bot.credentials.get_lastfm_credentials(itx.user.id) is not None:
                 body.append(f':handshake: {itx.user.mention} is scrobbling to Last.fm!')
             body.append(
                 f':sparkles: [Link Last.fm]({self._bot.config.base_url}) to scrobble as you listen'
             )
 
         # Update now playing message
-        await jockey.update_now_playing()
+        jockey.update_now_playing()
 
         embed = create_success_embed(
             title='Added to queue',
@@ -350,9 +481,9 @@ class PlayerCog(Cog):
 
         # Get the user's playlists
         try:
-            playlists = spotify.get_user_playlists()
-        except HTTPError as err:
-            if err.response is not None and err.response.status_code == 403:
+            playlists = await spotify.get_user_playlists()
+        except ClientResponseError as err:
+            if err.status == 403:
                 return await itx.followup.send(embed=create_error_embed(
                     message=SPOTIFY_403_ERR_MSG.format('get your playlists')
                 ), ephemeral=True)
@@ -413,17 +544,17 @@ class PlayerCog(Cog):
                 ':twisted_rightwards_arrows: Shuffling queue  (`/unshuffle` to disable)'
             )
 
-        # Show queue in chunks of 10 per page
-        pages = []
-        homepage = 0
-        count = 1
-        prefix_len = len(str(len(jockey.queue)))
-        for i, chunk in enumerate(list_chunks(queue)):
-            chunk_tracks = []
+        # Show queue in chunks of 10 per page, rendering each page only when shown
+        guild_name = itx.guild.name
+        prefix_len = len(str(len(queue)))
+        async def render_page(page: int) -> Embed:
+            # Load details for lazily queued tracks on this page
+            start = page * 10
+            await jockey.materialize(jockey.queue_manager.shuffled_indices(start, 10))
 
-            # Create page content
+            chunk_tracks = []
             track: 'QueueItem'
-            for track in chunk:
+            for count, track in enumerate(queue[start:start + 10], start=start + 1):
                 title, artist = track.get_details()
 
                 # Pad index with spaces if necessary
@@ -431,13 +562,7 @@ class PlayerCog(Cog):
                 while len(index) < prefix_len:
                     index = ' ' + index
 
-                # Is this the current track?
-                line_prefix = '  '
-                if count - 1 == current:
-                    line_prefix = '> '
-                    homepage = i
-
-                # Create item line
+                # Create item line, marking the current track
                 line_prefix = '> ' if count - 1 == current else '  '
                 line = f'{line_prefix} {index} :: {title} - {artist}'
 
@@ -447,21 +572,23 @@ class PlayerCog(Cog):
                 else:
                     line = f'{line:50.50}'
                 chunk_tracks.append(line)
-                count += 1
 
             # Create page
             tracks = '\n'.join(chunk_tracks)
             embed_body = embed_header + [f'```asciidoc\n{tracks}```']
-            embed = CustomEmbed(
-                title=f'Queue for {itx.guild.name}',
+            return CustomEmbed(
+                title=f'Queue for {guild_name}',
                 description='\n'.join(embed_body),
                 color=Color.lighter_gray()
-            )
-            pages.append(embed.get())
+            ).get()
 
-        # Run paginator
+        # Run paginator, starting from the page with the current track
         paginator = Paginator(itx)
-        return await paginator.run(pages, start=homepage)
+        return await paginator.run_lazy(
+            (len(queue) + 9) // 10,
+            render_page,
+            start=max(current, 0) // 10
+        )
 
     @slash_command(name='remove')
     @application_checks.check(check_mutual_voice)
@@ -471,31 +598,86 @@ class PlayerCog(Cog):
         position: int = SlashOption(
             description='Position to remove',
             required=True
+        ),
+        end: Optional[int] = SlashOption(
+            description='Remove every track from position up to this one',
+            required=False
         )
     ):
         """
-        Remove a track from queue.
+        Remove a track, or a range of tracks, from queue.
         """
         jockey = await self._get_jockey(itx)
-        if position < 1 or position > jockey.queue_size:
+        last = position if end is None else end
+        if not 1 <= position <= last <= jockey.queue_size:
             return await itx.response.send_message(embed=create_error_embed(
                 message=f'Specify a number from 1 to {str(jockey.queue_size)}.'
             ), ephemeral=True)
-        if position - 1 == jockey.queue_manager.current_index:
+        if end is None and position - 1 == jockey.queue_manager.current_shuffled_index:
             return await itx.response.send_message(embed=create_error_embed(
                 message='You cannot remove the currently playing track.'
             ), ephemeral=True)
 
         # Dispatch to jockey
         await itx.response.defer()
-        title, artist = await jockey.remove(index=position - 1)
-        await itx.followup.send(embed=create_success_embed(
-            title='Removed from queue',
-            body=f'**{title}**\n{artist}'
-        ))
+        if end is None:
+            title, artist = await jockey.remove(index=position - 1)
+            await itx.followup.send(embed=create_success_embed(
+                title='Removed from queue',
+                body=f'**{title}**\n{artist}'
+            ))
+        else:
+            removed = jockey.queue_manager.remove_many(range(position - 1, end))
+            await self._send_bulk_removal(itx, removed)
 
         # Update now playing message
-        await jockey.update_now_playing()
+        jockey.update_now_playing()
+
+    @slash_command(name='dedupe')
+    @application_checks.check(check_mutual_voice)
+    async def dedupe(self, itx: Interaction):
+        """
+        Remove repeats of the same track from queue.
+        """
+        await itx.response.defer()
+        jockey = await self._get_jockey(itx)
+        removed = jockey.queue_manager.dedupe()
+        await self._send_bulk_removal(itx, removed)
+        jockey.update_now_playing()
+
+    @slash_command(name='clear')
+    async def clear(self, itx: Interaction):
+        """
+        Base slash command for removing multiple tracks from queue.
+        """
+
+    @clear.subcommand(name='upcoming', description='Remove every track after the current one.')
+    @application_checks.check(check_mutual_voice)
+    async def clear_upcoming(self, itx: Interaction):
+        """
+        Subcommand for removing every track after the current one.
+        """
+        await itx.response.defer()
+        jockey = await self._get_jockey(itx)
+        removed = jockey.queue_manager.clear_upcoming()
+        await self._send_bulk_removal(itx, removed)
+        jockey.update_now_playing()
+
+    @clear.subcommand(name='requester', description='Remove every track requested by someone.')
+    @application_checks.check(check_mutual_voice)
+    async def clear_requester(
+        self,
+        itx: Interaction,
+        user: Member = SlashOption(description='User whose tracks to remove', required=True)
+    ):
+        """
+        Subcommand for removing every track requested by a user.
+        """
+        await itx.response.defer()
+        jockey = await self._get_jockey(itx)
+        removed = jockey.queue_manager.remove_by_requester(user.id)
+        await self._send_bulk_removal(itx, removed)
+        jockey.update_now_playing()
 
     @slash_command(name='search')
     async def search(
@@ -549,7 +731,7 @@ class PlayerCog(Cog):
                 await itx.followup.send(embed=create_error_embed(str(err.args[0])))
         else:
             # Update now playing message
-            await jockey.update_now_playing()
+            jockey.update_now_playing()
 
             if not quiet:
                 await itx.followup.send(
@@ -594,7 +776,7 @@ class PlayerCog(Cog):
             jockey.queue_manager.is_looping_one = False
 
             # Update now playing message
-            await jockey.update_now_playing()
+            jockey.update_now_playing()
 
         return await itx.response.send_message(
             embed=create_success_embed('Not looping current track')
@@ -612,7 +794,7 @@ class PlayerCog(Cog):
             jockey.queue_manager.is_looping_all = False
 
             # Update now playing message
-            await jockey.update_now_playing()
+            jockey.update_now_playing()
 
         return await itx.response.send_message(
             embed=create_success_embed('Not looping entire queue')
@@ -651,7 +833,7 @@ class PlayerCog(Cog):
                 return await itx.followup.send(embed=create_success_embed('Unshuffled'))
 
             # Update now playing message
-            await jockey.update_now_playing()
+            jockey.update_now_playing()
 
         if not quiet:
             return await itx.followup.send(
@@ -689,4 +871,4 @@ class PlayerCog(Cog):
         await itx.followup.send(embed=create_success_embed(f'Volume set to {volume}'))
 
         # Update now playing message
-        await jockey.update_now_playing()
+        jockey.update_now_playing()
@@ -0,0 +1,140 @@
+"""
+Bump scheduler for the player cog.
+"""
+
+from asyncio import get_event_loop
+from time import time
+from typing import TYPE_CHECKING, Optional
+
+from utils.logger import create_logger
+
+if TYPE_CHECKING:
+    from asyncio import TimerHandle
+
+    from database import Database
+
+
+class BumpScheduler:
+    """
+    Keeps track of when the next bump is due for a guild, so that
+    Blanco's Jockey doesn't have to check the database on every skip.
+
+    The bump settings are read from the database once, and a timer
+    raises the due flag once the bump interval has elapsed.
+    """
+    def __init__(self, guild_id: int, database: 'Database', /):
+        self._guild_id = guild_id
+        self._db = database
+        self._enabled = database.get_bumps_enabled(guild_id)
+        self._interval = database.get_bump_interval(guild_id) * 60
+        self._last_bump = database.get_last_bump(guild_id)
+        self._due = False
+        self._timer: Optional['TimerHandle'] = None
+
+        # Logger
+        self._logger = create_logger(self.__class__.__name__)
+
+        # Start counting from now if no bump has ever been played
+        if self._last_bump == 0:
+            self._last_bump = int(time())
+            self._persist()
+
+        self._schedule()
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Returns whether bumps are enabled for the guild.
+        """
+        return self._enabled
+
+    @is_enabled.setter
+    def is_enabled(self, value: bool):
+        """
+        Sets whether bumps are enabled for the guild.
+        Does not save the setting to the database.
+        """
+        self._enabled = value
+        self._schedule()
+
+    @property
+    def interval(self) -> int:
+        """
+        Returns the bump interval in minutes.
+        """
+        return self._interval // 60
+
+    @interval.setter
+    def interval(self, value: int):
+        """
+        Sets the bump interval in minutes.
+        Does not save the setting to the database.
+        """
+        self._interval = value * 60
+        self._schedule()
+
+    @property
+    def is_due(self) -> bool:
+        """
+        Returns whether a bump should be played at the next opportunity.
+        """
+        return self._enabled and self._due
+
+    def cancel(self):
+        """
+        Stops the timer, e.g., when the player disconnects.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._due = False
+
+    async def mark_played(self):
+        """
+        Restarts the interval after a bump has been played,
+        and saves the new timestamp to the database.
+        """
+        self._last_bump = int(time())
+        self._schedule()
+        await self._db.run(self._db.set_last_bump, self._guild_id, self._last_bump)
+
+    def snooze(self):
+        """
+        Restarts the interval without recording a bump, e.g., when
+        the guild has bumps enabled but has not added any.
+        """
+        self._last_bump = int(time())
+        self._schedule()
+
+    def _persist(self):
+        """
+        Saves the last bump timestamp to the database.
+        """
+        self._db.set_last_bump(self._guild_id, self._last_bump)
+
+    def _schedule(self):
+        """
+        (Re)starts the timer for the next bump.
+        """
+        self.cancel()
+        if not self._enabled:
+            return
+
+        delay = self._last_bump + self._interval - time()
+        if delay <= 0:
+            self._due = True
+            return
+
+        self._timer = get_event_loop().call_later(delay, self._set_due)
+        self._logger.debug(
+            'Next bump for guild %d due in %d sec',
+            self._guild_id,
+            delay
+        )
+
+    def _set_due(self):
+        """
+        Timer callback that marks a bump as due.
+        """
+        self._timer = None
+        self._due = True
@@ -0,0 +1,86 @@
+"""
+Inter-track gap histogram for the player cog.
+"""
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from utils.constants import GAP_HISTOGRAM_BUCKETS
+
+
+class GapHistogram:
+    """
+    Counts how long a guild's player stays silent between one track
+    finishing and the next one starting, in fixed buckets so that
+    memory use does not grow with the number of tracks played.
+
+    The gap is measured from the track end event to the track start event,
+    i.e., it includes everything Blanco does in between as well as the time
+    Lavalink takes to start streaming the next track.
+    """
+    def __init__(self):
+        self._counts = [0] * (len(GAP_HISTOGRAM_BUCKETS) + 1)
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._ended_at: Optional[float] = None
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of gaps measured.
+        """
+        return sum(self._counts)
+
+    @property
+    def mean(self) -> float:
+        """
+        Returns the mean gap in milliseconds, or 0 if none were measured.
+        """
+        count = self.count
+        return self._total_ms / count if count > 0 else 0.0
+
+    @property
+    def max(self) -> float:
+        """
+        Returns the longest gap in milliseconds, or 0 if none were measured.
+        """
+        return self._max_ms
+
+    @property
+    def buckets(self) -> List[Tuple[str, int]]:
+        """
+        Returns a label and a count for every bucket, in increasing order.
+        """
+        labels = [f'≤ {bound} ms' for bound in GAP_HISTOGRAM_BUCKETS]
+        labels.append(f'> {GAP_HISTOGRAM_BUCKETS[-1]} ms')
+        return list(zip(labels, self._counts))
+
+    def mark_end(self):
+        """
+        Starts measuring a gap, i.e., when a track has finished playing.
+        """
+        self._ended_at = perf_counter()
+
+    def mark_start(self) -> Optional[float]:
+        """
+        Finishes measuring a gap, i.e., when the next track has started playing.
+
+        :return: The gap in milliseconds, or None if no track had just finished.
+        """
+        if self._ended_at is None:
+            return None
+
+        gap_ms = (perf_counter() - self._ended_at) * 1000
+        self._ended_at = None
+        self._counts[bisect_left(GAP_HISTOGRAM_BUCKETS, gap_ms)] += 1
+        self._total_ms += gap_ms
+        self._max_ms = max(self._max_ms, gap_ms)
+        return gap_ms
+
+    def discard(self):
+        """
+        Stops measuring a gap without counting it,
+        e.g., when the queue has ended and nothing will be played next.
+        """
+        self._ended_at = None
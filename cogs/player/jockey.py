@@ -2,33 +2,39 @@
 Music player class for Blanco. Subclass of mafic.Player.
 """
 
-from asyncio import get_event_loop, sleep
+from asyncio import gather, get_event_loop, sleep
 from time import time
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 from mafic import Player, PlayerNotConnected
-from nextcord import (Colour, Forbidden, HTTPException, Message, NotFound,
-                      StageChannel, VoiceChannel)
+from nextcord import Colour, StageChannel, VoiceChannel
 
 from dataclass.custom_embed import CustomEmbed
-from utils.constants import UNPAUSE_THRESHOLD
+from utils.constants import MATCH_AHEAD_WINDOW, SKIP_LOOKAHEAD, UNPAUSE_THRESHOLD
 from utils.embeds import create_error_embed
-from utils.exceptions import (EndOfQueueError, JockeyError, JockeyException,
-                              LavalinkSearchError, SpotifyNoResultsError,
-                              BumpError, BumpNotReadyError, BumpNotEnabledError)
+from utils.exceptions import (EmptyQueueError, EndOfQueueError, JockeyError,
+                              JockeyException, LavalinkSearchError,
+                              SpotifyNoResultsError, BumpError, BumpNotReadyError,
+                              BumpNotEnabledError)
 from utils.musicbrainz import annotate_track
 from utils.time import human_readable_time
-from views.now_playing import NowPlayingView
 
-from .jockey_helpers import (find_lavalink_track, invalidate_lavalink_track,
-                             parse_query)
+from .bump_scheduler import BumpScheduler
+from .gap_histogram import GapHistogram
+from .jockey_helpers import (bump_to_queue_item, find_lavalink_track,
+                             invalidate_lavalink_track, materialize_queue_items,
+                             parse_query, resolve_bump)
+from .now_playing import NowPlayingMessage
 from .queue import QueueManager
 
 if TYPE_CHECKING:
+    from asyncio import Task
+
     from mafic import Track
     from nextcord import Embed
     from nextcord.abc import Connectable, Messageable
 
+    from dataclass.bump import Bump
     from dataclass.queue_item import QueueItem
     from utils.blanco import BlancoBot
 
@@ -54,12 +60,25 @@ class Jockey(Player['BlancoBot']):
         # Pause timestamp
         self._pause_ts: Optional[int] = None
 
-        # Queue
+        # Bump that is currently playing, if any
+        self._bump: Optional['Bump'] = None
+        self._bump_scheduler = BumpScheduler(channel.guild.id, client.database)
+
+        # Queue, restored from database if the guild had one
         self._queue_mgr = QueueManager(channel.guild.id, client.database)
 
+        # Remember the voice channel, so that playback can resume after a restart
+        client.database.set_voice_channel(channel.guild.id, channel.id)
+
         # Volume
         self._volume = client.database.get_volume(channel.guild.id)
 
+        # Silence between tracks
+        self._gaps = GapHistogram()
+
+        # Now playing message
+        self._np_msg = NowPlayingMessage(client, self)
+
         # Logger
         self._logger = client.jockey_logger
         self._logger.info(
@@ -68,6 +87,13 @@ class Jockey(Player['BlancoBot']):
             channel.guild.name
         )
 
+    @property
+    def _bump_requester(self) -> int:
+        """
+        Returns the user ID that bumps are attributed to, i.e., the bot's.
+        """
+        return self._bot.user.id if self._bot.user is not None else self.guild.me.id
+
     @property
     def playing(self) -> bool:
         """
@@ -76,7 +102,28 @@ class Jockey(Player['BlancoBot']):
         return self.current is not None
 
     @property
-    def queue(self) -> List['QueueItem']:
+    def bump_scheduler(self) -> BumpScheduler:
+        """
+        Returns the bump scheduler for the player.
+        """
+        return self._bump_scheduler
+
+    @property
+    def gap_histogram(self) -> GapHistogram:
+        """
+        Returns the histogram of the silence between tracks for the player.
+        """
+        return self._gaps
+
+    @property
+    def now_playing_message(self) -> NowPlayingMessage:
+        """
+        Returns the now playing message for the player.
+        """
+        return self._np_msg
+
+    @property
+    def queue(self) -> Sequence['QueueItem']:
         """
         Returns the player queue.
         """
@@ -121,24 +168,11 @@ class Jockey(Player['BlancoBot']):
         self._volume = value
         self._db.set_volume(self.guild.id, value)
 
-    async def _edit_np_controls(self, show_controls: bool = True):
+    def _edit_np_controls(self, show_controls: bool = True):
         """
-        Edits the now playing message to show or hide controls.
+        Schedules an edit to the now playing message to show or hide controls.
         """
-        view = None
-        if show_controls:
-            view = NowPlayingView(self._bot, self)
-
-        np_msg = await self._get_now_playing()
-        if isinstance(np_msg, Message):
-            try:
-                await np_msg.edit(view=view)
-            except (HTTPException, Forbidden) as exc:
-                self._logger.warning(
-                    'Could not edit now playing message for %s: %s',
-                    self.guild.name,
-                    exc
-                )
+        self._np_msg.request(controls=show_controls)
 
     async def _enqueue(self, index: int, auto: bool = True):
         """
@@ -148,8 +182,11 @@ class Jockey(Player['BlancoBot']):
         :param auto: Whether this is an automatic enqueue, i.e. not part of a user's command.
         """
         try:
+            # Only the track about to be played has to be loaded before playing it
+            await self.materialize([index])
             track = self._queue_mgr.queue[index]
             await self._play(track)
+            self._queue_mgr.save_item(index)
         except PlayerNotConnected:
             if not auto:
                 await self.status_channel.send(embed=create_error_embed(
@@ -160,40 +197,88 @@ class Jockey(Player['BlancoBot']):
             self._logger.error('Failed to enqueue track: %s', err)
             raise
 
+        # We're back to the queue after a bump
+        self._bump = None
+
         # Scrobble if possible
         await self._scrobble(self._queue_mgr.current)
 
         # Update queue index
         self._queue_mgr.current_index = index
 
-    async def _get_now_playing(self) -> Optional[Message]:
-        np_msg_id = self._db.get_now_playing(self.guild.id)
-        if np_msg_id != -1:
-            try:
-                np_msg = await self.status_channel.fetch_message(np_msg_id)
-                return np_msg
-            except (Forbidden, HTTPException, NotFound) as exc:
-                self._logger.warning(
-                    'Failed to fetch now playing message for %s: %s',
-                    self.guild.name,
-                    exc
-                )
+        # Prepare the upcoming tracks now that the track is playing
+        get_event_loop().create_task(self._prepare_ahead(index))
+
+    async def _prepare_ahead(self, index: int):
+        """
+        Fetches the metadata of any lazily queued tracks in the match-ahead window,
+        i.e., the next MATCH_AHEAD_WINDOW tracks to be played starting from
+        the given index, and saves it to the database. Then finds the Lavalink
+        track for the next track, so that handoff() can play it right away.
+
+        :param index: The index of the track that is playing.
+        """
+        if index < 0:
+            return
 
-        return None
+        await self.materialize(self._queue_mgr.lookahead(index, MATCH_AHEAD_WINDOW))
+        await self._resolve_next()
+
+    async def _resolve_next(self):
+        """
+        Finds the Lavalink track for the next track in the queue, if it doesn't
+        have one yet, and saves it to the database. If match-ahead is enabled,
+        this is left to BlancoBot.on_track_start(), which also looks up metadata.
+        """
+        assert self._bot.config is not None
+        if self._bot.config.match_ahead:
+            return
+
+        try:
+            index, item = self._queue_mgr.next_track
+        except (EmptyQueueError, EndOfQueueError):
+            return
+        if item.lavalink_track is not None:
+            return
+
+        try:
+            item.lavalink_track = await self._find_track(item)
+        except LavalinkSearchError as err:
+            # handoff() will fall back to skip(), which reports the error
+            self._logger.debug('Could not find next track `%s\' ahead: %s', item.title, err)
+            return
+
+        # Only save the track if it is still where it was, in case the queue changed
+        queue = self._queue_mgr.queue
+        if index < len(queue) and queue[index] is item:
+            self._queue_mgr.save_item(index)
+
+    async def _finish_handoff(self, finished: 'QueueItem', index: int):
+        """
+        Does everything that _enqueue() would have done before playing
+        the next track, for a track played by handoff().
+
+        Called by handoff() in a separate task.
+
+        :param finished: The track that finished playing.
+        :param index: The index of the track that is now playing.
+        """
+        self._queue_mgr.save_current()
+        self._queue_mgr.save_item(index)
+        await self._scrobble(finished)
+        await self._prepare_ahead(index)
+
+    async def _handoff_slowly(self):
+        """
+        Falls back to skip() for handoff(), and stops measuring the gap
+        between tracks if nothing ended up playing.
+        """
+        await self.skip()
+        if self.current is None:
+            self._gaps.discard()
 
     async def _play(self, item: 'QueueItem', position: Optional[int] = None):
-        if item.lavalink_track is None:
-            try:
-                assert self._bot.config is not None
-                deezer_enabled = self._bot.config.lavalink_nodes[self.node.label].deezer
-                item.lavalink_track = await find_lavalink_track(
-                    self.node,
-                    item,
-                    deezer_enabled=deezer_enabled
-                )
-            except LavalinkSearchError as err:
-                self._logger.critical('Failed to play `%s\'.', item.title)
-                raise JockeyError(err.args[0]) from err
+        await self._resolve(item)
 
         # Play track
         has_retried = False
@@ -240,6 +325,118 @@ class Jockey(Player['BlancoBot']):
         # Save start time for scrobbling
         item.start_time = int(time())
 
+    async def _find_track(self, item: 'QueueItem') -> 'Track':
+        """
+        Looks up a playable Lavalink track for an item on the player's node.
+        See jockey_helpers.find_lavalink_track().
+        """
+        assert self._bot.config is not None
+        deezer_enabled = self._bot.config.lavalink_nodes[self.node.label].deezer
+        return await find_lavalink_track(self.node, item, deezer_enabled=deezer_enabled)
+
+    async def _resolve(self, item: 'QueueItem'):
+        """
+        Finds a playable Lavalink track for an item, if it doesn't have one yet.
+
+        :param item: The item to find a track for.
+        :raises JockeyError: If no playable track could be found.
+        """
+        if item.lavalink_track is not None:
+            return
+
+        try:
+            item.lavalink_track = await self._find_track(item)
+        except LavalinkSearchError as err:
+            self._logger.critical('Failed to play `%s\'.', item.title)
+            raise JockeyError(err.args[0]) from err
+
+    async def _resolve_candidates(
+        self,
+        indices: List[int]
+    ) -> Dict[int, Optional[BaseException]]:
+        """
+        Looks up the tracks to try when skipping at the same time,
+        fetching the metadata of lazily queued tracks first.
+
+        :param indices: The indices of the tracks in the queue.
+        :return: The outcome of each lookup, i.e., None or the exception raised,
+            by index. Tracks that had already been looked up are left out.
+        """
+        await self.materialize(indices)
+        queue = self._queue_mgr.queue
+        unresolved = [i for i in indices if queue[i].lavalink_track is None]
+        results = await gather(
+            *(self._resolve(queue[i]) for i in unresolved),
+            return_exceptions=True
+        )
+        return dict(zip(unresolved, results))
+
+    async def _send_skip_failures(self, failures: List[Tuple['QueueItem', str]], played: bool):
+        """
+        Sends a single message listing the tracks that were skipped
+        because they could not be played.
+
+        :param failures: The tracks that could not be played, with their errors.
+        :param played: Whether another track was played in the end.
+        """
+        fields = []
+        for item, err in failures[:10]:
+            title = item.title if item.title is not None else 'Unknown track'
+            artist = item.artist if item.artist is not None else 'Unknown artist'
+            fields.append([f'`{title}`', f'{artist}\n```{err}```'])
+        if len(failures) > 10:
+            fields.append(['...', f'and {len(failures) - 10} more'])
+
+        await self.status_channel.send(embed=CustomEmbed(
+            color=Colour.red(),
+            title=f':warning:｜Failed to skip to {len(failures)} track(s)',
+            description='They might be unavailable temporarily '
+                'or restricted to specific regions.\n',
+            fields=fields,
+            footer='Skipped to the next playable track' if played else 'No playable tracks left'
+        ).get())
+
+    def _refresh_bump(self, bump: 'Bump'):
+        """
+        Resolves a bump again in the background, for when its stored
+        Lavalink track could no longer be played.
+
+        :param bump: The bump to resolve again.
+        """
+        get_event_loop().create_task(self._refresh_bump_impl(bump))
+
+    async def _refresh_bump_impl(self, bump: 'Bump'):
+        """
+        Resolves a bump again and saves the new track to the database.
+
+        Called by _refresh_bump() in a separate task.
+
+        :param bump: The bump to resolve again.
+        """
+        try:
+            resolved = await self._resolve_bump(bump)
+        except BumpError as err:
+            self._logger.error('Failed to refresh bump `%s\': %s', bump.url, err)
+            return
+
+        await self._db.run(self._db.set_bump_track, resolved)
+        self._logger.info('Refreshed stored track for bump `%s\'', bump.url)
+
+    async def _resolve_bump(self, bump: 'Bump') -> 'Bump':
+        """
+        Looks up the track for a bump. See jockey_helpers.resolve_bump().
+
+        :param bump: The bump to resolve.
+        """
+        assert self._bot.config is not None
+        return await resolve_bump(
+            self.node,
+            self._bot.spotify,
+            bump,
+            self._bump_requester,
+            deezer_enabled=self._bot.config.lavalink_nodes[self.node.label].deezer
+        )
+
     async def _scrobble(self, item: 'QueueItem'):
         """
         Scrobbles a track in a separate thread.
@@ -253,7 +450,7 @@ class Jockey(Player['BlancoBot']):
         Scrobbles a track for all users in the channel who have
         linked their Last.fm accounts.
 
-        Called by _scrobble() in a separate thread.
+        Called by _scrobble() in a separate task.
 
         :param item: The track to scrobble.
         """
@@ -288,9 +485,9 @@ class Jockey(Player['BlancoBot']):
             self._logger.warning('Failed to scrobble `%s\': %s', item.title, err.args[0])
             return
 
-        # Lookup MusicBrainz ID if needed
+        # Lookup MusicBrainz ID if needed, without blocking the event loop
         if item.mbid is None:
-            annotate_track(item)
+            await get_event_loop().run_in_executor(None, annotate_track, item)
 
         # Don't scrobble with no MBID and ISRC,
         # as the track probably isn't on Last.fm
@@ -301,31 +498,105 @@ class Jockey(Player['BlancoBot']):
             )
             return
 
-        # Scrobble for every user
-        for member in self.channel.members:
-            if not member.bot:
-                scrobbler = self._bot.get_scrobbler(member.id)
-                if scrobbler is not None:
-                    scrobbler.scrobble(item)
+        # Queue scrobble for every user
+        self._bot.scrobble_queue.put(
+            [member.id for member in self.channel.members if not member.bot],
+            item
+        )
 
     async def disconnect(self, *, force: bool = False):
         """
         Removes the controls from Now Playing, then disconnects.
         """
-        # Get now playing message
-        np_msg = await self._get_now_playing()
-        if np_msg is not None:
-            try:
-                await np_msg.edit(view=None)
-            except (HTTPException, Forbidden):
-                self._logger.warning(
-                    'Failed to remove now playing message for %s',
-                    self.guild.name
-                )
+        # Remove controls from now playing message
+        await self._np_msg.remove_controls()
+
+        # Save playback position in case we are shutting down
+        if self.playing:
+            self._queue_mgr.save_position(self.position)
+
+        # Stop bump timer
+        self._bump_scheduler.cancel()
+
+        # Make sure the queue is saved before it can be loaded again
+        await self._queue_mgr.flush()
 
         # Disconnect
         await super().disconnect(force=force)
 
+    async def handoff(self):
+        """
+        Plays the next track in the queue right after the current one finishes,
+        keeping the silence between them as short as possible.
+
+        The next track is matched in the background while the current one plays,
+        see _prepare_ahead(). If it has been matched, it is played right away,
+        and everything else that skip() would do, such as scrobbling and saving
+        the queue, happens afterwards in a separate task. The now playing message
+        is replaced when the next track starts anyway, so its controls are left alone.
+        Otherwise, e.g., if a bump is due, this falls back to skip().
+        """
+        if self._bump_scheduler.is_due:
+            await self._handoff_slowly()
+            return
+
+        try:
+            finished = self._queue_mgr.current
+            index, item = self._queue_mgr.next_track
+        except (EmptyQueueError, EndOfQueueError):
+            # Nothing will be played next
+            self._gaps.discard()
+            return
+
+        if item.lavalink_track is None:
+            await self._handoff_slowly()
+            return
+
+        try:
+            await self.play(
+                item.lavalink_track,
+                volume=self.volume,
+                replace=True,
+                pause=False
+            )
+        except PlayerNotConnected:
+            # Let skip() wait for the player to connect
+            await self._handoff_slowly()
+            return
+
+        self._pause_ts = None
+        self._bump = None
+        item.start_time = int(time())
+        self._queue_mgr.set_current_index(index, save=False)
+        get_event_loop().create_task(self._finish_handoff(finished, index))
+
+    async def materialize(self, indices: List[int]):
+        """
+        Fetches the metadata of any lazily queued tracks among the given ones,
+        and saves it to the database. Spotify is queried in an executor,
+        so this does not block the event loop.
+
+        :param indices: The indices of the tracks in the queue.
+        """
+        queue = self._queue_mgr.queue
+        items = [queue[i] for i in indices]
+        if not any(item.is_stub for item in items):
+            return
+
+        materialized = {id(item) for item in await get_event_loop().run_in_executor(
+            None,
+            materialize_queue_items,
+            self._bot.spotify,
+            items
+        )}
+
+        # Only save the tracks that are still where they were, in case the queue changed
+        queue = self._queue_mgr.queue
+        self._queue_mgr.save_items([
+            i for i, item in zip(indices, items)
+            if id(item) in materialized and i < len(queue) and queue[i] is item
+        ])
+
     def now_playing(self, current: Optional['Track'] = None) -> 'Embed':
         """
         Returns information about the currently playing track.
@@ -397,6 +668,18 @@ class Jockey(Player['BlancoBot']):
 
         :param failed_track: The track that failed to load. Must be an instance of mafic.Track.
         """
+        # If a bump failed to load, its stored track has probably expired
+        if self._bump is not None:
+            bump, self._bump = self._bump, None
+            self._logger.error(
+                'Failed to load bump `%s\' in %s, refreshing it',
+                bump.url,
+                self.guild.name
+            )
+            self._refresh_bump(bump)
+            await self.skip()
+            return
+
         # Get current track and its index
         failed_track = self._queue_mgr.current
         index = self._queue_mgr.current_shuffled_index + 1
@@ -440,22 +723,36 @@ class Jockey(Player['BlancoBot']):
         # Store pause timestamp
         self._pause_ts = int(time())
 
-    async def play_impl(self, query: str, requester: int) -> str:
+        # Save playback position
+        if pause and self.playing:
+            self._queue_mgr.save_position(self.position)
+
+    async def play_impl(
+        self,
+        query: str,
+        requester: int,
+        results: Optional['Task[List[QueueItem]]'] = None
+    ) -> str:
         """
         Adds an item to the player queue and begins playback if necessary.
 
         :param query: The query to play.
         :param requester: The ID of the user who requested the track.
+        :param results: A task already resolving the query, e.g., one started
+            while connecting to voice. If None, the query is resolved here.
         :return: A string containing the name of the track that was added.
         """
         # Get results for query
         try:
-            new_tracks = await parse_query(
-                self.node,
-                self._bot.spotify,
-                query,
-                requester
-            )
+            if results is not None:
+                new_tracks = await results
+            else:
+                new_tracks = await parse_query(
+                    self.node,
+                    self._bot.spotify,
+                    query,
+                    requester
+                )
         except JockeyException:
             raise
         except SpotifyNoResultsError as err:
@@ -482,19 +779,21 @@ class Jockey(Player['BlancoBot']):
             try:
                 await self._play(new_tracks[0])
             except (JockeyError, PlayerNotConnected) as err:
+                # Restore old index
+                self._queue_mgr.current_index = old_index
+
                 # Remove enqueued tracks
                 for _ in range(old_size, self._queue_mgr.size):
                     self._queue_mgr.remove(old_size)
 
-                # Restore old index
-                self._queue_mgr.current_index = old_index
-
                 raise JockeyError(f'Failed to play "{first.title}"') from err
 
+            self._queue_mgr.save_item(old_size)
+
         # Send embed
         return first_name if len(new_tracks) == 1 else f'{len(new_tracks)} item(s)'
 
-    async def remove(self, index: int) -> Tuple[str | None, str | None]:
+    async def remove(self, index: int) -> Tuple[str, str]:
         """
         Removes a track from the queue.
         """
@@ -502,7 +801,7 @@ class Jockey(Player['BlancoBot']):
         removed_track = self._queue_mgr.remove(index)
 
         # Return removed track details
-        return removed_track.title, removed_track.artist
+        return removed_track.get_details()
 
     async def resume(self):
         """
@@ -526,12 +825,34 @@ class Jockey(Player['BlancoBot']):
         self._logger.debug('Unpaused beyond %d sec threshold, re-enqueueing', UNPAUSE_THRESHOLD)
         await self._play(self._queue_mgr.current, last_pos)
 
+    async def resume_queue(self):
+        """
+        Resumes playback of a queue restored from the database,
+        starting from the saved position in the current track.
+
+        :raises EmptyQueueError: If there is no queue to resume.
+        :raises JockeyError: If the current track could not be played.
+        """
+        current = self._queue_mgr.current
+        position = self._queue_mgr.saved_position
+        index = self._queue_mgr.current_index
+        await self.materialize([index])
+        try:
+            await self._play(current, position if position > 0 else None)
+        except PlayerNotConnected as err:
+            raise JockeyError('Player is not connected') from err
+        self._queue_mgr.save_item(index)
+
+        # Prepare the upcoming tracks now that the track is playing
+        get_event_loop().create_task(self._prepare_ahead(index))
+
     async def set_volume(self, volume: int, /):
         """
         Sets the player volume.
         """
         await super().set_volume(volume)
-        self.volume = volume
+        self._volume = volume
+        await self._db.run(self._db.set_volume, self.guild.id, volume)
 
     async def skip(self, *, forward: bool = True, index: int = -1, auto: bool = True):
         """
@@ -546,13 +867,11 @@ class Jockey(Player['BlancoBot']):
         # It takes a while for the player to skip,
         # so let's remove the player controls while we wait
         # to prevent the user from spamming them.
-        await self._edit_np_controls(show_controls=False)
+        self._edit_np_controls(show_controls=False)
 
         try:
             await self.play_bump()
             return
-        except (JockeyException, SpotifyNoResultsError) as err:
-            self._logger.error('Error parsing bump into track: %s', err)
         except BumpError as err:
             self._logger.error('Error playing bump: %s', err)
         except BumpNotEnabledError:
@@ -565,7 +884,7 @@ class Jockey(Player['BlancoBot']):
             try:
                 await self._enqueue(index, auto=auto)
             except JockeyError:
-                await self._edit_np_controls(show_controls=True)
+                self._edit_np_controls(show_controls=True)
                 await self.status_channel.send(embed=create_error_embed(
                     f'Unable to skip to index {index}'
                 ))
@@ -581,103 +900,86 @@ class Jockey(Player['BlancoBot']):
                 try:
                     await self._enqueue(self._queue_mgr.current_index, auto=auto)
                 except JockeyError as err:
-                    await self._edit_np_controls(show_controls=True)
+                    self._edit_np_controls(show_controls=True)
                     await self.status_channel.send(embed=create_error_embed(
                         f'Unable to loop track: {err}'
                     ))
 
                 return
 
-        # Try to enqueue the next playable track
+        # Try to enqueue the next playable track. The next track is tried on its own,
+        # since it can usually be played. Once a track has failed, the ones after it
+        # are looked up SKIP_LOOKAHEAD at a time, and the first playable one is played.
         delta = 1 if forward else -1
-        while True:
-            # Get next index
-            try:
-                next_i = self._queue_mgr.calc_next_index(delta=delta)
-            except EndOfQueueError:
+        failures: List[Tuple['QueueItem', str]] = []
+        played_i = -1
+        while played_i == -1 and len(failures) < self.queue_size:
+            count = 1 if len(failures) == 0 else SKIP_LOOKAHEAD
+            candidates = self._queue_mgr.calc_next_indices(delta, count)
+            if len(candidates) == 0:
                 # We've reached the end of the queue and looping is disabled
-                return
-
-            # Get details of next track for logging
-            next_track = self._queue_mgr.queue[next_i]
-            next_title = next_track.title if next_track.title is not None else 'Unknown track'
-            next_artist = next_track.artist if next_track.artist is not None else 'Unknown artist'
+                break
 
-            # Try to enqueue the next track
-            try:
-                await self._enqueue(next_i, auto=auto)
-            except JockeyError as err:
-                await self._edit_np_controls(show_controls=True)
+            results = await self._resolve_candidates(candidates)
+            queue = self._queue_mgr.queue
+            for next_i in candidates:
+                result = results.get(next_i)
+                if not isinstance(result, BaseException):
+                    try:
+                        await self._enqueue(next_i, auto=auto)
+                    except JockeyError as err:
+                        result = err
+                    else:
+                        played_i = next_i
+                        break
+
+                failures.append((queue[next_i], str(result)))
                 delta += 1 if forward else -1
 
-                await self.status_channel.send(embed=CustomEmbed(
-                    color=Colour.red(),
-                    title=':warning:｜Failed to skip to track',
-                    description='It might be unavailable temporarily '
-                        'or restricted to specific regions.\n',
-                    fields=[
-                        ['Track', f'`{next_title}`\n{next_artist}'],
-                        ['Position in queue', f'{next_i + 1} of {self.queue_size}'],
-                        ['Error', f'```{err}```']
-                    ],
-                    footer='Skipping to next track...' if auto else None
-                ).get())
-            else:
-                break
+            # Save the tracks that were found but not played, so they aren't looked up again
+            self._queue_mgr.save_items([
+                i for i, result in results.items()
+                if i != played_i and not isinstance(result, BaseException)
+            ])
+
+        if len(failures) > 0:
+            self._edit_np_controls(show_controls=True)
+            await self._send_skip_failures(failures, played_i != -1)
 
-    async def update_now_playing(self):
+    def update_now_playing(self):
         """
         Update the existing Now Playing view with current information.
-        """
-        # Get now playing message
-        np_msg = await self._get_now_playing()
-        if np_msg is None:
-            return
 
-        # Edit message
-        try:
-            await np_msg.edit(embed=self.now_playing())
-        except (HTTPException, Forbidden) as exc:
-            # Ignore 404
-            if not isinstance(exc, NotFound):
-                self._logger.warning(
-                    'Failed to edit now playing message for %s: %s',
-                    self.guild.name,
-                    exc
-                )
+        Edits are rate limited, so the update is scheduled rather than made
+        right away, and combined with any other update made in the meantime.
+        """
+        self._np_msg.request(embed=True)
 
     async def play_bump(self):
         """
         Check and attempt to play a bump if it's been long enough.
         """
 
-        enabled = self._db.get_bumps_enabled(self.guild.id)
-        if not enabled:
+        if not self._bump_scheduler.is_enabled:
             raise BumpNotEnabledError
-
-        interval = self._db.get_bump_interval(self.guild.id) * 60
-        last_bump = self._db.get_last_bump(self.guild.id)
-
-        if last_bump == 0:
-            self._db.set_last_bump(self.guild.id)
+        if not self._bump_scheduler.is_due:
             raise BumpNotReadyError
 
-        if int(time()) - last_bump < interval:
-            raise BumpNotReadyError
-
-        bump = self._db.get_random_bump(self.guild.id)
+        bump = await self._db.run(self._db.get_random_bump, self.guild.id)
         if bump is None:
+            self._bump_scheduler.snooze()
             raise BumpError('Guild has no bumps.')
 
-        requester = self._bot.user.id if self._bot.user is not None else self.guild.me.id
+        # Bumps added before their tracks were stored need to be resolved once
+        if bump.lavalink_track is None:
+            bump = await self._resolve_bump(bump)
+            await self._db.run(self._db.set_bump_track, bump)
 
         try:
-            tracks = await parse_query(self.node, self._bot.spotify, bump.url, requester)
-        except (JockeyException, SpotifyNoResultsError):
-            raise
-
-        if len(tracks) == 0:
-            raise BumpError('Unable to parse bump URL into tracks.')
+            await self._play(bump_to_queue_item(bump, self._bump_requester))
+        except JockeyError as err:
+            self._refresh_bump(bump)
+            raise BumpError(f'Unable to play bump `{bump.url}\': {err}') from err
 
-        await self._play(tracks[0])
-        self._db.set_last_bump(self.guild.id)
+        self._bump = bump
+        await self._bump_scheduler.mark_played()
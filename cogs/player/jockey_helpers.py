@@ -2,15 +2,22 @@
 Helper functions for the music player.
 """
 
-from typing import TYPE_CHECKING, List, Tuple, TypeVar
+from asyncio import get_event_loop
+from dataclasses import replace
+from functools import partial
+from json import dumps, loads
+from typing import TYPE_CHECKING, List, Sequence, Tuple, TypeVar
 
-from mafic import SearchType
+from mafic import SearchType, Track
 from spotipy.exceptions import SpotifyException
+from tenacity import RetryError
 
 from database.redis import REDIS
 from dataclass.queue_item import QueueItem
-from utils.constants import CONFIDENCE_THRESHOLD
-from utils.exceptions import (JockeyException, LavalinkInvalidIdentifierError,
+from utils.constants import (CONFIDENCE_THRESHOLD, LAZY_PLAYLIST_THRESHOLD,
+                             MATCH_AHEAD_WINDOW)
+from utils.exceptions import (BumpError, JockeyException,
+                              LavalinkInvalidIdentifierError,
                               LavalinkSearchError, SpotifyNoResultsError)
 from utils.fuzzy import check_similarity_weighted
 from utils.logger import create_logger
@@ -26,8 +33,9 @@ from .lavalink_client import (get_deezer_matches, get_deezer_track,
                               get_soundcloud_matches, get_youtube_matches)
 
 if TYPE_CHECKING:
-    from mafic import Node, Track
+    from mafic import Node
 
+    from dataclass.bump import Bump
     from dataclass.spotify import SpotifyTrack
 
 
@@ -260,6 +268,41 @@ async def find_lavalink_track( # pylint: disable=too-many-statements
     return lavalink_track
 
 
+def serialize_lavalink_track(track: Track) -> str:
+    """
+    Serializes a Lavalink track into a JSON string containing both the encoded
+    track and its info, so that it can be stored and turned back into a
+    mafic.Track later without asking Lavalink to decode it.
+
+    :param track: The track to serialize. Must be an instance of mafic.Track.
+    """
+    return dumps({
+        'encoded': track.id,
+        'info': {
+            'identifier': track.identifier,
+            'isSeekable': track.seekable,
+            'author': track.author,
+            'length': track.length,
+            'isStream': track.stream,
+            'position': track.position,
+            'title': track.title,
+            'uri': track.uri,
+            'artworkUrl': track.artwork_url,
+            'isrc': track.isrc,
+            'sourceName': track.source
+        }
+    })
+
+
+def deserialize_lavalink_track(data: str) -> Track:
+    """
+    Turns a string created by serialize_lavalink_track() back into a mafic.Track.
+
+    :param data: The serialized track.
+    """
+    return Track.from_data_with_info(loads(data))
+
+
 def invalidate_lavalink_track(item: QueueItem):
     """
     Removes a cached Lavalink track from Redis.
@@ -292,6 +335,75 @@ def invalidate_lavalink_track(item: QueueItem):
         )
 
 
+async def resolve_bump(
+    node: 'Node',
+    spotify: Spotify,
+    bump: 'Bump',
+    requester: int,
+    /,
+    deezer_enabled: bool = False
+) -> 'Bump':
+    """
+    Looks up a bump's URL and returns a copy of the bump containing
+    the resolved track metadata and the serialized Lavalink track.
+
+    :param node: The Lavalink node to use for searching. Must be an instance of mafic.Node.
+    :param spotify: The Spotify client to use for searching. See utils/spotify_client.py.
+    :param bump: The bump to resolve.
+    :param requester: The ID of the user to attribute the lookup to.
+    :param deezer_enabled: Whether to use Deezer for searching.
+    """
+    try:
+        tracks = await parse_query(node, spotify, bump.url, requester)
+        if len(tracks) == 0:
+            raise BumpError('Unable to parse bump URL into tracks.')
+
+        item = tracks[0]
+        if item.lavalink_track is None:
+            item.lavalink_track = await find_lavalink_track(
+                node,
+                item,
+                deezer_enabled=deezer_enabled
+            )
+    except BumpError:
+        raise
+    except Exception as exc:
+        raise BumpError(f'Unable to resolve bump `{bump.url}\': {exc}') from exc
+
+    return replace(
+        bump,
+        spotify_id=item.spotify_id,
+        isrc=item.isrc,
+        artwork=item.artwork,
+        duration=item.duration,
+        lavalink_track=serialize_lavalink_track(item.lavalink_track)
+    )
+
+
+def bump_to_queue_item(bump: 'Bump', requester: int) -> QueueItem:
+    """
+    Creates a playable QueueItem from a bump that has already been resolved
+    with resolve_bump().
+
+    :param bump: The resolved bump.
+    :param requester: The ID of the user to attribute the track to.
+    """
+    if bump.lavalink_track is None:
+        raise BumpError(f'Bump `{bump.url}\' has not been resolved.')
+
+    return QueueItem(
+        requester=requester,
+        title=bump.title,
+        artist=bump.author,
+        spotify_id=bump.spotify_id,
+        isrc=bump.isrc,
+        artwork=bump.artwork,
+        duration=bump.duration,
+        url=bump.url,
+        lavalink_track=deserialize_lavalink_track(bump.lavalink_track)
+    )
+
+
 async def parse_query(
     node: 'Node',
     spotify: Spotify,
@@ -326,7 +438,10 @@ async def parse_query(
 
     # Attempt to look for a matching track on Spotify
     try:
-        results = spotify.search_track(query, limit=10)
+        results = await get_event_loop().run_in_executor(
+            None,
+            partial(spotify.search_track, query, limit=10)
+        )
     except SpotifyNoResultsError:
         pass
     else:
@@ -391,6 +506,22 @@ async def parse_spotify_query(spotify: Spotify, query: str, requester: int) -> L
     """
     Parse a Spotify query and return a list of QueueItems.
     See parse_query() for more information.
+
+    Spotify is queried in an executor, so this does not block the event loop.
+    """
+    return await get_event_loop().run_in_executor(
+        None,
+        get_spotify_query_items,
+        spotify,
+        query,
+        requester
+    )
+
+
+def get_spotify_query_items(spotify: Spotify, query: str, requester: int) -> List[QueueItem]:
+    """
+    Gets the tracks for a Spotify URL as QueueItems. Blocks while Spotify is queried.
+    See parse_spotify_query() for more information.
     """
     # Get artwork for Spotify album/playlist
     sp_type, sp_id = get_spinfo_from_url(query)
@@ -398,6 +529,18 @@ async def parse_spotify_query(spotify: Spotify, query: str, requester: int) -> L
     new_tracks = []
     track_queue: List['SpotifyTrack']
     try:
+        if sp_type == 'playlist' and spotify.get_playlist_size(sp_id) > LAZY_PLAYLIST_THRESHOLD:
+            # Queue large playlists as stubs and only fetch metadata
+            # for the tracks that are about to be played
+            new_tracks = [
+                QueueItem(requester=requester, spotify_id=track_id, duration=duration)
+                for track_id, duration in spotify.get_playlist_track_ids(sp_id)
+            ]
+            if len(new_tracks) < 1:
+                raise SpotifyNoResultsError(f'{sp_type} does not have any public tracks.')
+            materialize_queue_items(spotify, new_tracks[:MATCH_AHEAD_WINDOW])
+            return new_tracks
+
         if sp_type == 'track':
             # Get track details from Spotify
             track_queue = [spotify.get_track(sp_id)]
@@ -441,6 +584,47 @@ async def parse_spotify_query(spotify: Spotify, query: str, requester: int) -> L
     return new_tracks
 
 
+def materialize_queue_items(spotify: Spotify, items: Sequence[QueueItem]) -> List[QueueItem]:
+    """
+    Fetches the metadata of every lazily queued item among the given items,
+    in as few requests as possible.
+
+    :param spotify: The Spotify client to use for fetching metadata.
+    :param items: The items to materialize. Items that are not stubs are skipped.
+    :return: The items that were materialized.
+    """
+    stubs = [item for item in items if item.is_stub]
+    if len(stubs) == 0:
+        return []
+
+    try:
+        tracks = spotify.get_tracks_by_id([item.spotify_id for item in stubs]) # type: ignore
+    except (SpotifyException, RetryError) as exc:
+        LOGGER.warning('Could not get metadata for %d queue item(s): %s', len(stubs), exc)
+        return []
+
+    materialized = []
+    for item in stubs:
+        track = tracks.get(item.spotify_id) # type: ignore
+        if track is None:
+            LOGGER.warning('Could not get metadata for Spotify track %s', item.spotify_id)
+            continue
+
+        item.update_metadata(
+            title=track.title,
+            artist=track.artist,
+            author=track.author,
+            album=track.album,
+            artwork=track.artwork,
+            isrc=track.isrc,
+            duration=track.duration_ms
+        )
+        materialized.append(item)
+
+    LOGGER.debug('Materialized %d of %d queue item(s)', len(materialized), len(stubs))
+    return materialized
+
+
 async def parse_youtube_playlist(node: 'Node', query: str, requester: int) -> List[QueueItem]:
     """
     Parse a YouTube playlist query and return a list of QueueItems.
@@ -0,0 +1,225 @@
+"""
+Now playing message for the player cog.
+"""
+
+from typing import TYPE_CHECKING, Optional, Union
+
+from nextcord import (Forbidden, HTTPException, MessageFlags, NotFound,
+                      TextChannel, Thread)
+
+from utils.constants import NOW_PLAYING_REPOST_THRESHOLD
+from utils.exceptions import EmptyQueueError, EndOfQueueError
+from views.now_playing import NowPlayingView
+
+from .now_playing_renderer import NowPlayingRenderer
+
+if TYPE_CHECKING:
+    from nextcord import Embed, Message, PartialMessage
+
+    from utils.blanco import BlancoBot
+
+    from .jockey import Jockey
+
+
+class NowPlayingMessage:
+    """
+    Keeps a guild's now playing message, so that it can be edited or deleted
+    without fetching it from Discord first, and so that edits to it can be
+    combined by a NowPlayingRenderer.
+    """
+    def __init__(self, bot: 'BlancoBot', player: 'Jockey', /):
+        self._bot = bot
+        self._player = player
+        self._db = bot.database
+        self._guild_id = player.guild.id
+        self._logger = bot.jockey_logger
+
+        self._msg: Optional[Union['Message', 'PartialMessage']] = None
+        self._view: Optional[NowPlayingView] = None
+        self._msgs_after = 0
+        self._renderer = NowPlayingRenderer(self._guild_id, self._render)
+
+    def request(self, *, embed: bool = False, controls: Optional[bool] = None):
+        """
+        Schedules an edit to the message. See NowPlayingRenderer.request().
+        """
+        self._renderer.request(embed=embed, controls=controls)
+
+    async def remove_controls(self):
+        """
+        Drops any scheduled edits and removes the controls right away,
+        e.g., when the player disconnects.
+        """
+        self._renderer.cancel()
+        await self._edit(view=None)
+
+    def count(self, message: 'Message'):
+        """
+        Counts a message sent to the status channel after the now playing message,
+        to decide when the now playing message has to be sent again. See send().
+
+        :param message: A message sent to any channel in the guild.
+        """
+        msg = self._msg
+        if msg is not None and message.channel.id == msg.channel.id and message.id > msg.id:
+            self._msgs_after += 1
+
+    async def send(self, embed: 'Embed', spotify_id: Optional[str] = None):
+        """
+        Shows a new track in the now playing message.
+
+        If edit_now_playing is enabled in the config, the last message is edited
+        to show the new track, unless it was deleted or NOW_PLAYING_REPOST_THRESHOLD
+        messages have been sent after it. Otherwise, the last message is deleted
+        and a new one is sent silently to the status channel.
+
+        :param embed: The now playing embed. See Jockey.now_playing().
+        :param spotify_id: The Spotify ID of the track, for the Like button.
+        """
+        # Changes to the last message no longer matter
+        self._renderer.discard()
+
+        assert self._bot.config is not None
+        if self._bot.config.edit_now_playing and await self._edit_in_place(embed, spotify_id):
+            return
+
+        # Delete last now playing message, if it exists
+        last_msg = await self._get()
+        if last_msg is not None:
+            try:
+                await last_msg.delete()
+            except (Forbidden, HTTPException, NotFound):
+                pass
+            self._msg = None
+
+        # Send message silently
+        flags = MessageFlags()
+        flags.suppress_notifications = True # pylint: disable=assigning-non-slot
+        self._view = NowPlayingView(self._bot, self._player, spotify_id)
+        channel = self._player.status_channel
+        self._msg = await channel.send(embed=embed, view=self._view, flags=flags)
+        self._msgs_after = 0
+
+        # Save now playing message ID
+        await self._db.run(self._db.set_now_playing, self._guild_id, self._msg.id)
+
+    async def _get(self) -> Optional[Union['Message', 'PartialMessage']]:
+        """
+        Returns the now playing message, if there is one.
+
+        The message sent by send() is kept, so Discord is only asked for
+        the message if it was sent before a restart, and only if the status
+        channel does not support partial messages, i.e., if it is
+        the text chat of a voice or stage channel.
+        """
+        if self._msg is not None:
+            return self._msg
+
+        msg_id = await self._db.run(self._db.get_now_playing, self._guild_id)
+        if msg_id == -1:
+            return None
+
+        # Assume the message is too far up if anything was sent after it
+        channel = self._player.status_channel
+        last_msg_id = getattr(channel, 'last_message_id', None)
+        self._msgs_after = 0 if last_msg_id == msg_id else NOW_PLAYING_REPOST_THRESHOLD
+
+        if isinstance(channel, (TextChannel, Thread)):
+            self._msg = channel.get_partial_message(msg_id)
+            return self._msg
+
+        try:
+            self._msg = await channel.fetch_message(msg_id)
+        except NotFound:
+            await self._forget()
+        except (Forbidden, HTTPException) as exc:
+            self._logger.warning(
+                'Failed to fetch now playing message for %s: %s',
+                self._player.guild.name,
+                exc
+            )
+        return self._msg
+
+    async def _edit(self, **fields):
+        """
+        Edits the now playing message, if there is one.
+        If the message no longer exists, it is forgotten.
+
+        :param fields: The fields to edit. See nextcord.Message.edit().
+        """
+        msg = await self._get()
+        if msg is None:
+            return
+
+        try:
+            await msg.edit(**fields)
+        except NotFound:
+            await self._forget()
+        except (HTTPException, Forbidden) as exc:
+            self._logger.warning(
+                'Could not edit now playing message for %s: %s',
+                self._player.guild.name,
+                exc
+            )
+
+    async def _edit_in_place(self, embed: 'Embed', spotify_id: Optional[str]) -> bool:
+        """
+        Edits the last now playing message to show a new track, reusing its controls.
+
+        :return: Whether the message was edited. If False, a new message must be sent.
+        """
+        msg = await self._get()
+        if msg is None or self._msgs_after >= NOW_PLAYING_REPOST_THRESHOLD:
+            return False
+
+        if self._view is None:
+            self._view = NowPlayingView(self._bot, self._player, spotify_id)
+        else:
+            self._view.update(spotify_id)
+
+        try:
+            await msg.edit(embed=embed, view=self._view)
+        except NotFound:
+            await self._forget()
+            return False
+        except (HTTPException, Forbidden) as exc:
+            self._logger.warning(
+                'Could not edit now playing message for %s, sending a new one: %s',
+                self._player.guild.name,
+                exc
+            )
+            return False
+
+        return True
+
+    async def _forget(self):
+        """
+        Forgets the now playing message, e.g., after it was deleted.
+        """
+        self._msg = None
+        self._view = None
+        await self._db.run(self._db.set_now_playing, self._guild_id, -1)
+
+    async def _render(self, embed: bool, controls: Optional[bool]):
+        """
+        Edits the now playing message to match the current state of the player.
+        Called by the renderer, see request().
+
+        :param embed: Whether to update the embed.
+        :param controls: Whether to show or hide the controls, or None to leave them alone.
+        """
+        fields = {}
+        if embed:
+            try:
+                fields['embed'] = self._player.now_playing()
+            except (EmptyQueueError, EndOfQueueError):
+                # Nothing is playing anymore
+                pass
+        if controls is not None:
+            fields['view'] = None
+            if controls:
+                fields['view'] = self._view if self._view is not None \
+                    else NowPlayingView(self._bot, self._player)
+
+        if len(fields) > 0:
+            await self._edit(**fields)
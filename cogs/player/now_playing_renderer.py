@@ -0,0 +1,110 @@
+"""
+Now playing message renderer for the player cog.
+"""
+
+from asyncio import get_event_loop, sleep
+from time import monotonic
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from utils.constants import NOW_PLAYING_EDIT_INTERVAL
+from utils.logger import create_logger
+
+if TYPE_CHECKING:
+    from asyncio import Task
+
+
+class NowPlayingRenderer:
+    """
+    Combines changes to a guild's now playing message into
+    at most one edit every NOW_PLAYING_EDIT_INTERVAL seconds,
+    so that rapid button presses and skips don't run into
+    Discord's rate limit for editing messages.
+
+    Changes are only recorded as pending. When an edit is made,
+    the message is rendered from the player's state at that time,
+    so intermediate states are never shown.
+    """
+    def __init__(
+        self,
+        guild_id: int,
+        render: Callable[[bool, Optional[bool]], Awaitable[None]],
+        /
+    ):
+        """
+        :param guild_id: The ID of the guild, for logging.
+        :param render: Coroutine function that edits the message. It is passed
+            whether to update the embed, and whether to show or hide the controls,
+            or None to leave them alone.
+        """
+        self._guild_id = guild_id
+        self._render = render
+        self._embed = False
+        self._controls: Optional[bool] = None
+        self._last_edit = 0.0
+        self._task: Optional['Task'] = None
+
+        # Logger
+        self._logger = create_logger(self.__class__.__name__)
+
+    @property
+    def is_pending(self) -> bool:
+        """
+        Returns whether there are changes that have not been rendered yet.
+        """
+        return self._embed or self._controls is not None
+
+    def request(self, *, embed: bool = False, controls: Optional[bool] = None):
+        """
+        Records a change to the message, and schedules an edit if none is scheduled.
+        The edit is made right away if the message was not edited recently.
+
+        :param embed: Whether the embed needs to be updated.
+        :param controls: Whether to show or hide the controls, or None to leave them alone.
+        """
+        self._embed = self._embed or embed
+        if controls is not None:
+            self._controls = controls
+
+        if self._task is None or self._task.done():
+            self._task = get_event_loop().create_task(self._run())
+
+    def discard(self):
+        """
+        Drops every pending change, e.g., when the message is being replaced.
+        An edit that is already being made is not interrupted.
+        """
+        self._embed = False
+        self._controls = None
+
+    def cancel(self):
+        """
+        Drops every pending change and stops the scheduled edit,
+        e.g., when the player disconnects.
+        """
+        self.discard()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        """
+        Makes edits until there are no more pending changes,
+        waiting out the interval before each one.
+        """
+        while self.is_pending:
+            delay = self._last_edit + NOW_PLAYING_EDIT_INTERVAL - monotonic()
+            if delay > 0:
+                await sleep(delay)
+                if not self.is_pending:
+                    break
+
+            embed, controls = self._embed, self._controls
+            self.discard()
+            self._last_edit = monotonic()
+            self._logger.debug(
+                'Editing now playing message for guild %d (embed: %s, controls: %s)',
+                self._guild_id,
+                embed,
+                controls
+            )
+            await self._render(embed, controls)
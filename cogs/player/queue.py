@@ -3,14 +3,55 @@ Queue manager class for the player cog.
 """
 
 from random import shuffle
-from typing import TYPE_CHECKING, List, Tuple
+from typing import (TYPE_CHECKING, Hashable, Iterable, Iterator, List,
+                    Optional, Sequence, Set, Tuple, Union, overload)
 
 from dataclass.queue_item import QueueItem
 from utils.exceptions import EmptyQueueError, EndOfQueueError
 from utils.logger import create_logger
 
+from .queue_store import QueueStore
+
 if TYPE_CHECKING:
     from database import Database
+    from dataclass.persisted_queue_item import PersistedQueueItem
+    from utils.indexed_sequence import IndexedSequence
+
+
+class QueueView(Sequence[QueueItem]):
+    """
+    Read-only view of the items in one of the orders kept by a QueueStore.
+    """
+    def __init__(self, rows: 'IndexedSequence[PersistedQueueItem]'):
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[QueueItem]:
+        return (row.item for row in self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> QueueItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[QueueItem]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[QueueItem, List[QueueItem]]:
+        if isinstance(index, slice):
+            return [row.item for row in self._rows[index]]
+        return self._rows[index].item
+
+
+def dedupe_key(item: QueueItem) -> Hashable:
+    """
+    Returns a key that is the same for every queue item of the same track.
+    """
+    if item.metadata.key is not None:
+        return item.metadata.key
+    if item.url is not None:
+        return item.url
+    return item.get_details()
 
 
 class QueueManager:
@@ -19,45 +60,48 @@ class QueueManager:
     """
     def __init__(self, guild_id: int, database: 'Database', /):
         self._guild_id = guild_id
-        self._queue: List[QueueItem] = []
-        self._shuf_i: List[int] = []
 
         # Restore loop preferences from database
         self._db = database
         self._loop_one = database.get_loop(guild_id)
         self._loop_all = database.get_loop_all(guild_id)
 
-        # The current track index.
-        # Even if the queue is shuffled, this must ALWAYS
-        # correspond to an element in self._queue, not self._shuf_i.
-        self._i = -1
+        # Restore the queue from database.
+        # We keep track of the current entry instead of its index,
+        # so that it stays put as other entries are inserted or removed.
+        self._store = QueueStore(guild_id, database)
+        self._current: Optional['PersistedQueueItem'] = self._store.load()
 
         # Logger
         self._logger = create_logger(self.__class__.__name__)
-        self._logger.info('Initialized queue manager for guild %d', guild_id)
+        self._logger.info(
+            'Initialized queue manager for guild %d with %d restored item(s)',
+            guild_id,
+            self.size
+        )
 
     @property
-    def queue(self) -> List[QueueItem]:
+    def queue(self) -> Sequence[QueueItem]:
         """
         Returns the queue.
         """
-        return self._queue
+        return QueueView(self._store.rows)
 
     @property
-    def shuffled_queue(self) -> List[QueueItem]:
+    def shuffled_queue(self) -> Sequence[QueueItem]:
         """
         Returns the queue, shuffled.
         """
         if not self.is_shuffling:
             return self.queue
-        return [self.queue[i] for i in self._shuf_i]
+        return QueueView(self._store.shuffled_rows)
 
     @property
     def is_shuffling(self) -> bool:
         """
         Returns whether the queue is shuffled.
         """
-        return len(self._shuf_i) > 0
+        return len(self._store.shuffled_rows) > 0
 
     @property
     def is_looping_one(self) -> bool:
@@ -94,7 +138,7 @@ class QueueManager:
         """
         Returns the size of the queue.
         """
-        return len(self.queue)
+        return len(self._store.rows)
 
     @property
     def current(self) -> QueueItem:
@@ -104,40 +148,70 @@ class QueueManager:
         Raises:
             EmptyQueueError: If the queue is empty.
         """
-        if self.size == 0:
+        if self.size == 0 or self._current is None:
             raise EmptyQueueError
 
-        return self.queue[self.current_index]
+        return self._current.item
 
     @property
     def current_index(self) -> int:
         """
         Returns the current track index, NOT accounting for shuffling.
-        This is the index of the current track in self._queue.
+        This is the index of the current track in self.queue,
+        or -1 if there is no current track.
         """
-        return self._i
+        if self._current is None:
+            return -1
+        return self._store.rows.index(self._current)
 
     @property
     def current_shuffled_index(self) -> int:
         """
         Returns the current track index, accounting for shuffling.
-        This is the index of the current track in self._shuf_i.
+        This is the index of the current track in self.shuffled_queue.
         """
-        if not self.is_shuffling:
+        if not self.is_shuffling or self._current is None:
             return self.current_index
-        return self._shuf_i.index(self.current_index)
+        return self._store.shuffled_rows.index(self._current)
 
     @current_index.setter
     def current_index(self, i: int):
         """
         Sets the current track index.
-        
+
         Args:
             i: The new current track index. Must be adjusted for shuffling,
-                i.e., i must correspond to an element in self._queue,
-                not self._shuf_i.
+                i.e., i must correspond to an element in self.queue,
+                not self.shuffled_queue.
+        """
+        self.set_current_index(i)
+
+    def set_current_index(self, i: int, /, *, save: bool = True):
+        """
+        Sets the current track index, like the current_index setter,
+        but optionally without saving it to the database yet.
+
+        Args:
+            i: The new current track index, NOT accounting for shuffling.
+            save: Whether to save the new current track right away.
+                If False, save_current() must be called afterwards.
+        """
+        self._current = self._store.rows[i] if i >= 0 else None
+        if save:
+            self.save_current()
+
+    def save_current(self):
+        """
+        Saves the current track to the database.
         """
-        self._i = i
+        self._store.set_current(self._current)
+
+    @property
+    def saved_position(self) -> int:
+        """
+        Returns the saved playback position in the current track, in milliseconds.
+        """
+        return self._store.get_position()
 
     @property
     def next_track(self) -> Tuple[int, QueueItem]:
@@ -190,23 +264,58 @@ class QueueManager:
             delta: How far ahead or back to seek the next index.
 
         Returns:
-            The next track index in self._queue.
+            The next track index in self.queue.
 
         Raises:
             EndOfQueueError: If one of the ends of the queue is reached,
                 and the queue is not looping all tracks.
         """
-        forward = delta > 0
-
         # Return the current index if the queue is looping a single track.
-        next_i = self.current_index
         if self.is_looping_one:
-            return next_i
+            return self.current_index
 
-        # If we're shuffling, we need to use self._shuf_i to calculate the next index.
-        # Otherwise, we can just use the current index.
-        if self.is_shuffling:
-            next_i = self._shuf_i.index(next_i)
+        return self._calc_next_index(delta)
+
+    def calc_next_indices(self, delta: int, count: int, /) -> List[int]:
+        """
+        Calculate the indices of up to `count` tracks to try when skipping,
+        in the order they should be tried. Stops at the end of the queue,
+        or once the queue has wrapped around if it is looping all tracks.
+
+        Args:
+            delta: How far ahead or back the first track is from the current one.
+                Its sign determines the direction of the skip.
+            count: How many indices to return at most.
+
+        Returns:
+            Track indices in self.queue.
+        """
+        step = 1 if delta > 0 else -1
+        indices: List[int] = []
+        for _ in range(count):
+            try:
+                index = self.calc_next_index(delta=delta)
+            except EndOfQueueError:
+                break
+
+            # Stop once we've wrapped around the queue
+            if index in indices:
+                break
+            indices.append(index)
+            delta += step
+
+        return indices
+
+    def _calc_next_index(self, delta: int) -> int:
+        """
+        Like calc_next_index(), but disregarding whether the queue
+        is looping a single track.
+        """
+        forward = delta > 0
+
+        # If we're shuffling, we need to use the shuffled index to calculate
+        # the next index. Otherwise, we can just use the current index.
+        next_i = self.current_shuffled_index
 
         # Calculate the next index.
         next_i += delta
@@ -217,9 +326,9 @@ class QueueManager:
                 raise EndOfQueueError
 
         # If we're shuffling, we need to convert the next index back to
-        # an index in self._queue.
+        # an index in self.queue.
         if self.is_shuffling:
-            next_i = self._shuf_i[next_i]
+            next_i = self._store.rows.index(self._store.shuffled_rows[next_i])
         return next_i
 
     def skip(self) -> QueueItem:
@@ -232,7 +341,7 @@ class QueueManager:
             EndOfQueueError: If the last track in the queue is reached.
         """
         i, track = self.next_track
-        self._i = i
+        self.current_index = i
         return track
 
     def rewind(self) -> QueueItem:
@@ -245,13 +354,13 @@ class QueueManager:
             EndOfQueueError: If the first track in the queue is reached.
         """
         i, track = self.previous_track
-        self._i = i
+        self.current_index = i
         return track
 
     def shuffle(self):
         """
         Shuffles the queue non-destructively by generating a random
-        permutation of indices. Each call to shuffle() will generate
+        permutation of its entries. Each call to shuffle() will generate
         a different permutation, with the current track always at
         the beginning.
 
@@ -262,17 +371,84 @@ class QueueManager:
             raise EmptyQueueError
 
         # Shuffle everything except the current track.
-        indices = [i for i in range(self.size) if i != self.current_index]
-        shuffle(indices)
+        rows = [row for row in self._store.rows if row is not self._current]
+        shuffle(rows)
 
-        # Prepend the current track index to the shuffle index list.
-        self._shuf_i = [self.current_index] + indices
+        # Put the current track at the beginning of the shuffled queue.
+        if self._current is not None:
+            rows.insert(0, self._current)
+        self._store.shuffle(rows)
 
     def unshuffle(self):
         """
-        Unshuffles the queue by clearing the shuffle index list.
+        Unshuffles the queue by clearing the shuffle order.
+        """
+        if self.is_shuffling:
+            self._store.unshuffle()
+
+    def save_item(self, index: int, /):
         """
-        self._shuf_i = []
+        Saves the lookup results for an item in the queue to the database,
+        so that the item does not need to be looked up again after a restart.
+
+        Args:
+            index: The index of the item in self.queue.
+        """
+        self.save_items([index])
+
+    def save_items(self, indices: List[int], /):
+        """
+        Saves the lookup results for multiple items in the queue to the database.
+
+        Args:
+            indices: The indices of the items in self.queue.
+        """
+        self._store.update([self._store.rows[i] for i in indices])
+
+    def lookahead(self, index: int, count: int, /) -> List[int]:
+        """
+        Returns the indices of up to `count` items in the queue, in the order
+        they will be played, starting from the item at the given index.
+
+        Args:
+            index: The index of the first item in self.queue.
+            count: The maximum number of indices to return.
+        """
+        if not self.is_shuffling:
+            return list(range(index, min(index + count, self.size)))
+
+        start = self._store.shuffled_rows.index(self._store.rows[index])
+        return self.shuffled_indices(start, count)
+
+    def shuffled_indices(self, start: int, count: int, /) -> List[int]:
+        """
+        Returns the indices in self.queue of up to `count` items,
+        starting from the item at the given index in self.shuffled_queue.
+
+        Args:
+            start: The index of the first item in self.shuffled_queue.
+            count: The maximum number of indices to return.
+        """
+        if not self.is_shuffling:
+            return list(range(start, min(start + count, self.size)))
+
+        rows = self._store.rows
+        return [rows.index(row) for row in self._store.shuffled_rows[start:start + count]]
+
+    def save_position(self, position: int, /):
+        """
+        Saves the playback position in the current track to the database.
+
+        Args:
+            position: The playback position in milliseconds.
+        """
+        self._store.set_position(position)
+
+    async def flush(self):
+        """
+        Waits for every change to the queue to be saved to the database.
+        """
+        await self._store.flush()
 
     def extend(self, items: List[QueueItem]):
         """
@@ -284,9 +460,7 @@ class QueueManager:
         new_queue = self.size == 0
 
         # Append the items to the queue.
-        self.queue.extend(items)
-        if self.is_shuffling:
-            self._shuf_i.extend(list(range(self.size - len(items), self.size)))
+        self._store.append(items, self.is_shuffling)
 
         # Update index
         if new_queue:
@@ -311,17 +485,18 @@ class QueueManager:
             raise IndexError(f'Index {index} out of range.')
 
         if self.is_shuffling:
-            # If we're shuffling, insert the item at the end of self._queue,
-            # then insert the new index at the specified index in self._shuf_i.
-            self.queue.append(item)
-            self._shuf_i.insert(index, self.size - 1)
+            # If we're shuffling, insert the item at the end of the queue,
+            # and at the specified index in the shuffled queue.
+            self._store.insert_shuffled(item, index)
         else:
-            # Otherwise, just insert the item at the specified index in self._queue.
-            self.queue.insert(index, item)
+            # Otherwise, just insert the item at the specified index in the queue.
+            self._store.insert(item, index)
 
     def move(self, source_i: int, dest_i: int, /):
         """
         Moves a queue item from one index to another.
+        If we're shuffling, both indices are in the shuffled queue,
+        and the item keeps its place in the unshuffled queue.
 
         Args:
             source_i: The index of the item to move.
@@ -341,14 +516,18 @@ class QueueManager:
             raise IndexError(f'Destination index {dest_i} out of range.')
         if source_i == dest_i:
             raise IndexError('Source and destination indices are the same.')
-        if source_i == self.current_index:
+
+        rows = self._store.shuffled_rows if self.is_shuffling else self._store.rows
+        row = rows[source_i]
+        if row is self._current:
             raise IndexError('Cannot move the current track.')
 
-        self.insert(self.remove(source_i), dest_i)
+        self._store.move(row, dest_i, self.is_shuffling)
 
     def remove(self, index: int, /) -> QueueItem:
         """
         Removes an element at the given index and returns the element.
+        If we're shuffling, the index is in the shuffled queue.
 
         Raises:
             EmptyQueueError: If the queue is empty.
@@ -359,20 +538,75 @@ class QueueManager:
         if not 0 <= index < self.size:
             raise IndexError(f'Index {index} out of range.')
 
-        # Adjust the index if we're shuffling.
-        adjusted_index = index
-        if self.is_shuffling:
-            # Remove the index from self._shuf_i.
-            adjusted_index = self._shuf_i.pop(index)
+        rows = self._store.shuffled_rows if self.is_shuffling else self._store.rows
+        row = rows[index]
+
+        # If we're removing the current track, move on to the next one,
+        # or the previous one if we're at the end of the queue.
+        if row is self._current:
+            if self.size == 1:
+                self.current_index = -1
+            else:
+                try:
+                    self.current_index = self._calc_next_index(1)
+                except EndOfQueueError:
+                    self.current_index = self._calc_next_index(-1)
+
+        # Remove the element from the queue.
+        self._store.remove(row)
+        return row.item
+
+    def remove_many(self, indices: Iterable[int], /) -> List[QueueItem]:
+        """
+        Removes the elements at the given indices in a single pass
+        and returns them. If we're shuffling, the indices are in the
+        shuffled queue. The current track is never removed.
+
+        Raises:
+            IndexError: If any of the indices is out of range.
+        """
+        selected = set(indices)
+        if any(not 0 <= i < self.size for i in selected):
+            raise IndexError('Index out of range.')
+
+        rows = self._store.shuffled_rows if self.is_shuffling else self._store.rows
+        removed = [
+            row for i, row in enumerate(rows)
+            if i in selected and row is not self._current
+        ]
+        if len(removed) > 0:
+            self._store.remove_many(removed)
+        return [row.item for row in removed]
+
+    def clear_upcoming(self) -> List[QueueItem]:
+        """
+        Removes every element after the current track and returns them.
+        If we're shuffling, this is every element after the current track
+        in the shuffled queue.
+        """
+        return self.remove_many(range(self.current_shuffled_index + 1, self.size))
 
-            # Adjust the indices in self._shuf_i.
-            for i, j in enumerate(self._shuf_i):
-                if j > index:
-                    self._shuf_i[i] -= 1
+    def dedupe(self) -> List[QueueItem]:
+        """
+        Removes every element that is a repeat of an earlier one,
+        or of the current track, and returns them.
+        """
+        seen: Set[Hashable] = set()
+        if self._current is not None:
+            seen.add(dedupe_key(self._current.item))
 
-        # If we're removing the current track, adjust the current track index.
-        if adjusted_index == self.current_index:
-            self._i = self.calc_next_index()
+        duplicates = []
+        for i, item in enumerate(self.shuffled_queue):
+            key = dedupe_key(item)
+            if key in seen:
+                duplicates.append(i)
+            seen.add(key)
+        return self.remove_many(duplicates)
 
-        # Remove the element from self._queue.
-        return self.queue.pop(adjusted_index)
+    def remove_by_requester(self, requester: int, /) -> List[QueueItem]:
+        """
+        Removes every element requested by a user and returns them.
+        """
+        return self.remove_many(
+            i for i, item in enumerate(self.shuffled_queue) if item.requester == requester
+        )
@@ -0,0 +1,341 @@
+"""
+Queue storage for the player cog.
+"""
+
+from asyncio import get_event_loop
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, List, Optional
+
+from dataclass.persisted_queue_item import PersistedQueueItem
+from utils.indexed_sequence import IndexedSequence
+from utils.logger import create_logger
+
+from .jockey_helpers import (deserialize_lavalink_track,
+                             serialize_lavalink_track)
+
+if TYPE_CHECKING:
+    from asyncio import Task
+
+    from database import Database
+    from dataclass.queue_item import QueueItem
+
+
+class QueueStore:
+    """
+    Holds a guild's queue in queue order and in shuffle order,
+    and saves it to the database as it changes, so that the queue
+    can be restored without any lookups after a restart.
+
+    Both orders are IndexedSequences of the same entries, so an entry
+    can be inserted, moved, removed, or located in either order in
+    O(log n) time.
+
+    Every entry is saved in its own row, along with sort keys for its
+    position in the queue and in the shuffled queue. New keys are picked
+    between the keys of their neighbors, so inserting, moving, or removing
+    an entry only touches the row of that entry.
+
+    If the database is remote, changes are saved by a background task
+    in the order they were made, so that the event loop never waits
+    for the database server.
+    """
+    def __init__(self, guild_id: int, database: 'Database', /):
+        self._guild_id = guild_id
+        self._db = database
+
+        # Entries in queue order and in shuffle order.
+        # The latter is empty if the queue is not shuffled.
+        self._rows: IndexedSequence[PersistedQueueItem] = IndexedSequence()
+        self._shuf_rows: IndexedSequence[PersistedQueueItem] = IndexedSequence()
+
+        # Changes waiting to be saved to a remote database
+        self._writes: Deque[Callable[[], None]] = deque()
+        self._writer: Optional['Task'] = None
+
+        # Logger
+        self._logger = create_logger(self.__class__.__name__)
+
+    @property
+    def rows(self) -> IndexedSequence[PersistedQueueItem]:
+        """
+        Returns the entries in queue order. Must not be modified directly.
+        """
+        return self._rows
+
+    @property
+    def shuffled_rows(self) -> IndexedSequence[PersistedQueueItem]:
+        """
+        Returns the entries in shuffle order, or an empty sequence if the
+        queue is not shuffled. Must not be modified directly.
+        """
+        return self._shuf_rows
+
+    def load(self) -> Optional[PersistedQueueItem]:
+        """
+        Loads the saved queue for the guild.
+
+        :return: The current entry, or None if the queue is empty.
+        """
+        rows = self._db.get_queue_items(self._guild_id)
+        for row in rows:
+            if row.lavalink_track is not None:
+                row.item.lavalink_track = deserialize_lavalink_track(row.lavalink_track)
+        self._rows = IndexedSequence(rows)
+
+        # Restore shuffle order
+        shuf_rows = []
+        if len(rows) > 0 and all(row.shuffle_position is not None for row in rows):
+            shuf_rows = sorted(rows, key=lambda row: row.shuffle_position) # type: ignore
+        self._shuf_rows = IndexedSequence(shuf_rows)
+
+        # Restore current entry
+        current_id = self._db.get_queue_current(self._guild_id)
+        current = next((row for row in rows if row.row_id == current_id), None)
+        if current is None and len(rows) > 0:
+            current = rows[0]
+        return current
+
+    def append(self, items: List['QueueItem'], shuffled: bool) -> List[PersistedQueueItem]:
+        """
+        Appends items to the end of the queue.
+
+        :param items: The items to append.
+        :param shuffled: Whether to also append the items to the shuffled queue.
+        :return: The new entries.
+        """
+        last = self._rows[-1].position if self._rows else -1.0
+        last_shuf = -1.0
+        if shuffled and self._shuf_rows:
+            last_shuf = self._shuf_rows[-1].shuffle_position # type: ignore
+
+        new_rows = [
+            PersistedQueueItem(
+                row_id=-1,
+                position=last + i + 1,
+                shuffle_position=last_shuf + i + 1 if shuffled else None,
+                item=item,
+                lavalink_track=self._serialize(item)
+            )
+            for i, item in enumerate(items)
+        ]
+        self._write(lambda: self._db.add_queue_items(self._guild_id, new_rows))
+
+        self._rows.extend(new_rows)
+        if shuffled:
+            self._shuf_rows.extend(new_rows)
+        return new_rows
+
+    def insert(self, item: 'QueueItem', index: int) -> PersistedQueueItem:
+        """
+        Inserts an item into the unshuffled queue.
+
+        :return: The new entry.
+        """
+        row = PersistedQueueItem(
+            row_id=-1,
+            position=self._key_between(self._rows, index, 'position'),
+            shuffle_position=None,
+            item=item,
+            lavalink_track=self._serialize(item)
+        )
+        self._write(lambda: self._db.add_queue_items(self._guild_id, [row]))
+        self._rows.insert(index, row)
+        return row
+
+    def insert_shuffled(self, item: 'QueueItem', index: int) -> PersistedQueueItem:
+        """
+        Appends an item to the queue and inserts it into the shuffled queue.
+
+        :return: The new entry.
+        """
+        row = PersistedQueueItem(
+            row_id=-1,
+            position=self._rows[-1].position + 1 if self._rows else 0.0,
+            shuffle_position=self._key_between(self._shuf_rows, index, 'shuffle_position'),
+            item=item,
+            lavalink_track=self._serialize(item)
+        )
+        self._write(lambda: self._db.add_queue_items(self._guild_id, [row]))
+        self._rows.append(row)
+        self._shuf_rows.insert(index, row)
+        return row
+
+    def move(self, row: PersistedQueueItem, index: int, shuffled: bool):
+        """
+        Moves an entry to another index in the queue or in the shuffled queue.
+
+        :param row: The entry to move.
+        :param index: The index to move the entry to, counted after its removal.
+        :param shuffled: Whether to move the entry in the shuffled queue.
+        """
+        if shuffled:
+            self._shuf_rows.remove(row)
+            row.shuffle_position = self._key_between(self._shuf_rows, index, 'shuffle_position')
+            self._shuf_rows.insert(index, row)
+            self._write(lambda: self._db.set_queue_item_shuffle_positions([
+                (row.row_id, row.shuffle_position) # type: ignore
+            ]))
+        else:
+            self._rows.remove(row)
+            row.position = self._key_between(self._rows, index, 'position')
+            self._rows.insert(index, row)
+            self._write(lambda: self._db.set_queue_item_positions([
+                (row.row_id, row.position)
+            ]))
+
+    def remove(self, row: PersistedQueueItem):
+        """
+        Removes an entry from the queue, and from the shuffled queue if shuffling.
+        """
+        self._rows.remove(row)
+        if row in self._shuf_rows:
+            self._shuf_rows.remove(row)
+        self._write(lambda: self._db.delete_queue_item(row.row_id))
+
+    def remove_many(self, rows: List[PersistedQueueItem]):
+        """
+        Removes multiple entries from the queue, and from the shuffled queue
+        if shuffling, rebuilding both in a single pass.
+        """
+        removed = {id(row) for row in rows}
+        self._rows = IndexedSequence(row for row in self._rows if id(row) not in removed)
+        if self._shuf_rows:
+            self._shuf_rows = IndexedSequence(
+                row for row in self._shuf_rows if id(row) not in removed
+            )
+        self._write(lambda: self._db.delete_queue_items([row.row_id for row in rows]))
+
+    def shuffle(self, rows: List[PersistedQueueItem]):
+        """
+        Sets a new shuffle order.
+
+        :param rows: Every entry in the queue, in shuffle order.
+        """
+        for i, row in enumerate(rows):
+            row.shuffle_position = float(i)
+        self._shuf_rows = IndexedSequence(rows)
+        self._write(lambda: self._db.set_queue_item_shuffle_positions([
+            (row.row_id, row.shuffle_position) for row in rows # type: ignore
+        ]))
+
+    def unshuffle(self):
+        """
+        Clears the shuffle order.
+        """
+        for row in self._shuf_rows:
+            row.shuffle_position = None
+        self._shuf_rows = IndexedSequence()
+        self._write(lambda: self._db.clear_queue_shuffle(self._guild_id))
+
+    def set_current(self, row: Optional[PersistedQueueItem]):
+        """
+        Saves the current entry.
+        """
+        self._write(lambda: self._db.set_queue_current(
+            self._guild_id,
+            -1 if row is None else row.row_id
+        ))
+
+    def set_position(self, position: int):
+        """
+        Saves the playback position in the current track, in milliseconds.
+        """
+        self._write(lambda: self._db.set_queue_position(self._guild_id, position))
+
+    def get_position(self) -> int:
+        """
+        Gets the saved playback position in the current track, in milliseconds.
+        """
+        return self._db.get_queue_position(self._guild_id)
+
+    def update(self, rows: List[PersistedQueueItem]):
+        """
+        Saves the lookup results for entries, e.g., after their Lavalink tracks were found.
+        """
+        for row in rows:
+            row.lavalink_track = self._serialize(row.item)
+        self._write(lambda: self._db.update_queue_items(rows))
+
+    async def flush(self):
+        """
+        Waits for every change to be saved, e.g., before the queue is loaded again.
+        """
+        if self._writer is not None:
+            await self._writer
+
+    def _key_between(
+        self,
+        rows: IndexedSequence[PersistedQueueItem],
+        index: int,
+        attr: str
+    ) -> float:
+        """
+        Returns a sort key for an entry to be inserted at the given index.
+        If there are no more keys left between the neighbors of the index,
+        every entry is given a new key first.
+        """
+        lower = getattr(rows[index - 1], attr) if index > 0 else None
+        upper = getattr(rows[index], attr) if index < len(rows) else None
+        if lower is None and upper is None:
+            return 0.0
+        if lower is None:
+            return upper - 1
+        if upper is None:
+            return lower + 1
+
+        middle = (lower + upper) / 2
+        if lower < middle < upper:
+            return middle
+
+        # Out of precision, renumber every entry
+        self._logger.debug('Renumbering %s keys for guild %d', attr, self._guild_id)
+        for i, row in enumerate(rows):
+            setattr(row, attr, float(i))
+        keys = [(row, getattr(row, attr)) for row in rows]
+        if attr == 'position':
+            save = self._db.set_queue_item_positions
+        else:
+            save = self._db.set_queue_item_shuffle_positions
+        self._write(lambda: save([(row.row_id, key) for row, key in keys]))
+        return index - 0.5
+
+    def _write(self, change: Callable[[], None]):
+        """
+        Saves a change to the database. If the database is remote,
+        the change is saved in the background after every earlier change.
+
+        :param change: Saves the change when called. Row IDs must only be read
+            when it is called, since earlier entries might not have been saved yet.
+        """
+        if not self._db.is_remote:
+            change()
+            return
+
+        self._writes.append(change)
+        if self._writer is None or self._writer.done():
+            self._writer = get_event_loop().create_task(self._write_pending())
+
+    async def _write_pending(self):
+        """
+        Saves changes to a remote database one at a time, in order.
+        Called by _write() in a separate task.
+        """
+        while len(self._writes) > 0:
+            change = self._writes.popleft()
+            try:
+                await self._db.run(change)
+            except Exception as exc: # pylint: disable=broad-exception-caught
+                self._logger.error(
+                    'Failed to save queue for guild %d: %s',
+                    self._guild_id,
+                    exc
+                )
+
+    @staticmethod
+    def _serialize(item: 'QueueItem') -> Optional[str]:
+        """
+        Serializes the Lavalink track of an item, if any.
+        """
+        if item.lavalink_track is None:
+            return None
+        return serialize_lavalink_track(item.lavalink_track)
@@ -1,194 +1,250 @@
 """
-Database module for Blanco. Interfaces with the bot's SQLite database.
+Database module for Blanco. Interfaces with the bot's SQLite or PostgreSQL database.
 """
 
-import sqlite3 as sql
-from typing import List, Optional
+from random import randint
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
 import time
 
 from dataclass.oauth import LastfmAuth, OAuth
 from dataclass.bump import Bump
+from dataclass.persisted_queue_item import PersistedQueueItem
+from dataclass.queue_item import QueueItem
+from dataclass.scrobble import Scrobble
 from utils.logger import create_logger
 
-from .migrations import run_migrations
+from .storage import SQLiteStorage, Storage
+
+T = TypeVar('T')
+
+# How many random indices to try before settling for the next bump after one
+RANDOM_BUMP_ATTEMPTS = 3
+
+# Bump columns in the same order as the fields of dataclass.bump.Bump
+BUMP_COLUMNS = '''idx, guild_id, url, title, author,
+    spotify_id, isrc, artwork, duration, lavalink_track'''
+
+# Scrobble columns in the same order as the fields of dataclass.scrobble.Scrobble
+SCROBBLE_COLUMNS = 'user_id, artist, title, timestamp, album, duration, mbid'
+
+# Columns of the queue_items table that map directly to QueueItem fields
+QUEUE_ITEM_FIELDS = (
+    'requester', 'spotify_id', 'mbid', 'isrc', 'url', 'artwork',
+    'title', 'artist', 'author', 'album', 'duration'
+)
+QUEUE_ITEM_COLUMNS = ', '.join(QUEUE_ITEM_FIELDS)
 
 
 class Database:
     """
-    Class for handling connections to the bot's SQLite DB.
+    Class for handling connections to the bot's database.
+
+    Data is stored in a local SQLite file by default, or in a PostgreSQL
+    server if a URL is given, so that several bot processes can share it.
     """
 
-    def __init__(self, db_filename: str):
-        self._con = sql.connect(db_filename, check_same_thread=False)
-        self._cur = self._con.cursor()
+    def __init__(self, db_filename: Optional[str] = None, /, url: Optional[str] = None):
         self._logger = create_logger(self.__class__.__name__)
 
+        self._storage: Storage
+        if url is not None:
+            # Only import the PostgreSQL driver if we need it
+            from .storage.postgres import \
+                PostgresStorage  # pylint: disable=import-outside-toplevel
+            self._storage = PostgresStorage(url)
+            self._logger.info('Connected to PostgreSQL database, running migrations...')
+        elif db_filename is not None:
+            self._storage = SQLiteStorage(db_filename)
+            self._logger.info('Connected to database %s, running migrations...', db_filename)
+        else:
+            raise ValueError('Either a database file or a database URL must be specified')
+
         # Run migrations
-        self._logger.info('Connected to database %s, running migrations...', db_filename)
-        run_migrations(self._logger, self._con)
+        self._storage.migrate(self._logger)
+
+    @property
+    def is_remote(self) -> bool:
+        """
+        Returns whether the database is on another server, in which case
+        methods called from the event loop should be called through run().
+        """
+        return self._storage.is_remote
+
+    async def run(self, method: Callable[..., T], *args: Any) -> T:
+        """
+        Calls a method of this class without blocking the event loop,
+        e.g., `await database.run(database.set_volume, guild_id, volume)`.
+        Against PostgreSQL, the method is called in a separate thread.
+        """
+        return await self._storage.run(method, *args)
+
+    def _fetch_value(self, query: str, *params):
+        """
+        Execute a query and return the first column of the first row.
+
+        Raises:
+            TypeError: If the query returned no rows.
+        """
+        row = self._storage.fetchone(query, params)
+        return row[0] # type: ignore
 
     def init_guild(self, guild_id: int):
         """
         Initialize a guild in the database if it hasn't been yet.
         """
-        self._cur.execute(f'INSERT OR IGNORE INTO player_settings (guild_id) VALUES ({guild_id})')
-        self._con.commit()
+        self._storage.execute(
+            f'INSERT INTO player_settings (guild_id) VALUES ({guild_id}) ON CONFLICT DO NOTHING'
+        )
 
     def get_volume(self, guild_id: int) -> int:
         """
         Get the volume for a guild.
         """
-        self._cur.execute(f'SELECT volume FROM player_settings WHERE guild_id = {guild_id}')
-        return self._cur.fetchone()[0]
+        return self._fetch_value(f'SELECT volume FROM player_settings WHERE guild_id = {guild_id}')
 
     def set_volume(self, guild_id: int, volume: int):
         """
         Set the volume for a guild.
         """
-        self._cur.execute(
+        self._storage.execute(
             f'UPDATE player_settings SET volume = {volume} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
     def get_loop(self, guild_id: int) -> bool:
         """
         Get the loop setting for a guild.
         """
-        self._cur.execute(f'SELECT loop FROM player_settings WHERE guild_id = {guild_id}')
-        return self._cur.fetchone()[0] == 1
+        return self._fetch_value(
+            f'SELECT loop FROM player_settings WHERE guild_id = {guild_id}'
+        ) == 1
 
     def set_loop(self, guild_id: int, loop: bool):
         """
         Set the loop setting for a guild.
         """
-        self._cur.execute(
+        self._storage.execute(
             f'UPDATE player_settings SET loop = {int(loop)} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
     def get_loop_all(self, guild_id: int) -> bool:
         """
         Get the whole-queue loop setting for a guild.
         """
-        self._cur.execute(f'SELECT loop_all FROM player_settings WHERE guild_id = {guild_id}')
-        return self._cur.fetchone()[0] == 1
+        return self._fetch_value(
+            f'SELECT loop_all FROM player_settings WHERE guild_id = {guild_id}'
+        ) == 1
 
     def set_loop_all(self, guild_id: int, loop: bool):
         """
         Set the whole-queue loop setting for a guild.
         """
-        self._cur.execute(
+        self._storage.execute(
             f'UPDATE player_settings SET loop_all = {int(loop)} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
     def get_now_playing(self, guild_id: int) -> int:
         """
         Get the last now playing message ID for a guild.
         """
-        self._cur.execute(
+        return self._fetch_value(
             f'SELECT last_np_msg FROM player_settings WHERE guild_id = {guild_id}'
         )
-        return self._cur.fetchone()[0]
 
     def set_now_playing(self, guild_id: int, msg_id: int):
         """
         Set the last now playing message ID for a guild.
         """
-        self._cur.execute(
+        self._storage.execute(
             f'UPDATE player_settings SET last_np_msg = {msg_id} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
     def get_status_channel(self, guild_id: int) -> int:
         """
         Get the status channel for a guild.
         """
-        self._cur.execute(
+        return self._fetch_value(
             f'SELECT status_channel FROM player_settings WHERE guild_id = {guild_id}'
         )
-        return self._cur.fetchone()[0]
 
     def set_status_channel(self, guild_id: int, channel_id: int):
         """
         Set the status channel for a guild.
         """
-        self._cur.execute(
+        self._storage.execute(
             f'UPDATE player_settings SET status_channel = {channel_id} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
-    def set_last_bump(self, guild_id: int):
+    def set_last_bump(self, guild_id: int, seconds: Optional[int] = None):
         """
         Set the last bump for a guild.
+
+        :param guild_id: The guild to set the last bump for.
+        :param seconds: The Unix timestamp of the last bump. Defaults to now.
         """
-        seconds = int(time.time())
-        self._cur.execute(
+        if seconds is None:
+            seconds = int(time.time())
+        self._storage.execute(
             f'UPDATE player_settings SET last_bump = {seconds} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
     def get_last_bump(self, guild_id: int) -> int:
         """
         Get the last bump for a guild.
         """
-        self._cur.execute(f'SELECT last_bump FROM player_settings WHERE guild_id = {guild_id}')
-        return self._cur.fetchone()[0]
+        return self._fetch_value(
+            f'SELECT last_bump FROM player_settings WHERE guild_id = {guild_id}'
+        )
 
     def set_bumps_enabled(self, guild_id: int, enabled: bool):
         """
         Set whether bumps are enabled for a guild.
         """
-        self._cur.execute(
+        self._storage.execute(
             f'UPDATE player_settings SET bumps_enabled = {int(enabled)} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
     def get_bumps_enabled(self, guild_id: int) -> bool:
         """
         Get whether bumps are enabled for a guild.
         """
-        self._cur.execute(
+        return self._fetch_value(
             f'SELECT bumps_enabled FROM player_settings WHERE guild_id = {guild_id}'
-        )
-        return self._cur.fetchone()[0] == 1
+        ) == 1
 
     def set_bump_interval(self, guild_id: int, interval: int):
         """
         Set the bump interval for a guild.
         """
-        self._cur.execute(
+        self._storage.execute(
             f'UPDATE player_settings SET bump_interval = {interval} WHERE guild_id = {guild_id}'
         )
-        self._con.commit()
 
     def get_bump_interval(self, guild_id: int) -> int:
         """
         Get the bump interval for a guild.
         """
-        self._cur.execute(
+        return self._fetch_value(
             f'SELECT bump_interval FROM player_settings WHERE guild_id = {guild_id}'
         )
-        return self._cur.fetchone()[0]
 
     def get_session_id(self, node_id: str) -> str:
         """
         Get the session ID for a Lavalink node.
         """
-        self._cur.execute(f'SELECT session_id FROM lavalink WHERE node_id = "{node_id}"')
-        return self._cur.fetchone()[0]
+        return self._fetch_value('SELECT session_id FROM lavalink WHERE node_id = ?', node_id)
 
     def set_session_id(self, node_id: str, session_id: str):
         """
         Set the session ID for a Lavalink node.
         """
-        self._cur.execute(
-            f'''INSERT OR REPLACE INTO lavalink (
+        self._storage.execute(
+            '''INSERT INTO lavalink (
                 node_id,
                 session_id
-            ) VALUES ("{node_id}", "{session_id}")'''
+            ) VALUES (?, ?)
+            ON CONFLICT (node_id) DO UPDATE SET session_id = excluded.session_id''',
+            (node_id, session_id)
         )
-        self._con.commit()
 
     def set_oauth(self, provider: str, credentials: OAuth):
         """
@@ -197,22 +253,22 @@ class Database:
         :param provider: The provider to save the data for. Can be either 'discord' or 'spotify'.
         :param credentials: The OAuth2 credentials to save.
         """
-        self._cur.execute(f'''
-            INSERT OR REPLACE INTO {provider}_oauth (
+        self._storage.execute(f'''
+            INSERT INTO {provider}_oauth (
                 user_id,
                 username,
                 access_token,
                 refresh_token,
                 expires_at
-            ) VALUES (
-                {credentials.user_id},
-                "{credentials.username}",
-                "{credentials.access_token}",
-                "{credentials.refresh_token}",
-                {credentials.expires_at}
-            )
-        ''')
-        self._con.commit()
+            ) VALUES ({credentials.user_id}, ?, ?, ?, {credentials.expires_at})
+            ON CONFLICT (user_id) DO UPDATE SET
+                username = excluded.username,
+                access_token = excluded.access_token,
+                refresh_token = excluded.refresh_token,
+                expires_at = excluded.expires_at
+            ''',
+            (credentials.username, credentials.access_token, credentials.refresh_token)
+        )
 
     def get_oauth(self, provider: str, user_id: int) -> Optional[OAuth]:
         """
@@ -221,8 +277,10 @@ class Database:
         :param provider: The provider to get credentials for. Can be either 'discord' or 'spotify'.
         :param user_id: The user ID to get credentials for
         """
-        self._cur.execute(f'SELECT * FROM {provider}_oauth WHERE user_id = {user_id}')
-        row = self._cur.fetchone()
+        row = self._storage.fetchone(f'''
+            SELECT user_id, username, access_token, refresh_token, expires_at
+            FROM {provider}_oauth WHERE user_id = {user_id}
+        ''')
         if row is None:
             return None
         return OAuth(
@@ -237,165 +295,427 @@ class Database:
         """
         Save Last.fm credentials for a user.
         """
-        self._cur.execute(f'''
-            INSERT OR REPLACE INTO lastfm_oauth (
+        self._storage.execute(f'''
+            INSERT INTO lastfm_oauth (
                 user_id,
                 username,
                 session_key
-            ) VALUES (
-                {credentials.user_id},
-                "{credentials.username}",
-                "{credentials.session_key}"
-            )
-        ''')
-        self._con.commit()
+            ) VALUES ({credentials.user_id}, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                username = excluded.username,
+                session_key = excluded.session_key
+            ''',
+            (credentials.username, credentials.session_key)
+        )
 
     def get_lastfm_credentials(self, user_id: int) -> Optional[LastfmAuth]:
         """
         Get Last.fm credentials for a user.
         """
-        self._cur.execute(
-            f'SELECT * FROM lastfm_oauth WHERE user_id = {user_id}'
+        row = self._storage.fetchone(
+            f'SELECT user_id, username, session_key FROM lastfm_oauth WHERE user_id = {user_id}'
         )
-        row = self._cur.fetchone()
         if row is None:
             return None
         return LastfmAuth(*row)
 
+    def add_pending_scrobbles(self, scrobbles: List[Scrobble]):
+        """
+        Save scrobbles that could not be sent, so they can be retried later.
+        Sets the row ID of each scrobble.
+        """
+        row_ids = self._storage.insertmany(
+            f'INSERT INTO pending_scrobbles ({SCROBBLE_COLUMNS}, attempts) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (
+                    scrobble.user_id,
+                    scrobble.artist,
+                    scrobble.title,
+                    scrobble.timestamp,
+                    scrobble.album,
+                    scrobble.duration,
+                    scrobble.mbid,
+                    scrobble.attempts
+                )
+                for scrobble in scrobbles
+            ]
+        )
+        for scrobble, row_id in zip(scrobbles, row_ids):
+            scrobble.row_id = row_id
+
+    def get_pending_scrobbles(self) -> List[Scrobble]:
+        """
+        Get every saved scrobble that has yet to be sent, oldest first.
+        """
+        rows = self._storage.fetchall(
+            f'SELECT {SCROBBLE_COLUMNS}, id, attempts FROM pending_scrobbles ORDER BY timestamp'
+        )
+        return [Scrobble(*row) for row in rows]
+
+    def set_pending_scrobble_attempts(self, scrobbles: List[Scrobble]):
+        """
+        Save the number of times saved scrobbles have been attempted.
+        """
+        self._storage.executemany(
+            'UPDATE pending_scrobbles SET attempts = ? WHERE id = ?',
+            [(scrobble.attempts, scrobble.row_id) for scrobble in scrobbles]
+        )
+
+    def delete_pending_scrobbles(self, row_ids: List[int]):
+        """
+        Delete saved scrobbles, e.g., after they have been sent.
+        """
+        self._storage.executemany(
+            'DELETE FROM pending_scrobbles WHERE id = ?',
+            [(row_id,) for row_id in row_ids]
+        )
+
     def delete_oauth(self, provider: str, user_id: int):
         """
         Delete OAuth2 data for a user from the database.
         """
-        self._cur.execute(f'DELETE FROM {provider}_oauth WHERE user_id = {user_id}')
-        self._con.commit()
+        self._storage.execute(f'DELETE FROM {provider}_oauth WHERE user_id = {user_id}')
 
     def set_spotify_scopes(self, user_id: int, scopes: List[str]):
         """
         Set the Spotify scopes for a user.
         """
-        self._cur.execute(f'''
-            UPDATE spotify_oauth SET scopes = "{",".join(scopes)}" WHERE user_id = {user_id}
-        ''')
-        self._con.commit()
+        self._storage.execute(
+            f'UPDATE spotify_oauth SET scopes = ? WHERE user_id = {user_id}',
+            (','.join(scopes),)
+        )
 
     def get_spotify_scopes(self, user_id: int) -> List[str]:
         """
         Get the Spotify scopes for a user.
         """
-        self._cur.execute(f'SELECT scopes FROM spotify_oauth WHERE user_id = {user_id}')
-        return self._cur.fetchone()[0].split(',')
+        return self._fetch_value(
+            f'SELECT scopes FROM spotify_oauth WHERE user_id = {user_id}'
+        ).split(',')
 
-    def add_bump(self, guild_id: int, url: str, title: str, author: str):
+    def add_bump(self, bump: Bump):
         """
-        Set a bump for a guild.
+        Add a bump for a guild. The index of the bump is ignored,
+        and the next available index for the guild is used instead.
         """
-        self._cur.execute(f'SELECT MAX(idx) FROM bumps WHERE guild_id = {guild_id}')
-        idx = self._cur.fetchone()[0]
+        idx = self._fetch_value(f'SELECT MAX(idx) FROM bumps WHERE guild_id = {bump.guild_id}')
         if idx is None:
             idx = 0
         idx += 1
-        self._cur.execute(f'''
+        self._storage.execute('''
             INSERT INTO bumps (
                 guild_id,
                 idx,
                 url,
                 title,
-                author
-            ) VALUES (
-                {guild_id},
-                {idx},
-                "{url}",
-                "{title}",
-                "{author}"
+                author,
+                spotify_id,
+                isrc,
+                artwork,
+                duration,
+                lavalink_track
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''',
+            (
+                bump.guild_id,
+                idx,
+                bump.url,
+                bump.title,
+                bump.author,
+                bump.spotify_id,
+                bump.isrc,
+                bump.artwork,
+                bump.duration,
+                bump.lavalink_track
+            )
+        )
+
+    def set_bump_track(self, bump: Bump):
+        """
+        Update the resolved metadata and Lavalink track of a guild bump.
+        """
+        self._storage.execute('''
+            UPDATE bumps SET
+                spotify_id = ?,
+                isrc = ?,
+                artwork = ?,
+                duration = ?,
+                lavalink_track = ?
+            WHERE guild_id = ? AND idx = ?
+            ''',
+            (
+                bump.spotify_id,
+                bump.isrc,
+                bump.artwork,
+                bump.duration,
+                bump.lavalink_track,
+                bump.guild_id,
+                bump.idx
             )
-            '''
         )
-        self._con.commit()
 
     def get_bumps(self, guild_id: int) -> Optional[List[Bump]]:
         """
         Get every bump for a guild.
         """
-        self._cur.execute(f'''SELECT idx, guild_id, url, title, author
-            FROM bumps WHERE guild_id = {guild_id}''')
-        rows = self._cur.fetchall()
+        rows = self._storage.fetchall(f'''SELECT {BUMP_COLUMNS}
+            FROM bumps WHERE guild_id = {guild_id} ORDER BY idx''')
         if len(rows) == 0:
             return None
 
-        return [
-            Bump(
-                idx=row[0],
-                guild_id=row[1],
-                url=row[2],
-                title=row[3],
-                author=row[4]
-            )
-            for row in rows
-        ]
+        return [Bump(*row) for row in rows]
 
     def get_bump(self, guild_id: int, idx: int) -> Optional[Bump]:
         """
         Get a guild bump by its index.
         """
-        self._cur.execute(
-            f'''SELECT idx, guild_id, url, title, author FROM bumps 
+        row = self._storage.fetchone(
+            f'''SELECT {BUMP_COLUMNS} FROM bumps
             WHERE guild_id = {guild_id} AND idx = {idx}
             '''
         )
-        row = self._cur.fetchone()
         if row is None:
             return None
-        return Bump(
-            idx=row[0],
-            guild_id=row[1],
-            url=row[2],
-            title=row[3],
-            author=row[4]
-        )
+        return Bump(*row)
 
     def get_bump_by_url(self, guild_id: int, url: str) -> Optional[Bump]:
         """
         Get a guild bump by its URL.
         """
-        self._cur.execute(
-            f'''SELECT idx, guild_id, url, title, author FROM bumps
-            WHERE guild_id = {guild_id} AND url = "{url}"
-            '''
+        row = self._storage.fetchone(
+            f'''SELECT {BUMP_COLUMNS} FROM bumps
+            WHERE guild_id = {guild_id} AND url = ?
+            ''',
+            (url,)
         )
-        row = self._cur.fetchone()
         if row is None:
             return None
-        return Bump(
-            idx=row[0],
-            guild_id=row[1],
-            url=row[2],
-            title=row[3],
-            author=row[4]
-        )
+        return Bump(*row)
 
     def get_random_bump(self, guild_id: int) -> Optional[Bump]:
         """
         Get a random guild bump.
+
+        Picks random indices between the lowest and highest bump indices
+        for the guild until one of them exists, so that every lookup is
+        served by the UNIQUE(guild_id, idx) index instead of sorting every
+        bump in the guild. If the guild's indices are too sparse, falls back
+        to the first bump after a random index.
         """
-        self._cur.execute(
-            f'''SELECT idx, guild_id, url, title, author FROM bumps WHERE
-            guild_id = {guild_id} ORDER BY RANDOM() LIMIT 1
+        row = self._storage.fetchone(
+            f'''SELECT
+                (SELECT MIN(idx) FROM bumps WHERE guild_id = {guild_id}),
+                (SELECT MAX(idx) FROM bumps WHERE guild_id = {guild_id})
             '''
         )
-        row = self._cur.fetchone()
-        if row is None:
+        assert row is not None
+        min_idx, max_idx = row
+        if min_idx is None or max_idx is None:
             return None
-        return Bump(
-            idx=row[0],
-            guild_id=row[1],
-            url=row[2],
-            title=row[3],
-            author=row[4]
+
+        for _ in range(RANDOM_BUMP_ATTEMPTS):
+            bump = self.get_bump(guild_id, randint(min_idx, max_idx))
+            if bump is not None:
+                return bump
+
+        row = self._storage.fetchone(
+            f'''SELECT {BUMP_COLUMNS} FROM bumps
+            WHERE guild_id = {guild_id} AND idx >= {randint(min_idx, max_idx)}
+            ORDER BY idx LIMIT 1
+            '''
         )
+        if row is None:
+            return None
+        return Bump(*row)
 
     def delete_bump(self, guild_id: int, idx: int):
         """
         Delete a guild bump by its index.
         """
-        self._cur.execute(f'DELETE FROM bumps WHERE guild_id = {guild_id} AND idx = {idx}')
-        self._con.commit()
+        self._storage.execute(f'DELETE FROM bumps WHERE guild_id = {guild_id} AND idx = {idx}')
+
+    def add_queue_items(self, guild_id: int, items: List[PersistedQueueItem]):
+        """
+        Save new items to a guild's queue. Sets the row ID of each item.
+        """
+        row_ids = self._storage.insertmany(f'''
+            INSERT INTO queue_items (
+                guild_id,
+                position,
+                shuffle_position,
+                {QUEUE_ITEM_COLUMNS},
+                lavalink_track,
+                is_imperfect,
+                is_annotated
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''',
+            [
+                (
+                    guild_id,
+                    persisted.position,
+                    persisted.shuffle_position,
+                    *(getattr(persisted.item, field) for field in QUEUE_ITEM_FIELDS),
+                    persisted.lavalink_track,
+                    int(bool(persisted.item.is_imperfect)),
+                    int(bool(persisted.item.is_annotated))
+                )
+                for persisted in items
+            ]
+        )
+        for persisted, row_id in zip(items, row_ids):
+            persisted.row_id = row_id
+
+    def update_queue_items(self, items: List[PersistedQueueItem]):
+        """
+        Save the lookup results for items in a guild's queue, i.e., their
+        metadata, Lavalink track, MusicBrainz ID, and ISRC.
+        """
+        self._storage.executemany(f'''
+            UPDATE queue_items SET
+                {', '.join(f'{field} = ?' for field in QUEUE_ITEM_FIELDS)},
+                lavalink_track = ?,
+                is_imperfect = ?,
+                is_annotated = ?
+            WHERE id = ?
+            ''',
+            [
+                (
+                    *(getattr(persisted.item, field) for field in QUEUE_ITEM_FIELDS),
+                    persisted.lavalink_track,
+                    int(bool(persisted.item.is_imperfect)),
+                    int(bool(persisted.item.is_annotated)),
+                    persisted.row_id
+                )
+                for persisted in items
+            ]
+        )
+
+    def set_queue_item_positions(self, positions: List[Tuple[int, float]]):
+        """
+        Set the queue order positions of items in a guild's queue.
+
+        :param positions: A list of (row ID, position) tuples.
+        """
+        self._storage.executemany(
+            'UPDATE queue_items SET position = ? WHERE id = ?',
+            [(position, row_id) for row_id, position in positions]
+        )
+
+    def set_queue_item_shuffle_positions(self, positions: List[Tuple[int, float]]):
+        """
+        Set the shuffle order positions of items in a guild's queue.
+
+        :param positions: A list of (row ID, shuffle position) tuples.
+        """
+        self._storage.executemany(
+            'UPDATE queue_items SET shuffle_position = ? WHERE id = ?',
+            [(position, row_id) for row_id, position in positions]
+        )
+
+    def clear_queue_shuffle(self, guild_id: int):
+        """
+        Clear the shuffle order of a guild's queue.
+        """
+        self._storage.execute(
+            f'UPDATE queue_items SET shuffle_position = NULL WHERE guild_id = {guild_id}'
+        )
+
+    def get_queue_items(self, guild_id: int) -> List[PersistedQueueItem]:
+        """
+        Get every item in a guild's queue, in queue order.
+        """
+        rows = self._storage.fetchall(f'''
+            SELECT id, position, shuffle_position, {QUEUE_ITEM_COLUMNS},
+                lavalink_track, is_imperfect, is_annotated
+            FROM queue_items WHERE guild_id = {guild_id} ORDER BY position
+        ''')
+        return [
+            PersistedQueueItem(
+                row_id=row[0],
+                position=row[1],
+                shuffle_position=row[2],
+                item=QueueItem(
+                    **dict(zip(QUEUE_ITEM_FIELDS, row[3:14])),
+                    is_imperfect=row[15] == 1,
+                    is_annotated=row[16] == 1
+                ),
+                lavalink_track=row[14]
+            )
+            for row in rows
+        ]
+
+    def delete_queue_item(self, row_id: int):
+        """
+        Delete an item from a guild's queue.
+        """
+        self._storage.execute(f'DELETE FROM queue_items WHERE id = {row_id}')
+
+    def delete_queue_items(self, row_ids: List[int]):
+        """
+        Delete multiple items from a guild's queue.
+        """
+        self._storage.executemany(
+            'DELETE FROM queue_items WHERE id = ?',
+            [(row_id,) for row_id in row_ids]
+        )
+
+    def get_queue_current(self, guild_id: int) -> int:
+        """
+        Get the row ID of the current item in a guild's queue.
+        """
+        return self._fetch_value(
+            f'SELECT queue_current FROM player_settings WHERE guild_id = {guild_id}'
+        )
+
+    def set_queue_current(self, guild_id: int, row_id: int):
+        """
+        Set the row ID of the current item in a guild's queue.
+        """
+        self._storage.execute(
+            f'UPDATE player_settings SET queue_current = {row_id} WHERE guild_id = {guild_id}'
+        )
+
+    def get_queue_position(self, guild_id: int) -> int:
+        """
+        Get the playback position in the current track of a guild's queue, in milliseconds.
+        """
+        return self._fetch_value(
+            f'SELECT queue_position FROM player_settings WHERE guild_id = {guild_id}'
+        )
+
+    def set_queue_position(self, guild_id: int, position: int):
+        """
+        Set the playback position in the current track of a guild's queue, in milliseconds.
+        """
+        self._storage.execute(
+            f'UPDATE player_settings SET queue_position = {position} WHERE guild_id = {guild_id}'
+        )
+
+    def get_voice_channel(self, guild_id: int) -> int:
+        """
+        Get the voice channel that the player was last connected to in a guild.
+        """
+        return self._fetch_value(
+            f'SELECT voice_channel FROM player_settings WHERE guild_id = {guild_id}'
+        )
+
+    def set_voice_channel(self, guild_id: int, channel_id: int):
+        """
+        Set the voice channel that the player is connected to in a guild.
+        """
+        self._storage.execute(
+            f'UPDATE player_settings SET voice_channel = {channel_id} WHERE guild_id = {guild_id}'
+        )
+
+    def get_resumable_guilds(self) -> List[Tuple[int, int]]:
+        """
+        Get every guild with a saved queue and voice channel.
+
+        :return: A list of (guild ID, voice channel ID) tuples.
+        """
+        rows = self._storage.fetchall('''
+            SELECT guild_id, voice_channel FROM player_settings
+            WHERE voice_channel != -1 AND queue_current != -1
+        ''')
+        return [(row[0], row[1]) for row in rows]
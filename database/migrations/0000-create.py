@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from sqlite3 import Connection
 
+    from psycopg import Connection as PostgresConnection
+
 
 def run(con: 'Connection'):
     """
@@ -23,3 +25,18 @@ def run(con: 'Connection'):
         )
     ''')
     con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS player_settings (
+            guild_id BIGINT PRIMARY KEY NOT NULL,
+            volume INTEGER NOT NULL DEFAULT 100,
+            loop INTEGER NOT NULL DEFAULT 0,
+            last_np_msg BIGINT NOT NULL DEFAULT -1
+        )
+    ''')
+    con.commit()
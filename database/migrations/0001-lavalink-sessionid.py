@@ -9,6 +9,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from sqlite3 import Connection
 
+    from psycopg import Connection as PostgresConnection
+
+
 def run(con: 'Connection'):
     """
     Run the migration.
@@ -21,3 +24,16 @@ def run(con: 'Connection'):
         )
     ''')
     con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS lavalink (
+            node_id TEXT PRIMARY KEY NOT NULL,
+            session_id TEXT NOT NULL
+        )
+    ''')
+    con.commit()
@@ -9,6 +9,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from sqlite3 import Connection
 
+    from psycopg import Connection as PostgresConnection
+
+
 def run(con: 'Connection'):
     """
     Run the migration.
@@ -25,3 +28,13 @@ def run(con: 'Connection'):
         pass
 
     con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        ALTER TABLE player_settings ADD COLUMN IF NOT EXISTS status_channel BIGINT NOT NULL DEFAULT -1
+    ''')
+    con.commit()
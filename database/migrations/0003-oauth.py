@@ -8,6 +8,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from sqlite3 import Connection
 
+    from psycopg import Connection as PostgresConnection
+
+
 def run(con: 'Connection'):
     """
     Run the migration.
@@ -40,3 +43,36 @@ def run(con: 'Connection'):
         )
     ''')
     con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS discord_oauth (
+            user_id BIGINT PRIMARY KEY NOT NULL,
+            username TEXT NOT NULL,
+            access_token TEXT NOT NULL,
+            refresh_token TEXT NOT NULL,
+            expires_at BIGINT NOT NULL
+        )
+    ''')
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS spotify_oauth (
+            user_id BIGINT PRIMARY KEY NOT NULL,
+            username TEXT NOT NULL,
+            access_token TEXT NOT NULL,
+            refresh_token TEXT NOT NULL,
+            expires_at BIGINT NOT NULL,
+            scopes TEXT NOT NULL DEFAULT ''
+        )
+    ''')
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS lastfm_oauth (
+            user_id BIGINT PRIMARY KEY NOT NULL,
+            username TEXT NOT NULL,
+            session_key TEXT NOT NULL
+        )
+    ''')
+    con.commit()
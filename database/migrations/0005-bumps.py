@@ -10,6 +10,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from sqlite3 import Connection
 
+    from psycopg import Connection as PostgresConnection
+
 
 def run(con: 'Connection'):
     """
@@ -58,3 +60,28 @@ def run(con: 'Connection'):
         con.commit()
     except OperationalError:
         pass
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS bumps (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            idx INTEGER NOT NULL,
+            guild_id BIGINT NOT NULL,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            url TEXT NOT NULL,
+
+            UNIQUE(guild_id, idx)
+        )
+    ''')
+    for column in (
+        'bump_interval INTEGER NOT NULL DEFAULT 20',
+        'last_bump BIGINT NOT NULL DEFAULT 0',
+        'bumps_enabled INTEGER NOT NULL DEFAULT 0'
+    ):
+        con.execute(f'ALTER TABLE player_settings ADD COLUMN IF NOT EXISTS {column}')
+    con.commit()
@@ -0,0 +1,33 @@
+"""
+Add an index on the bumps table for lookups by guild and URL.
+Random bump selection uses the existing UNIQUE(guild_id, idx) index.
+"""
+# pylint: disable=invalid-name
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+    from psycopg import Connection as PostgresConnection
+
+
+def run(con: 'Connection'):
+    """
+    Run the migration.
+    """
+    cur = con.cursor()
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS bumps_guild_url ON bumps (guild_id, url)
+    ''')
+    con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        CREATE INDEX IF NOT EXISTS bumps_guild_url ON bumps (guild_id, url)
+    ''')
+    con.commit()
@@ -0,0 +1,52 @@
+"""
+Add columns to the bumps table for storing the resolved metadata
+and encoded Lavalink track of each bump, so that bumps can be played
+without looking them up again.
+"""
+# pylint: disable=invalid-name
+
+from sqlite3 import OperationalError
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+    from psycopg import Connection as PostgresConnection
+
+
+def run(con: 'Connection'):
+    """
+    Run the migration.
+    """
+    cur = con.cursor()
+
+    # There's no built-in way to check if a column exists in SQLite,
+    # so we just try to add it and ignore the error if it already exists.
+    for column in (
+        'spotify_id TEXT',
+        'isrc TEXT',
+        'artwork TEXT',
+        'duration INTEGER',
+        'lavalink_track TEXT'
+    ):
+        try:
+            cur.execute(f'ALTER TABLE bumps ADD COLUMN {column}')
+        except OperationalError:
+            pass
+
+    con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    for column in (
+        'spotify_id TEXT',
+        'isrc TEXT',
+        'artwork TEXT',
+        'duration INTEGER',
+        'lavalink_track TEXT'
+    ):
+        con.execute(f'ALTER TABLE bumps ADD COLUMN IF NOT EXISTS {column}')
+    con.commit()
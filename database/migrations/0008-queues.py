@@ -0,0 +1,100 @@
+"""
+Create the queue_items table and add columns to player_settings
+for persisting each guild's queue across restarts.
+"""
+# pylint: disable=invalid-name
+
+from sqlite3 import OperationalError
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+    from psycopg import Connection as PostgresConnection
+
+
+def run(con: 'Connection'):
+    """
+    Run the migration.
+    """
+    cur = con.cursor()
+
+    # Items are ordered by position, and by shuffle_position if the queue is shuffled.
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS queue_items (
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            position REAL NOT NULL,
+            shuffle_position REAL,
+            requester INTEGER NOT NULL,
+            spotify_id TEXT,
+            mbid TEXT,
+            isrc TEXT,
+            url TEXT,
+            artwork TEXT,
+            title TEXT,
+            artist TEXT,
+            author TEXT,
+            album TEXT,
+            duration INTEGER,
+            lavalink_track TEXT,
+            is_imperfect INTEGER NOT NULL DEFAULT 0,
+            is_annotated INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS queue_items_guild ON queue_items (guild_id, position)
+    ''')
+    con.commit()
+
+    # There's no built-in way to check if a column exists in SQLite,
+    # so we just try to add it and ignore the error if it already exists.
+    for column in (
+        'queue_current INTEGER NOT NULL DEFAULT -1',
+        'queue_position INTEGER NOT NULL DEFAULT 0',
+        'voice_channel INTEGER NOT NULL DEFAULT -1'
+    ):
+        try:
+            cur.execute(f'ALTER TABLE player_settings ADD COLUMN {column}')
+        except OperationalError:
+            pass
+
+    con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS queue_items (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            guild_id BIGINT NOT NULL,
+            position DOUBLE PRECISION NOT NULL,
+            shuffle_position DOUBLE PRECISION,
+            requester BIGINT NOT NULL,
+            spotify_id TEXT,
+            mbid TEXT,
+            isrc TEXT,
+            url TEXT,
+            artwork TEXT,
+            title TEXT,
+            artist TEXT,
+            author TEXT,
+            album TEXT,
+            duration INTEGER,
+            lavalink_track TEXT,
+            is_imperfect INTEGER NOT NULL DEFAULT 0,
+            is_annotated INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    con.execute('''
+        CREATE INDEX IF NOT EXISTS queue_items_guild ON queue_items (guild_id, position)
+    ''')
+    for column in (
+        'queue_current BIGINT NOT NULL DEFAULT -1',
+        'queue_position INTEGER NOT NULL DEFAULT 0',
+        'voice_channel BIGINT NOT NULL DEFAULT -1'
+    ):
+        con.execute(f'ALTER TABLE player_settings ADD COLUMN IF NOT EXISTS {column}')
+    con.commit()
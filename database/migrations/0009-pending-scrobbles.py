@@ -0,0 +1,53 @@
+"""
+Create the pending_scrobbles table for scrobbles that could not be sent
+to Last.fm, so that they can be retried later, even after a restart.
+"""
+# pylint: disable=invalid-name
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+    from psycopg import Connection as PostgresConnection
+
+
+def run(con: 'Connection'):
+    """
+    Run the migration.
+    """
+    cur = con.cursor()
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS pending_scrobbles (
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            artist TEXT NOT NULL,
+            title TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            album TEXT,
+            duration INTEGER,
+            mbid TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    con.commit()
+
+
+def run_postgres(con: 'PostgresConnection'):
+    """
+    Run the migration on a PostgreSQL database.
+    """
+    con.execute('''
+        CREATE TABLE IF NOT EXISTS pending_scrobbles (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+            artist TEXT NOT NULL,
+            title TEXT NOT NULL,
+            timestamp BIGINT NOT NULL,
+            album TEXT,
+            duration INTEGER,
+            mbid TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    con.commit()
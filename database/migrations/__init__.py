@@ -1,33 +1,44 @@
 """
 Database migrations module for Blanco.
-Handles automatic adjustment of the SQLite database schema
+Handles automatic adjustment of the database schema
 across updates of the bot.
+
+Every migration defines run() for SQLite and run_postgres() for PostgreSQL.
 """
 
 from importlib import import_module
 from os import listdir, path
 from sqlite3 import OperationalError
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Tuple, Type
 
 if TYPE_CHECKING:
     from logging import Logger
-    from sqlite3 import Connection
 
 
-def run_migrations(logger: 'Logger', con: 'Connection'):
+def run_migrations(
+    logger: 'Logger',
+    con: Any,
+    /,
+    dialect: str = 'sqlite',
+    errors: Tuple[Type[Exception], ...] = (OperationalError,)
+):
     """
     Run all migrations on Blanco's database.
 
-    :param con: The Connection instance to the SQLite database.
+    :param con: The connection to the database.
+    :param dialect: The SQL dialect of the database, which selects the
+        migration function to run, i.e., 'sqlite' or 'postgres'.
+    :param errors: The exception types raised by the database driver.
     """
+    func_name = 'run' if dialect == 'sqlite' else f'run_{dialect}'
     for file in sorted(listdir(path.dirname(__file__))):
         if file != path.basename(__file__) and file.endswith('.py'):
             logger.debug('Running migration: %s', file)
             migration = import_module(f'database.migrations.{file[:-3]}')
 
             try:
-                migration.run(con)
-            except OperationalError as err:
+                getattr(migration, func_name)(con)
+            except errors as err:
                 logger.error('Error running migration %s: %s', file, err)
                 logger.critical('Aborting migrations.')
                 raise RuntimeError('Error running migrations.') from err
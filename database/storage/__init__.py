@@ -0,0 +1,11 @@
+"""
+Storage backends for Blanco's database.
+
+The PostgreSQL backend is not imported here, so that its driver
+only needs to be installed when it is actually used.
+"""
+
+from .base import Storage
+from .sqlite import SQLiteStorage
+
+__all__ = ['Storage', 'SQLiteStorage']
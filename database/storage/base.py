@@ -0,0 +1,88 @@
+"""
+Storage interface for Blanco's database.
+"""
+
+from abc import ABC, abstractmethod
+from typing import (TYPE_CHECKING, Any, Callable, Iterable, List, Optional,
+                    Sequence, Tuple, TypeVar)
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+T = TypeVar('T')
+
+
+class Storage(ABC):
+    """
+    Interface for a SQL database that Blanco's data can be stored in.
+
+    Queries are written in the subset of SQL that is shared by every backend,
+    with `?` as the parameter placeholder. Every statement is committed
+    as soon as it is executed.
+    """
+
+    @property
+    @abstractmethod
+    def dialect(self) -> str:
+        """
+        Returns the name of the SQL dialect used by this backend,
+        which selects the migrations to run, e.g., 'sqlite'.
+        """
+
+    @property
+    def is_remote(self) -> bool:
+        """
+        Returns whether queries are sent over the network, in which case
+        they should be made through run() from the event loop.
+        """
+        return False
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Calls a function that queries this storage without blocking the event loop.
+        Local backends call the function directly.
+        """
+        return func(*args)
+
+    @abstractmethod
+    def migrate(self, logger: 'Logger'):
+        """
+        Brings the database schema up to date.
+        """
+
+    @abstractmethod
+    def execute(self, query: str, params: Sequence[Any] = ()):
+        """
+        Executes a statement.
+        """
+
+    @abstractmethod
+    def executemany(self, query: str, params: Iterable[Sequence[Any]]):
+        """
+        Executes a statement once for every set of parameters.
+        """
+
+    @abstractmethod
+    def insertmany(self, query: str, params: Iterable[Sequence[Any]]) -> List[int]:
+        """
+        Executes a single-row INSERT statement once for every set of parameters,
+        and returns the IDs of the new rows in the same order.
+        """
+
+    @abstractmethod
+    def fetchone(self, query: str, params: Sequence[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        """
+        Executes a query and returns the first row, if any.
+        """
+
+    @abstractmethod
+    def fetchall(self, query: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        """
+        Executes a query and returns every row.
+        """
+
+    @abstractmethod
+    def close(self):
+        """
+        Closes every connection to the database.
+        """
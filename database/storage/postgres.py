@@ -0,0 +1,108 @@
+"""
+PostgreSQL storage backend.
+"""
+
+from asyncio import get_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (TYPE_CHECKING, Any, Callable, Iterable, List, Optional,
+                    Sequence, Tuple, TypeVar)
+
+from psycopg import Error as PostgresError
+from psycopg_pool import ConnectionPool
+
+from ..migrations import run_migrations
+from .base import Storage
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+T = TypeVar('T')
+
+# Size limits of the connection pool for each bot process
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+
+
+def _convert_placeholders(query: str) -> str:
+    """
+    Converts `?` placeholders to the `%s` placeholders used by psycopg.
+    """
+    return query.replace('?', '%s')
+
+
+class PostgresStorage(Storage):
+    """
+    Stores data in a PostgreSQL server, which can be shared by several bot processes.
+
+    Queries made through run() are executed in a pool of threads,
+    one for each connection in the pool, so that waiting for the server
+    does not block the event loop.
+    """
+
+    def __init__(self, url: str):
+        self._pool = ConnectionPool(
+            url,
+            min_size=POOL_MIN_SIZE,
+            max_size=POOL_MAX_SIZE,
+            open=True
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=POOL_MAX_SIZE,
+            thread_name_prefix='postgres'
+        )
+
+    @property
+    def dialect(self) -> str:
+        return 'postgres'
+
+    @property
+    def is_remote(self) -> bool:
+        return True
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        return await get_event_loop().run_in_executor(self._executor, partial(func, *args))
+
+    def migrate(self, logger: 'Logger'):
+        with self._pool.connection() as con:
+            run_migrations(logger, con, dialect=self.dialect, errors=(PostgresError,))
+
+    def execute(self, query: str, params: Sequence[Any] = ()):
+        with self._pool.connection() as con:
+            con.execute(_convert_placeholders(query), params)
+
+    def executemany(self, query: str, params: Iterable[Sequence[Any]]):
+        with self._pool.connection() as con:
+            with con.cursor() as cur:
+                cur.executemany(_convert_placeholders(query), params)
+
+    def insertmany(self, query: str, params: Iterable[Sequence[Any]]) -> List[int]:
+        params = list(params)
+        if len(params) == 0:
+            return []
+
+        # Send every row in one batch, then read the IDs back in order
+        query = f'{_convert_placeholders(query)} RETURNING id'
+        row_ids = []
+        with self._pool.connection() as con:
+            with con.cursor() as cur:
+                cur.executemany(query, params, returning=True)
+                while True:
+                    row = cur.fetchone()
+                    assert row is not None
+                    row_ids.append(row[0])
+                    if not cur.nextset():
+                        break
+        return row_ids
+
+    def fetchone(self, query: str, params: Sequence[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        with self._pool.connection() as con:
+            return con.execute(_convert_placeholders(query), params).fetchone()
+
+    def fetchall(self, query: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        with self._pool.connection() as con:
+            return con.execute(_convert_placeholders(query), params).fetchall()
+
+    def close(self):
+        self._executor.shutdown()
+        self._pool.close()
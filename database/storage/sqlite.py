@@ -0,0 +1,57 @@
+"""
+SQLite storage backend.
+"""
+
+import sqlite3 as sql
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence, Tuple
+
+from ..migrations import run_migrations
+from .base import Storage
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+
+class SQLiteStorage(Storage):
+    """
+    Stores data in a local SQLite file. Only one bot process can use it at a time.
+    """
+
+    def __init__(self, db_filename: str):
+        self._con = sql.connect(db_filename, check_same_thread=False)
+        self._cur = self._con.cursor()
+
+    @property
+    def dialect(self) -> str:
+        return 'sqlite'
+
+    def migrate(self, logger: 'Logger'):
+        run_migrations(logger, self._con)
+
+    def execute(self, query: str, params: Sequence[Any] = ()):
+        self._cur.execute(query, params)
+        self._con.commit()
+
+    def executemany(self, query: str, params: Iterable[Sequence[Any]]):
+        self._cur.executemany(query, params)
+        self._con.commit()
+
+    def insertmany(self, query: str, params: Iterable[Sequence[Any]]) -> List[int]:
+        row_ids = []
+        for row_params in params:
+            self._cur.execute(query, row_params)
+            assert self._cur.lastrowid is not None
+            row_ids.append(self._cur.lastrowid)
+        self._con.commit()
+        return row_ids
+
+    def fetchone(self, query: str, params: Sequence[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        self._cur.execute(query, params)
+        return self._cur.fetchone()
+
+    def fetchall(self, query: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        self._cur.execute(query, params)
+        return self._cur.fetchall()
+
+    def close(self):
+        self._con.close()
@@ -2,6 +2,7 @@
 Dataclass for guild bumps.
 """
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -15,3 +16,12 @@ class Bump:
     url: str
     title: str
     author: str
+
+    # Resolved when the bump is added, so it can be played without a lookup
+    spotify_id: Optional[str] = None
+    isrc: Optional[str] = None
+    artwork: Optional[str] = None
+    duration: Optional[int] = None
+
+    # Serialized Lavalink track, see jockey_helpers.serialize_lavalink_track()
+    lavalink_track: Optional[str] = None
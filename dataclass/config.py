@@ -52,7 +52,7 @@ class Config:
     Dataclass for storing Blanco's configuration.
     """
     # Required
-    db_file: str
+    db_file: Optional[str]
     discord_token: str
     spotify_client_id: str
     spotify_client_secret: str
@@ -60,6 +60,7 @@ class Config:
     enable_server: bool
 
     # Optional
+    database_url: Optional[str] = None
     server_port: int = 8080
     base_url: Optional[str] = None
     discord_oauth_id: Optional[str] = None
@@ -67,10 +68,18 @@ class Config:
     lastfm_api_key: Optional[str] = None
     lastfm_shared_secret: Optional[str] = None
     match_ahead: bool = False
+    edit_now_playing: bool = False
     debug_enabled: bool = False
     debug_guild_ids: Optional[List[int]] = None
     reenqueue_paused: bool = False
 
+    # Sharding. If shard_ids is set, this process only runs those shards
+    # out of shard_count, so that several processes can split the guilds.
+    # Otherwise, all shards run in this process, and if shard_count is not set,
+    # Discord's recommended number of shards is used.
+    shard_count: Optional[int] = None
+    shard_ids: Optional[List[int]] = None
+
     # Convenience
     @property
     def lastfm_enabled(self) -> bool:
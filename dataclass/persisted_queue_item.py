@@ -0,0 +1,27 @@
+"""
+Dataclass for storing a queue item as it is saved in the database.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from dataclass.queue_item import QueueItem
+
+
+@dataclass(slots=True)
+class PersistedQueueItem:
+    """
+    Dataclass for storing a queue item as it is saved in the database.
+    """
+    # Row ID in the queue_items table, -1 if not saved yet
+    row_id: int
+
+    # Sort keys for the queue order and, if the queue is shuffled, the shuffle order
+    position: float
+    shuffle_position: Optional[float]
+
+    # The item itself, without its Lavalink track
+    item: QueueItem
+
+    # Serialized Lavalink track, see jockey_helpers.serialize_lavalink_track()
+    lavalink_track: Optional[str] = None
@@ -1,55 +1,105 @@
 """
-Dataclass for storing a track in the player queue.
+Class for storing a track in the player queue.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+from dataclass.track_metadata import TRACK_METADATA, TrackMetadata
 
 if TYPE_CHECKING:
     from mafic import Track
 
 
-@dataclass
-class QueueItem:
+class MetadataField:
     """
-    Dataclass for storing a track in the player queue.
+    Descriptor that exposes a field of a QueueItem's shared TrackMetadata
+    as if it were a field of the QueueItem itself.
+
+    Setting the field does not change the shared metadata in place.
+    The QueueItem gets a modified copy instead, see TrackMetadataRegistry.update().
     """
-    # Who requested the track (required)
-    requester: int
+    def __init__(self):
+        self._name = ''
+
+    def __set_name__(self, owner: type, name: str):
+        self._name = name
 
-    # The Spotify ID for the track, if any
-    spotify_id: Optional[str] = None
+    def __get__(self, item: Optional[QueueItem], owner: type) -> Any:
+        if item is None:
+            return self
+        return getattr(item.metadata, self._name)
 
-    # The MusicBrainz ID for the track, if any
-    mbid: Optional[str] = None
+    def __set__(self, item: QueueItem, value: Any):
+        item.update_metadata(**{self._name: value})
 
-    # International Standard Recording Code (ISRC)
-    isrc: Optional[str] = None
 
-    # Direct track URL
-    url: Optional[str] = None
+class QueueItem:
+    """
+    Class for storing a track in the player queue.
+
+    Only the requester and playback state belong to the item itself.
+    Everything else is kept in a TrackMetadata that is shared with
+    every other item for the same track, even across guilds.
+    """
+    __slots__ = ('requester', 'start_time', 'metadata')
+
+    # Track metadata, see dataclass/track_metadata.py
+    spotify_id: Optional[str] = MetadataField() # type: ignore
+    mbid: Optional[str] = MetadataField() # type: ignore
+    isrc: Optional[str] = MetadataField() # type: ignore
+    url: Optional[str] = MetadataField() # type: ignore
+    artwork: Optional[str] = MetadataField() # type: ignore
+    title: Optional[str] = MetadataField() # type: ignore
+    artist: Optional[str] = MetadataField() # type: ignore
+    author: Optional[str] = MetadataField() # type: ignore
+    album: Optional[str] = MetadataField() # type: ignore
+    duration: Optional[int] = MetadataField() # type: ignore
+    lavalink_track: Optional['Track'] = MetadataField() # type: ignore
+    is_imperfect: Optional[bool] = MetadataField() # type: ignore
+    is_annotated: Optional[bool] = MetadataField() # type: ignore
+
+    def __init__(
+        self,
+        requester: int,
+        start_time: Optional[int] = None,
+        **metadata: Any
+    ):
+        """
+        :param requester: The ID of the user who requested the track.
+        :param start_time: When the track started playing.
+        :param metadata: Fields of TrackMetadata, e.g., title and artist.
+        """
+        # Who requested the track (required)
+        self.requester = requester
 
-    # Album artwork
-    artwork: Optional[str] = None
+        # When the track started playing
+        self.start_time = start_time
 
-    # Track details
-    title: Optional[str] = None
-    artist: Optional[str] = None # First artist
-    author: Optional[str] = None # All artists, separated by ', '
-    album: Optional[str] = None
-    duration: Optional[int] = 0   # milliseconds
-    lavalink_track: Optional['Track'] = None
+        # Shared track metadata
+        self.metadata: TrackMetadata = TRACK_METADATA.get(TrackMetadata(**metadata))
 
-    # Imperfect match - True when ISRC is present but no match found on YouTube
-    is_imperfect: Optional[bool] = False
+    def __repr__(self) -> str:
+        return (
+            f'QueueItem(requester={self.requester!r}, '
+            f'start_time={self.start_time!r}, metadata={self.metadata!r})'
+        )
 
-    # If annotate_track() was called on this track
-    is_annotated: Optional[bool] = False
+    def update_metadata(self, **changes: Any):
+        """
+        Changes multiple metadata fields at once, so that the shared
+        metadata is only copied once.
+        """
+        self.metadata = TRACK_METADATA.update(self.metadata, **changes)
 
-    # When the track started playing
-    start_time: Optional[int] = None
+    @property
+    def is_stub(self) -> bool:
+        """
+        Whether this is a lazily queued Spotify track whose metadata has not
+        been fetched yet. See jockey_helpers.materialize_queue_items().
+        """
+        return self.title is None and self.spotify_id is not None
 
     # Get title and artist
     def get_details(self) -> Tuple[str, str]:
@@ -65,6 +115,9 @@ class QueueItem:
         elif self.url is not None:
             title = self.url
             artist = '(direct link)'
+        elif self.spotify_id is not None:
+            title = f'spotify:track:{self.spotify_id}'
+            artist = '(details not loaded yet)'
         else:
             title = 'Unknown title'
             artist = 'Unknown query'
@@ -0,0 +1,28 @@
+"""
+Dataclass for scrobbles waiting to be sent to Last.fm.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class Scrobble:
+    """
+    Dataclass for a scrobble waiting to be sent to Last.fm for a user.
+    Holds a copy of the track's metadata, so it can be sent or saved
+    regardless of what happens to the track in the queue afterwards.
+    """
+    user_id: int
+    artist: str
+    title: str
+
+    # Unix timestamp of when the track started playing
+    timestamp: int
+
+    album: Optional[str] = None
+    duration: Optional[int] = None # in seconds
+    mbid: Optional[str] = None
+
+    # Set if the scrobble was saved in the database after failing to send
+    row_id: int = -1
+    attempts: int = 0
@@ -0,0 +1,138 @@
+"""
+Dataclass for storing track metadata shared between queue items,
+and a registry for sharing it across guilds.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
+from sys import intern
+from typing import TYPE_CHECKING, Any, Optional
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from mafic import Track
+
+
+# Fields whose values tend to repeat across a queue, e.g., every track
+# in an album has the same artist, album, and artwork URL. Their values
+# are interned so that each distinct string is only kept in memory once.
+INTERNED_FIELDS = ('artwork', 'artist', 'author', 'album')
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True, eq=False)
+class TrackMetadata:
+    """
+    Dataclass for storing everything about a track that does not depend
+    on who queued it or when. Immutable, so that it can be shared between
+    the queues of different guilds. Use TrackMetadataRegistry.update()
+    to get a modified copy.
+    """
+    # The Spotify ID for the track, if any
+    spotify_id: Optional[str] = None
+
+    # The MusicBrainz ID for the track, if any
+    mbid: Optional[str] = None
+
+    # International Standard Recording Code (ISRC)
+    isrc: Optional[str] = None
+
+    # Direct track URL
+    url: Optional[str] = None
+
+    # Album artwork
+    artwork: Optional[str] = None
+
+    # Track details
+    title: Optional[str] = None
+    artist: Optional[str] = None # First artist
+    author: Optional[str] = None # All artists, separated by ', '
+    album: Optional[str] = None
+    duration: Optional[int] = 0   # milliseconds
+    lavalink_track: Optional['Track'] = None
+
+    # Imperfect match - True when ISRC is present but no match found on YouTube
+    is_imperfect: Optional[bool] = False
+
+    # If annotate_track() was called on this track
+    is_annotated: Optional[bool] = False
+
+    def __post_init__(self):
+        for name in INTERNED_FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                object.__setattr__(self, name, intern(value))
+
+    @property
+    def key(self) -> Optional[str]:
+        """
+        Returns the key this track is shared under, i.e., its Spotify ID,
+        or its ISRC if it has no Spotify ID. Spotify IDs are 22 characters
+        long and ISRCs are 12, so the two can never be mistaken for each other.
+        """
+        return self.spotify_id if self.spotify_id is not None else self.isrc
+
+
+# Names of the fields of TrackMetadata
+METADATA_FIELDS = tuple(field.name for field in fields(TrackMetadata))
+
+
+class TrackMetadataRegistry:
+    """
+    Registry of the TrackMetadata currently in use, keyed by Spotify ID
+    or ISRC, so that a track that is queued in many guilds at once
+    is only kept in memory once.
+
+    Entries are weakly referenced, and disappear as soon as the last
+    queue item pointing to them is gone.
+    """
+    def __init__(self):
+        self._tracks: WeakValueDictionary[str, TrackMetadata] = WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def get(self, metadata: TrackMetadata) -> TrackMetadata:
+        """
+        Returns the shared metadata for a track, registering the given
+        metadata if the track has not been seen before.
+
+        If the track is already registered, any fields missing from the
+        registered metadata are filled in from the given metadata.
+        """
+        key = metadata.key
+        shared = self._tracks.get(key) if key is not None else None
+        if shared is None:
+            self._register(metadata)
+            return metadata
+
+        missing = {
+            name: getattr(metadata, name)
+            for name in METADATA_FIELDS
+            if getattr(shared, name) is None and getattr(metadata, name) is not None
+        }
+        if len(missing) > 0:
+            shared = replace(shared, **missing)
+            self._register(shared)
+        return shared
+
+    def update(self, metadata: TrackMetadata, **changes: Any) -> TrackMetadata:
+        """
+        Returns a copy of the metadata with some fields changed, and makes
+        the copy the shared metadata for the track from now on.
+        Queue items still pointing to the old metadata are unaffected.
+        """
+        if all(getattr(metadata, name) is value for name, value in changes.items()):
+            return metadata
+
+        updated = replace(metadata, **changes)
+        self._register(updated)
+        return updated
+
+    def _register(self, metadata: TrackMetadata):
+        if metadata.key is not None:
+            self._tracks[metadata.key] = metadata
+
+
+# Shared registry for all guilds
+TRACK_METADATA = TrackMetadataRegistry()
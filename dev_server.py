@@ -12,6 +12,7 @@ from subprocess import run
 from database import Database
 from server.main import run_app
 from utils.config import config
+from utils.credentials_cache import CredentialsCache
 
 
 def run_tailwind():
@@ -36,7 +37,7 @@ if __name__ == '__main__':
     thread = threading.Thread(target=run_tailwind)
     thread.start()
 
-    db = Database(config.db_file)
+    db = Database(config.db_file, url=config.database_url)
     loop = asyncio.get_event_loop()
-    loop.create_task(run_app(db, config))
+    loop.create_task(run_app(db, CredentialsCache(db), config))
     loop.run_forever()
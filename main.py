@@ -22,6 +22,10 @@ if __name__ == '__main__':
         logger.debug('  Spotify client ID: %s...', config.spotify_client_id[:3])
         logger.debug('  Spotify client secret: %s...', config.spotify_client_secret[:3])
         logger.debug('  Match ahead: %s', 'enabled' if config.match_ahead else 'disabled')
+        logger.debug(
+            '  Now playing: %s',
+            'edit in place' if config.edit_now_playing else 'send for every track'
+        )
 
         if SENTRY_DSN is not None and SENTRY_ENV is not None:
             logger.debug('  Sentry DSN: %s...', SENTRY_DSN[:10])
@@ -44,6 +48,15 @@ if __name__ == '__main__':
         else:
             logger.debug('  Last.fm integration disabled')
 
+        if config.shard_ids is not None:
+            logger.debug(
+                '  Shards: %s of %d',
+                ', '.join(str(shard_id) for shard_id in config.shard_ids),
+                config.shard_count
+            )
+        else:
+            logger.debug('  Shards: %s', config.shard_count or 'automatic')
+
         logger.debug('  Webserver: %s', 'enabled' if config.enable_server else 'disabled')
         if config.enable_server:
             assert config.discord_oauth_secret is not None
@@ -62,7 +75,12 @@ if __name__ == '__main__':
     # Create bot instance
     intents = Intents.default()
     intents.members = True
-    client = BlancoBot(intents=intents, default_guild_ids=config.debug_guild_ids)
+    client = BlancoBot(
+        intents=intents,
+        default_guild_ids=config.debug_guild_ids,
+        shard_count=config.shard_count,
+        shard_ids=config.shard_ids
+    )
     client.init_config(config)
 
     # Run client
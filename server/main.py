@@ -3,16 +3,17 @@ Main module for the web server.
 """
 
 from base64 import urlsafe_b64decode
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AsyncIterator
 
 import aiohttp_jinja2
 import jinja2
-from aiohttp import web
+from aiohttp import ClientSession, ClientTimeout, web
 from aiohttp.abc import AbstractAccessLogger
 from aiohttp_session import setup as setup_sessions
 from aiohttp_session.cookie_storage import EncryptedCookieStorage
 from cryptography.fernet import Fernet
 
+from utils.constants import USER_AGENT
 from utils.logger import create_logger
 
 from .routes import setup_routes
@@ -20,6 +21,7 @@ from .routes import setup_routes
 if TYPE_CHECKING:
     from database import Database
     from dataclass.config import Config
+    from utils.credentials_cache import CredentialsCache
 
 
 class AccessLogger(AbstractAccessLogger):
@@ -33,7 +35,20 @@ class AccessLogger(AbstractAccessLogger):
         self.logger.info(log_fmt, response.status, request.method, request.path, time*1000)
 
 
-async def run_app(database: 'Database', config: 'Config'):
+async def http_session_ctx(app: web.Application) -> AsyncIterator[None]:
+    """
+    Create the HTTP session that views use to call external APIs,
+    and close it when the app shuts down.
+    """
+    app['http_session'] = ClientSession(
+        headers={'User-Agent': USER_AGENT},
+        timeout=ClientTimeout(total=5)
+    )
+    yield
+    await app['http_session'].close()
+
+
+async def run_app(database: 'Database', credentials: 'CredentialsCache', config: 'Config'):
     """
     Run the web server.
     """
@@ -43,6 +58,8 @@ async def run_app(database: 'Database', config: 'Config'):
     # Create app
     app = web.Application()
     app['db'] = database
+    app['credentials'] = credentials
+    app.cleanup_ctx.append(http_session_ctx)
     app['config'] = config
 
     # Setup sessions
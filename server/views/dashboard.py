@@ -23,20 +23,20 @@ async def dashboard(request: web.Request):
         return web.HTTPFound('/login')
 
     # Get user info
-    database = request.app['db']
-    user: OAuth = database.get_oauth('discord', session['user_id'])
+    credentials = request.app['credentials']
+    user: OAuth = credentials.get_oauth('discord', session['user_id'])
     if user is None:
         return web.HTTPFound('/login')
 
     # Get Spotify info
     spotify_username = None
-    spotify: OAuth = database.get_oauth('spotify', session['user_id'])
+    spotify: OAuth = credentials.get_oauth('spotify', session['user_id'])
     if spotify is not None:
         spotify_username = spotify.username
 
     # Get Last.fm info
     lastfm_username = None
-    lastfm: LastfmAuth = database.get_lastfm_credentials(session['user_id'])
+    lastfm: LastfmAuth = credentials.get_lastfm_credentials(session['user_id'])
     if lastfm is not None:
         lastfm_username = lastfm.username
 
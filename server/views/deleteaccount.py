@@ -16,10 +16,10 @@ async def delete_account(request: web.Request):
         return web.HTTPFound('/login')
 
     # Delete user data from all tables
-    database = request.app['db']
-    database.delete_oauth('discord', session['user_id'])
-    database.delete_oauth('spotify', session['user_id'])
-    database.delete_oauth('lastfm', session['user_id'])
+    credentials = request.app['credentials']
+    credentials.delete_oauth('discord', session['user_id'])
+    credentials.delete_oauth('spotify', session['user_id'])
+    credentials.delete_oauth('lastfm', session['user_id'])
 
     # Redirect to logout
     return web.HTTPFound('/logout')
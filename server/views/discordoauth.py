@@ -2,15 +2,14 @@
 Discord OAuth2 token view. Displayed on redirect from Discord auth flow.
 """
 
+from asyncio import TimeoutError as AsyncioTimeoutError
 from time import time
 
-import requests
-from aiohttp import web
+from aiohttp import ClientError, web
 from aiohttp_session import get_session
-from requests.exceptions import HTTPError, Timeout
 
 from dataclass.oauth import OAuth
-from utils.constants import DISCORD_API_BASE_URL, USER_AGENT
+from utils.constants import DISCORD_API_BASE_URL
 
 
 async def discordoauth(request: web.Request):
@@ -42,52 +41,46 @@ async def discordoauth(request: web.Request):
         return web.HTTPBadRequest(text='Invalid state, try logging in again.')
 
     # Get access token
-    response = requests.post(
-        str(DISCORD_API_BASE_URL / 'oauth2/token'),
-        data={
-            'client_id': oauth_id,
-            'client_secret': oauth_secret,
-            'grant_type': 'authorization_code',
-            'code': code,
-            'redirect_uri': f'{base_url}/discordoauth'
-        },
-        headers={
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'User-Agent': USER_AGENT
-        },
-        timeout=5
-    )
+    http_session = request.app['http_session']
     try:
-        response.raise_for_status()
-    except HTTPError as err:
+        async with http_session.post(
+            str(DISCORD_API_BASE_URL / 'oauth2/token'),
+            data={
+                'client_id': oauth_id,
+                'client_secret': oauth_secret,
+                'grant_type': 'authorization_code',
+                'code': code,
+                'redirect_uri': f'{base_url}/discordoauth'
+            }
+        ) as response:
+            response.raise_for_status()
+            parsed = await response.json()
+    except ClientError as err:
         return web.HTTPBadRequest(text=f'Error getting access token: {err}')
-    except Timeout:
+    except AsyncioTimeoutError:
         return web.HTTPBadRequest(text='Timed out while requesting access token')
 
     # Get user info
-    parsed = response.json()
-    user_info = requests.get(
-        str(DISCORD_API_BASE_URL / 'users/@me'),
-        headers={
-            'Authorization': f'Bearer {parsed["access_token"]}',
-            'User-Agent': USER_AGENT
-        },
-        timeout=5
-    )
     try:
-        user_info.raise_for_status()
-    except HTTPError as err:
+        async with http_session.get(
+            str(DISCORD_API_BASE_URL / 'users/@me'),
+            headers={
+                'Authorization': f'Bearer {parsed["access_token"]}'
+            }
+        ) as user_info:
+            user_info.raise_for_status()
+            user_parsed = await user_info.json()
+    except ClientError as err:
         return web.HTTPBadRequest(text=f'Error getting user info: {err}')
-    except Timeout:
+    except AsyncioTimeoutError:
         return web.HTTPBadRequest(text='Timed out while requesting user info')
 
     # Calculate expiry timestamp
-    user_parsed = user_info.json()
     expires_at = int(time()) + parsed['expires_in']
 
     # Store user info in DB
-    database = request.app['db']
-    database.set_oauth('discord', OAuth(
+    credentials = request.app['credentials']
+    credentials.set_oauth('discord', OAuth(
         user_id=user_parsed['id'],
         username=user_parsed['username'],
         access_token=parsed['access_token'],
@@ -2,15 +2,14 @@
 Last.fm token view. Displayed on redirect from Last.fm auth flow.
 """
 
+from asyncio import TimeoutError as AsyncioTimeoutError
 from hashlib import md5
 
-import requests
-from aiohttp import web
+from aiohttp import ClientError, web
 from aiohttp_session import get_session
-from requests.exceptions import HTTPError, Timeout
 
 from dataclass.oauth import LastfmAuth
-from utils.constants import LASTFM_API_BASE_URL, USER_AGENT
+from utils.constants import LASTFM_API_BASE_URL
 
 
 async def lastfm_token(request: web.Request):
@@ -57,22 +56,16 @@ async def lastfm_token(request: web.Request):
     })
 
     # Get response
-    response = requests.get(
-        str(url),
-        headers={
-            'User-Agent': USER_AGENT
-        },
-        timeout=5
-    )
     try:
-        response.raise_for_status()
-    except HTTPError as err:
+        async with request.app['http_session'].get(url) as response:
+            response.raise_for_status()
+            json = await response.json(content_type=None)
+    except ClientError as err:
         return web.HTTPBadRequest(text=f'Error logging into Last.fm: {err}')
-    except Timeout:
+    except AsyncioTimeoutError:
         return web.HTTPBadRequest(text='Timed out while requesting session key')
 
-    # Get JSON
-    json = response.json()
+    # Get session key and username
     try:
         session_key = json['session']['key']
         username = json['session']['name']
@@ -80,8 +73,8 @@ async def lastfm_token(request: web.Request):
         return web.HTTPBadRequest(text=f'Error logging into Last.fm: missing {err.args[0]}')
 
     # Store user info in DB
-    database = request.app['db']
-    database.set_lastfm_credentials(LastfmAuth(
+    credentials = request.app['credentials']
+    credentials.set_lastfm_credentials(LastfmAuth(
         user_id=user_id,
         username=username,
         session_key=session_key
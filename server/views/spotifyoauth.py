@@ -2,17 +2,15 @@
 Spotify OAuth view. Displayed on redirect from Spotify auth flow.
 """
 
+from asyncio import TimeoutError as AsyncioTimeoutError
 from base64 import b64encode
 from time import time
 
-import requests
-from aiohttp import web
+from aiohttp import ClientError, web
 from aiohttp_session import get_session
-from requests.exceptions import HTTPError, Timeout
 
 from dataclass.oauth import OAuth
-from utils.constants import (SPOTIFY_ACCOUNTS_BASE_URL, SPOTIFY_API_BASE_URL,
-                             USER_AGENT)
+from utils.constants import SPOTIFY_ACCOUNTS_BASE_URL, SPOTIFY_API_BASE_URL
 
 
 async def spotifyoauth(request: web.Request):
@@ -47,51 +45,48 @@ async def spotifyoauth(request: web.Request):
         return web.HTTPBadRequest(text='Invalid state, try logging in again.')
 
     # Get access token
-    response = requests.post(
-        str(SPOTIFY_ACCOUNTS_BASE_URL / 'token'),
-        data={
-            'grant_type': 'authorization_code',
-            'code': code,
-            'redirect_uri': f'{base_url}/spotifyoauth'
-        },
-        headers={
-            'Authorization': f'Basic {b64encode(f"{oauth_id}:{oauth_secret}".encode()).decode()}',
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'User-Agent': USER_AGENT
-        },
-        timeout=5
-    )
+    auth_token = b64encode(f'{oauth_id}:{oauth_secret}'.encode()).decode()
+    http_session = request.app['http_session']
     try:
-        response.raise_for_status()
-    except HTTPError as err:
+        async with http_session.post(
+            str(SPOTIFY_ACCOUNTS_BASE_URL / 'token'),
+            data={
+                'grant_type': 'authorization_code',
+                'code': code,
+                'redirect_uri': f'{base_url}/spotifyoauth'
+            },
+            headers={
+                'Authorization': f'Basic {auth_token}'
+            }
+        ) as response:
+            response.raise_for_status()
+            parsed = await response.json()
+    except ClientError as err:
         return web.HTTPBadRequest(text=f'Error getting Spotify access token: {err}')
-    except Timeout:
+    except AsyncioTimeoutError:
         return web.HTTPBadRequest(text='Timed out while requesting Spotify access token')
 
     # Get user info
-    parsed = response.json()
-    user_info = requests.get(
-        str(SPOTIFY_API_BASE_URL / 'me'),
-        headers={
-            'Authorization': f'Bearer {parsed["access_token"]}',
-            'User-Agent': USER_AGENT
-        },
-        timeout=5
-    )
     try:
-        user_info.raise_for_status()
-    except HTTPError as err:
+        async with http_session.get(
+            str(SPOTIFY_API_BASE_URL / 'me'),
+            headers={
+                'Authorization': f'Bearer {parsed["access_token"]}'
+            }
+        ) as user_info:
+            user_info.raise_for_status()
+            user_parsed = await user_info.json()
+    except ClientError as err:
         return web.HTTPBadRequest(text=f'Error getting Spotify user info: {err}')
-    except Timeout:
+    except AsyncioTimeoutError:
         return web.HTTPBadRequest(text='Timed out while requesting Spotify user info')
 
     # Calculate expiry timestamp
-    user_parsed = user_info.json()
     expires_at = int(time()) + parsed['expires_in']
 
     # Store user info in DB
     database = request.app['db']
-    database.set_oauth('spotify', OAuth(
+    request.app['credentials'].set_oauth('spotify', OAuth(
         user_id=user_id,
         username=user_parsed['id'],
         access_token=parsed['access_token'],
@@ -17,8 +17,8 @@ async def unlink(request: web.Request):
     user_id = session['user_id']
 
     # Get user info
-    database = request.app['db']
-    user = database.get_oauth('discord', user_id)
+    credentials = request.app['credentials']
+    user = credentials.get_oauth('discord', user_id)
     if user is None:
         return web.HTTPFound('/login')
 
@@ -31,7 +31,7 @@ async def unlink(request: web.Request):
     if service not in ('lastfm', 'spotify'):
         raise web.HTTPBadRequest(text=f'Unknown service: {service}')
 
-    database.delete_oauth(service, user_id)
+    credentials.delete_oauth(service, user_id)
 
     # Redirect to dashboard
     return web.HTTPFound('/dashboard')
@@ -4,22 +4,24 @@ Custom bot class for Blanco.
 
 from asyncio import get_event_loop
 from sqlite3 import OperationalError
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
+from aiohttp import ClientSession
 from aiohttp.client_exceptions import ClientConnectorError
 from mafic import EndReason, NodePool, VoiceRegion
-from nextcord import (Activity, ActivityType, Forbidden, HTTPException,
-                      Interaction, NotFound, PartialMessageable, StageChannel,
-                      TextChannel, Thread, VoiceChannel, MessageFlags)
-from nextcord.ext.commands import Bot, ExtensionNotLoaded
+from nextcord import (Activity, ActivityType, Interaction, NotFound,
+                      PartialMessageable, StageChannel, TextChannel, Thread,
+                      VoiceChannel)
+from nextcord.ext.commands import AutoShardedBot, ExtensionNotLoaded
 
 from cogs.player.jockey_helpers import find_lavalink_track
 from database import Database
-from views.now_playing import NowPlayingView
 
+from .credentials_cache import CredentialsCache
 from .embeds import create_error_embed
 from .exceptions import EndOfQueueError, LavalinkSearchError
 from .logger import create_logger
+from .scrobble_queue import ScrobbleQueue
 from .scrobbler import Scrobbler
 from .spotify_client import Spotify
 from .spotify_private import PrivateSpotify
@@ -32,6 +34,7 @@ if TYPE_CHECKING:
 
     from cogs.player.jockey import Jockey
     from dataclass.config import Config
+    from dataclass.oauth import LastfmAuth
 
 
 StatusChannel = Union[PartialMessageable, VoiceChannel, TextChannel, StageChannel, Thread]
@@ -52,14 +55,19 @@ async def match_ahead(logger: 'Logger', *args, **kwargs):
         return None
 
 
-class BlancoBot(Bot):
+class BlancoBot(AutoShardedBot):
     """
     Custom bot class for Blanco.
+
+    Runs every shard in one process by default. Given shard IDs,
+    it only runs those shards, so that guilds can be split between processes
+    that share a PostgreSQL database.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._config: Optional['Config'] = None
         self._db: Optional[Database] = None
+        self._credentials: Optional[CredentialsCache] = None
 
         # Status channels
         self._status_channels: Dict[int, 'StatusChannel'] = {}
@@ -67,6 +75,9 @@ class BlancoBot(Bot):
         # Spotify client
         self._spotify_client: Optional[Spotify] = None
 
+        # HTTP session shared by clients of other APIs
+        self._http_session: Optional[ClientSession] = None
+
         # Lavalink
         self._pool = NodePool(self)
         self._pool_initialized = False
@@ -75,9 +86,11 @@ class BlancoBot(Bot):
         self._logger = create_logger(self.__class__.__name__)
         self._jockey_logger = create_logger('jockey')
 
-        # Scrobblers and private Spotify clients per user
-        self._scrobblers: Dict[int, 'Scrobbler'] = {}
+        # Scrobblers (with the credentials they were made with)
+        # and private Spotify clients per user
+        self._scrobblers: Dict[int, Tuple['LastfmAuth', 'Scrobbler']] = {}
         self._scrobbler_logger = create_logger('scrobbler')
+        self._scrobble_queue = ScrobbleQueue(self)
         self._spotify_clients: Dict[int, PrivateSpotify] = {}
 
         # Annotator tasks
@@ -99,6 +112,15 @@ class BlancoBot(Bot):
             return False
         return self._config.debug_enabled and len(self._config.debug_guild_ids) > 0
 
+    @property
+    def credentials(self) -> CredentialsCache:
+        """
+        Gets the bot's cache of user credentials. See utils/credentials_cache.py.
+        """
+        if self._credentials is None:
+            raise RuntimeError('Database has not been initialized')
+        return self._credentials
+
     @property
     def database(self) -> Database:
         """
@@ -108,6 +130,16 @@ class BlancoBot(Bot):
             raise RuntimeError('Database has not been initialized')
         return self._db
 
+    @property
+    def http_session(self) -> ClientSession:
+        """
+        Gets the bot's HTTP session, which pools connections for API clients.
+        Created on first use, since it has to be created inside the event loop.
+        """
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = ClientSession()
+        return self._http_session
+
     @property
     def jockey_logger(self) -> 'Logger':
         """
@@ -115,6 +147,15 @@ class BlancoBot(Bot):
         """
         return self._jockey_logger
 
+    @property
+    def primary(self) -> bool:
+        """
+        Gets whether this process runs the first shard. Work that only one
+        of several processes should do, e.g., retrying saved scrobbles,
+        is done by the primary process.
+        """
+        return self.shard_ids is None or 0 in self.shard_ids
+
     @property
     def pool(self) -> NodePool:
         """
@@ -129,6 +170,13 @@ class BlancoBot(Bot):
         """
         return self._pool_initialized
 
+    @property
+    def scrobble_queue(self) -> ScrobbleQueue:
+        """
+        Gets the bot's Last.fm scrobble queue. See utils/scrobble_queue.py.
+        """
+        return self._scrobble_queue
+
     @property
     def spotify(self) -> Spotify:
         """
@@ -174,6 +222,10 @@ class BlancoBot(Bot):
                     self._config.base_url
                 )
 
+        # Retry scrobbles saved before the bot was restarted
+        if self._config.lastfm_enabled:
+            self._scrobble_queue.start()
+
         if self.debug:
             self._logger.warning('Debug mode enabled')
             await self.change_presence(
@@ -199,6 +251,16 @@ class BlancoBot(Bot):
             await self.sync_application_commands()
             self._logger.info('Synced commands!')
 
+    async def on_shard_ready(self, shard_id: int):
+        """
+        Called when a shard is ready.
+        """
+        self._logger.info(
+            'Shard %d ready with %d guild(s)',
+            shard_id,
+            sum(1 for guild in self.guilds if guild.shard_id == shard_id)
+        )
+
     async def on_application_command_error(self, itx: Interaction, error: Exception):
         """
         Called when an error occurs while processing an interaction.
@@ -259,6 +321,11 @@ class BlancoBot(Bot):
             guild.name
         )
 
+        # Record the silence since the last track finished, if any
+        gap_ms = event.player.gap_histogram.mark_start()
+        if gap_ms is not None:
+            self._logger.debug('Gap between tracks in %s: %.1f ms', guild.name, gap_ms)
+
         # Send now playing embed
         try:
             await self.send_now_playing(event)
@@ -324,7 +391,8 @@ class BlancoBot(Bot):
                 event.track.title,
                 event.player.guild.name
             )
-            await event.player.skip()
+            event.player.gap_histogram.mark_end()
+            await event.player.handoff()
         elif event.reason == EndReason.STOPPED:
             self._logger.info(
                 'Stopped player in %s',
@@ -355,10 +423,10 @@ class BlancoBot(Bot):
         """
         Gets a Last.fm scrobbler instance for the specified user.
         """
-        assert self._config is not None and self._db is not None
+        assert self._config is not None and self._credentials is not None
 
         # Check if user is authenticated with Last.fm
-        creds = self._db.get_lastfm_credentials(user_id)
+        creds = self._credentials.get_lastfm_credentials(user_id)
         if creds is None:
             if user_id in self._scrobblers:
                 # User must have unlinked their account, so delete the cached scrobbler
@@ -366,34 +434,45 @@ class BlancoBot(Bot):
 
             return None
 
-        # Check if a scrobbler already exists
-        if user_id not in self._scrobblers:
+        # Check if a scrobbler already exists for these credentials,
+        # as the user might have linked another account since
+        cached = self._scrobblers.get(user_id)
+        if cached is None or cached[0] != creds:
             # Create scrobbler
-            self._scrobblers[user_id] = Scrobbler(self._config, creds, self._scrobbler_logger)
+            cached = (creds, Scrobbler(self._config, creds, self._scrobbler_logger))
+            self._scrobblers[user_id] = cached
 
-        return self._scrobblers[user_id]
+        return cached[1]
 
     def get_spotify_client(self, user_id: int) -> Optional[PrivateSpotify]:
         """
         Gets a Spotify client instance for the specified user.
         """
         assert self._config is not None and self._db is not None
+        assert self._credentials is not None
 
         # Try to get credentials
-        creds = self._db.get_oauth('spotify', user_id)
+        creds = self._credentials.get_oauth('spotify', user_id)
         if creds is None:
             # Check if there is a cached client for this user
             if user_id in self._spotify_clients:
                 # User must have unlinked their account, so delete the cached client
-                del self._spotify_clients[user_id]
+                self._spotify_clients.pop(user_id).close()
 
             raise ValueError(f'Please link your Spotify account [here.]({self._config.base_url})')
 
-        # Check if a client already exists
-        if user_id not in self._spotify_clients:
+        # Check if a client already exists for these credentials.
+        # Clients put their refreshed credentials in the cache themselves,
+        # so different credentials mean that the user linked their account again.
+        client = self._spotify_clients.get(user_id)
+        if client is None or client.credentials != creds:
+            if client is not None:
+                client.close()
             self._spotify_clients[user_id] = PrivateSpotify(
                 config=self._config,
                 database=self._db,
+                cache=self._credentials,
+                session=self.http_session,
                 credentials=creds
             )
             self._logger.debug('Created Spotify client for user %d', user_id)
@@ -412,6 +491,14 @@ class BlancoBot(Bot):
         self._status_channels[guild_id] = channel
         self.database.set_status_channel(guild_id, -1 if channel is None else channel.id)
 
+    def owns_guild(self, guild_id: int) -> bool:
+        """
+        Gets whether the specified guild is on one of the shards of this process.
+        """
+        if self.shard_ids is None or self.shard_count is None:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
+
     def get_status_channel(self, guild_id: int) -> Optional['StatusChannel']:
         """
         Gets the status channel for the specified guild.
@@ -454,7 +541,8 @@ class BlancoBot(Bot):
         Initialize the bot with a config.
         """
         self._config = config
-        self._db = Database(config.db_file)
+        self._db = Database(config.db_file, url=config.database_url)
+        self._credentials = CredentialsCache(self._db)
         self._spotify_client = Spotify(
             client_id=config.spotify_client_id,
             client_secret=config.spotify_client_secret
@@ -510,33 +598,25 @@ class BlancoBot(Bot):
 
         self._pool_initialized = True
 
+    async def close(self):
+        """
+        Stops background work that belongs to the bot, then logs out.
+        """
+        for client in self._spotify_clients.values():
+            client.close()
+        if self._http_session is not None:
+            await self._http_session.close()
+        await super().close()
+
     async def send_now_playing(self, event: 'TrackStartEvent[Jockey]'):
         """
         Send a now playing message for the specified track start event.
         """
         guild_id = event.player.guild.id
-        channel = self.get_status_channel(guild_id)
-        if channel is None:
+        if self.get_status_channel(guild_id) is None:
             raise ValueError(f'Status channel has not been set for guild {guild_id}')
 
-        # Delete last now playing message, if it exists
-        last_msg_id = self.database.get_now_playing(guild_id)
-        if last_msg_id != -1:
-            try:
-                last_msg = await channel.fetch_message(last_msg_id)
-                await last_msg.delete()
-            except (Forbidden, HTTPException, NotFound):
-                pass
-
         # Send now playing embed
         current_track = event.player.queue_manager.current
         embed = event.player.now_playing(event.track)
-        view = NowPlayingView(self, event.player, current_track.spotify_id)
-
-        # Send message silently
-        flags = MessageFlags()
-        flags.suppress_notifications = True # pylint: disable=assigning-non-slot
-        msg = await channel.send(embed=embed, view=view, flags=flags)
-
-        # Save now playing message ID
-        self.database.set_now_playing(guild_id, msg.id)
+        await event.player.now_playing_message.send(embed, current_track.spotify_id)
@@ -16,10 +16,12 @@ from dataclass.config import Config, LavalinkNode
 
 
 DATABASE_FILE = None
+DATABASE_URL = None
 DISCORD_TOKEN = None
 SPOTIFY_CLIENT_ID = None
 SPOTIFY_CLIENT_SECRET = None
 MATCH_AHEAD = False
+EDIT_NOW_PLAYING = False
 ENABLE_SERVER = False
 SERVER_PORT = 8080
 SERVER_BASE_URL = None
@@ -36,6 +38,8 @@ REDIS_PASSWORD = None
 DEBUG_ENABLED = False
 DEBUG_GUILDS = None
 REENQUEUE_PAUSED = False
+SHARD_COUNT = None
+SHARD_IDS = None
 
 # Parse config file if it exists
 if isfile('config.yml'):
@@ -48,7 +52,7 @@ if isfile('config.yml'):
         # Get config values
         try:
             # Read config from config.yml
-            DATABASE_FILE = config_file['bot']['database']
+            DATABASE_FILE = config_file['bot'].get('database', None)
             DISCORD_TOKEN = config_file['bot']['discord_token']
             SPOTIFY_CLIENT_ID = config_file['spotify']['client_id']
             SPOTIFY_CLIENT_SECRET = config_file['spotify']['client_secret']
@@ -72,7 +76,11 @@ if isfile('config.yml'):
 
             # Add optional config values
             MATCH_AHEAD = config_file['bot'].get('match_ahead', False)
+            EDIT_NOW_PLAYING = config_file['bot'].get('edit_now_playing', False)
             REENQUEUE_PAUSED = config_file['bot'].get('reenqueue_paused', False)
+            DATABASE_URL = config_file['bot'].get('database_url', None)
+            SHARD_COUNT = config_file['bot'].get('shard_count', None)
+            SHARD_IDS = config_file['bot'].get('shard_ids', None)
             if 'server' in config_file:
                 ENABLE_SERVER = config_file['server']['enabled']
                 SERVER_PORT = config_file['server'].get('port', 8080)
@@ -98,6 +106,7 @@ if isfile('config.yml'):
 
 # Override config from environment variables
 DATABASE_FILE = environ.get('BLANCO_DB_FILE', DATABASE_FILE)
+DATABASE_URL = environ.get('BLANCO_DB_URL', DATABASE_URL)
 DISCORD_TOKEN = environ.get('BLANCO_TOKEN', DISCORD_TOKEN)
 LASTFM_API_KEY = environ.get('BLANCO_LASTFM_KEY', LASTFM_API_KEY)
 LASTFM_SHARED_SECRET = environ.get('BLANCO_LASTFM_SECRET', LASTFM_SHARED_SECRET)
@@ -112,6 +121,12 @@ if 'BLANCO_REENQUEUE_PAUSED' in environ:
     REENQUEUE_PAUSED = environ['BLANCO_REENQUEUE_PAUSED'].lower() == 'true'
 if 'BLANCO_MATCH_AHEAD' in environ:
     MATCH_AHEAD = environ['BLANCO_MATCH_AHEAD'].lower() == 'true'
+if 'BLANCO_EDIT_NOW_PLAYING' in environ:
+    EDIT_NOW_PLAYING = environ['BLANCO_EDIT_NOW_PLAYING'].lower() == 'true'
+if 'BLANCO_SHARD_COUNT' in environ:
+    SHARD_COUNT = int(environ['BLANCO_SHARD_COUNT'])
+if 'BLANCO_SHARD_IDS' in environ:
+    SHARD_IDS = [int(id) for id in environ['BLANCO_SHARD_IDS'].split(',')]
 if 'BLANCO_DEBUG' in environ:
     DEBUG_ENABLED = environ['BLANCO_DEBUG'].lower() == 'true'
     DEBUG_GUILDS = [int(id) for id in environ['BLANCO_DEBUG_GUILDS'].split(',')]
@@ -159,14 +174,18 @@ while True:
 
 
 # Final checks
-if DATABASE_FILE is None:
-    raise ValueError('No database file specified')
+if DATABASE_FILE is None and DATABASE_URL is None:
+    raise ValueError('No database file or URL specified')
 if DISCORD_TOKEN is None:
     raise ValueError('No Discord token specified')
 if SPOTIFY_CLIENT_ID is None:
     raise ValueError('No Spotify client ID specified')
 if SPOTIFY_CLIENT_SECRET is None:
     raise ValueError('No Spotify client secret specified')
+if SHARD_IDS is not None and SHARD_COUNT is None:
+    raise ValueError('Shard count must be specified along with shard IDs')
+if SHARD_IDS is not None and any(not 0 <= id < SHARD_COUNT for id in SHARD_IDS):
+    raise ValueError(f'Shard IDs must be between 0 and {SHARD_COUNT - 1}')
 if ENABLE_SERVER and (DISCORD_OAUTH_ID is None or
                       DISCORD_OAUTH_SECRET is None or SERVER_BASE_URL is None):
     raise ValueError('Discord OAuth ID, secret, and base URL must be specified to enable server')
@@ -175,6 +194,7 @@ if ENABLE_SERVER and (DISCORD_OAUTH_ID is None or
 # Create config object
 config = Config(
     db_file=DATABASE_FILE,
+    database_url=DATABASE_URL,
     discord_token=DISCORD_TOKEN,
     spotify_client_id=SPOTIFY_CLIENT_ID,
     spotify_client_secret=SPOTIFY_CLIENT_SECRET,
@@ -183,11 +203,14 @@ config = Config(
     debug_guild_ids=DEBUG_GUILDS,
     enable_server=ENABLE_SERVER,
     match_ahead=MATCH_AHEAD,
+    edit_now_playing=EDIT_NOW_PLAYING,
     server_port=SERVER_PORT,
     base_url=SERVER_BASE_URL,
     discord_oauth_id=DISCORD_OAUTH_ID,
     discord_oauth_secret=DISCORD_OAUTH_SECRET,
     lastfm_api_key=LASTFM_API_KEY,
     lastfm_shared_secret=LASTFM_SHARED_SECRET,
-    reenqueue_paused=REENQUEUE_PAUSED
+    reenqueue_paused=REENQUEUE_PAUSED,
+    shard_count=SHARD_COUNT,
+    shard_ids=SHARD_IDS
 )
@@ -75,6 +75,60 @@ DURATION_THRESHOLD = 10 * 1000 # 10 seconds
 # to work around a bug in the Lavalink unpausing logic.
 UNPAUSE_THRESHOLD = 60 # 1 minute
 
+# How often the playback position of each player is saved to the database,
+# so that playback can resume close to where it left off after a restart
+POSITION_SAVE_INTERVAL = 15 # 15 seconds
+
+# Spotify playlists with more tracks than this are queued lazily, i.e., as stubs
+# with just a Spotify ID and duration, and the rest of their metadata
+# is only fetched once the tracks are about to be played or shown.
+LAZY_PLAYLIST_THRESHOLD = 500
+
+# How many tracks from the current one onwards have their metadata
+# fetched ahead of time, if they were queued lazily
+MATCH_AHEAD_WINDOW = 10
+
+# Minimum time between edits to a guild's now playing message.
+# Changes made in the meantime are combined into a single edit.
+NOW_PLAYING_EDIT_INTERVAL = 1.0 # 1 second
+
+# When skipping, the next track is tried on its own first. If it can't be played,
+# the tracks after it are looked up this many at a time, so that a run of
+# unplayable tracks doesn't have to be tried one by one
+SKIP_LOOKAHEAD = 4
+
+# If edit_now_playing is enabled, the now playing message is sent again
+# instead of being edited once this many messages have been sent after it
+# in the status channel, so that it doesn't get lost further up the channel.
+NOW_PLAYING_REPOST_THRESHOLD = 10
+
+# Upper bounds, in milliseconds, of the buckets in each guild's histogram
+# of the silence between one track finishing and the next one starting.
+# Gaps longer than the last bound are counted in an overflow bucket.
+GAP_HISTOGRAM_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Scrobbles are sent to Last.fm in batches per user. After the first scrobble
+# comes in, the scrobble queue waits this long for more before sending.
+SCROBBLE_BATCH_DELAY = 1 # 1 second
+
+# Scrobbles that could not be sent are saved to the database
+# and retried this often, until they are too old or have failed too many times.
+# Last.fm does not accept scrobbles older than two weeks.
+SCROBBLE_RETRY_INTERVAL = 5 * 60 # 5 minutes
+SCROBBLE_MAX_AGE = 14 * 24 * 60 * 60 # 14 days
+SCROBBLE_MAX_ATTEMPTS = 10
+
+# How long user credentials are cached in memory before being read again.
+# Changes made through the bot update the cache immediately; this only matters
+# when several processes share a database.
+CREDENTIALS_CACHE_TTL = 5 * 60 # 5 minutes
+
+# Spotify access tokens of users are refreshed in the background
+# this long before they expire, for as long as the user keeps using
+# their Spotify client. Idle clients refresh their token on next use instead.
+SPOTIFY_TOKEN_REFRESH_MARGIN = 5 * 60 # 5 minutes
+SPOTIFY_CLIENT_IDLE_TIMEOUT = 24 * 60 * 60 # 1 day
+
 SPOTIFY_403_ERR_MSG = ''.join([
     '**Error 403** encountered while trying to {}.\n',
     'This is likely because this instance of Blanco uses Spotify API credentials ',
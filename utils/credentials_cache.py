@@ -0,0 +1,96 @@
+"""
+In-memory cache for the OAuth and Last.fm credentials of users.
+"""
+
+from time import monotonic
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+from .constants import CREDENTIALS_CACHE_TTL
+
+if TYPE_CHECKING:
+    from database import Database
+    from dataclass.oauth import LastfmAuth, OAuth
+
+
+Credentials = Union['OAuth', 'LastfmAuth']
+
+
+class CredentialsCache:
+    """
+    Caches the credentials of users in front of the database, so that
+    looking them up on every scrobble or button press costs no queries.
+
+    Users without credentials are cached as well, since most listeners
+    never link their accounts. Everything that links or unlinks accounts
+    has to go through this class, so that the cache stays up to date.
+    Entries also expire after CREDENTIALS_CACHE_TTL seconds, in case another
+    process sharing the same database changes them.
+    """
+    def __init__(self, database: 'Database', /):
+        self._db = database
+
+        # (provider, user ID) -> (expiry time, credentials or None)
+        self._entries: Dict[Tuple[str, int], Tuple[float, Optional[Credentials]]] = {}
+
+    def get_oauth(self, provider: str, user_id: int) -> Optional['OAuth']:
+        """
+        Gets OAuth2 credentials for a user.
+
+        :param provider: Either 'discord' or 'spotify'.
+        :param user_id: The user ID to get credentials for.
+        """
+        return self._get(provider, user_id) # type: ignore
+
+    def set_oauth(self, provider: str, credentials: 'OAuth'):
+        """
+        Saves OAuth2 credentials for a user.
+
+        :param provider: Either 'discord' or 'spotify'.
+        :param credentials: The OAuth2 credentials to save.
+        """
+        self._db.set_oauth(provider, credentials)
+        self._put(provider, credentials.user_id, credentials)
+
+    def get_lastfm_credentials(self, user_id: int) -> Optional['LastfmAuth']:
+        """
+        Gets Last.fm credentials for a user.
+        """
+        return self._get('lastfm', user_id) # type: ignore
+
+    def set_lastfm_credentials(self, credentials: 'LastfmAuth'):
+        """
+        Saves Last.fm credentials for a user.
+        """
+        self._db.set_lastfm_credentials(credentials)
+        self._put('lastfm', credentials.user_id, credentials)
+
+    def delete_oauth(self, provider: str, user_id: int):
+        """
+        Deletes the credentials of a user for a provider.
+
+        :param provider: Either 'discord', 'spotify', or 'lastfm'.
+        :param user_id: The user ID to delete credentials for.
+        """
+        self._db.delete_oauth(provider, user_id)
+        self._put(provider, user_id, None)
+
+    def _get(self, provider: str, user_id: int) -> Optional[Credentials]:
+        """
+        Gets credentials from the cache, or from the database if
+        they are not cached or have expired.
+        """
+        entry = self._entries.get((provider, int(user_id)))
+        if entry is not None and entry[0] > monotonic():
+            return entry[1]
+
+        credentials: Optional[Credentials]
+        if provider == 'lastfm':
+            credentials = self._db.get_lastfm_credentials(user_id)
+        else:
+            credentials = self._db.get_oauth(provider, user_id)
+        self._put(provider, user_id, credentials)
+        return credentials
+
+    def _put(self, provider: str, user_id: int, credentials: Optional[Credentials]):
+        # User IDs from the Discord API are strings
+        self._entries[(provider, int(user_id))] = (monotonic() + CREDENTIALS_CACHE_TTL, credentials)
@@ -0,0 +1,274 @@
+"""
+Sequence with logarithmic-time positional operations, used for large queues.
+"""
+
+from random import random
+from typing import (Dict, Generic, Iterable, Iterator, List, Optional, Tuple,
+                    TypeVar, Union, overload)
+
+T = TypeVar('T')
+
+
+class _Node(Generic[T]):
+    """
+    Node of an implicit treap, i.e., a treap ordered by position
+    instead of by key.
+    """
+    __slots__ = ('value', 'priority', 'size', 'left', 'right', 'parent')
+
+    def __init__(self, value: T):
+        self.value = value
+        self.priority = random()
+        self.size = 1
+        self.left: Optional['_Node[T]'] = None
+        self.right: Optional['_Node[T]'] = None
+        self.parent: Optional['_Node[T]'] = None
+
+
+def _size(node: Optional[_Node]) -> int:
+    return 0 if node is None else node.size
+
+
+def _update(node: _Node):
+    """
+    Recomputes the size of a node and points its children back to it.
+    """
+    node.size = 1 + _size(node.left) + _size(node.right)
+    if node.left is not None:
+        node.left.parent = node
+    if node.right is not None:
+        node.right.parent = node
+
+
+def _split(node: Optional[_Node], count: int) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """
+    Splits a tree into one with its first `count` elements and one with the rest.
+    """
+    if node is None:
+        return None, None
+
+    if _size(node.left) >= count:
+        left, node.left = _split(node.left, count)
+        _update(node)
+        if left is not None:
+            left.parent = None
+        return left, node
+
+    node.right, right = _split(node.right, count - _size(node.left) - 1)
+    _update(node)
+    if right is not None:
+        right.parent = None
+    return node, right
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """
+    Joins two trees, with every element of `left` coming first.
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _build(nodes: List[_Node]) -> Optional[_Node]:
+    """
+    Builds a tree out of nodes in linear time, keeping their order.
+    """
+    stack: List[_Node] = []
+    for node in nodes:
+        last = None
+        while len(stack) > 0 and stack[-1].priority < node.priority:
+            last = stack.pop()
+            _update(last)
+        node.left = last
+        if len(stack) > 0:
+            stack[-1].right = node
+        stack.append(node)
+
+    while len(stack) > 0:
+        _update(stack.pop())
+
+    if len(nodes) == 0:
+        return None
+    root = nodes[0]
+    while root.parent is not None:
+        root = root.parent
+    return root
+
+
+class IndexedSequence(Generic[T]):
+    """
+    List-like sequence that supports inserting, removing, and looking up
+    elements by position, as well as finding the position of an element,
+    in O(log n) time.
+
+    Elements are looked up by identity, so every element must be
+    a distinct object.
+    """
+    def __init__(self, values: Iterable[T] = ()):
+        self._root: Optional[_Node[T]] = None
+        self._nodes: Dict[int, _Node[T]] = {}
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __bool__(self) -> bool:
+        return self._root is not None
+
+    def __contains__(self, value: object) -> bool:
+        return id(value) in self._nodes
+
+    def __iter__(self) -> Iterator[T]:
+        stack: List[_Node[T]] = []
+        node = self._root
+        while len(stack) > 0 or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return list(self._iter_from(start, stop - start))
+        return self._node_at(index).value
+
+    def append(self, value: T):
+        """
+        Appends an element to the end of the sequence.
+        """
+        self._root = _merge(self._root, self._new_node(value))
+
+    def extend(self, values: Iterable[T]):
+        """
+        Appends multiple elements to the end of the sequence.
+        """
+        self._root = _merge(self._root, _build([self._new_node(value) for value in values]))
+
+    def insert(self, index: int, value: T):
+        """
+        Inserts an element before the given index.
+        Like list.insert(), the index is clamped to the bounds of the sequence.
+        """
+        if index < 0:
+            index = max(0, len(self) + index)
+        left, right = _split(self._root, index)
+        self._root = _merge(_merge(left, self._new_node(value)), right)
+
+    def pop(self, index: int = -1) -> T:
+        """
+        Removes and returns the element at the given index.
+        """
+        node = self._node_at(index)
+        self.remove(node.value)
+        return node.value
+
+    def remove(self, value: T):
+        """
+        Removes an element from the sequence.
+
+        Raises:
+            ValueError: If the element is not in the sequence.
+        """
+        index = self.index(value)
+        left, right = _split(self._root, index)
+        _, right = _split(right, 1)
+        self._root = _merge(left, right)
+        if self._root is not None:
+            self._root.parent = None
+        del self._nodes[id(value)]
+
+    def index(self, value: T) -> int:
+        """
+        Returns the index of an element.
+
+        Raises:
+            ValueError: If the element is not in the sequence.
+        """
+        try:
+            node = self._nodes[id(value)]
+        except KeyError as err:
+            raise ValueError('Element is not in sequence') from err
+
+        index = _size(node.left)
+        while node.parent is not None:
+            if node is node.parent.right:
+                index += _size(node.parent.left) + 1
+            node = node.parent
+        return index
+
+    def clear(self):
+        """
+        Removes every element from the sequence.
+        """
+        self._root = None
+        self._nodes.clear()
+
+    def _new_node(self, value: T) -> _Node[T]:
+        if id(value) in self._nodes:
+            raise ValueError('Element is already in sequence')
+        node = _Node(value)
+        self._nodes[id(value)] = node
+        return node
+
+    def _node_at(self, index: int) -> _Node[T]:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('Sequence index out of range')
+
+        node = self._root
+        while node is not None:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+        raise IndexError('Sequence index out of range')
+
+    def _iter_from(self, start: int, count: int) -> Iterator[T]:
+        """
+        Yields `count` elements starting from an index, walking from
+        each node to its successor instead of from the root.
+        """
+        if count <= 0:
+            return
+        node: Optional[_Node[T]] = self._node_at(start)
+        for _ in range(count):
+            assert node is not None
+            yield node.value
+
+            # Find the successor of this node
+            if node.right is not None:
+                node = node.right
+                while node.left is not None:
+                    node = node.left
+            else:
+                while node.parent is not None and node is node.parent.right:
+                    node = node.parent
+                node = node.parent
@@ -5,9 +5,9 @@ Based on https://github.com/toxicrecker/DiscordUtils/blob/master/DiscordUtils/Pa
 but with support for custom home page and adapted for Interaction responses.
 """
 
-from asyncio import sleep
-from itertools import islice
-from typing import TYPE_CHECKING, Callable, List, Optional, Any, Generator
+from collections import OrderedDict
+from typing import (TYPE_CHECKING, Any, Awaitable, Callable, Generator, List,
+                    Optional, Sequence)
 
 from nextcord import Embed, Forbidden, HTTPException, Interaction
 
@@ -17,12 +17,16 @@ if TYPE_CHECKING:
     from nextcord import Message
 
 
-def list_chunks(data: List[Any]) -> Generator[List[Any], Any, Any]:
+def list_chunks(data: Sequence[Any]) -> Generator[List[Any], Any, Any]:
     """
-    Yield 10-element chunks of a list. Used for pagination.
+    Yield 10-element chunks of a sequence. Used for pagination.
     """
     for i in range(0, len(data), 10):
-        yield list(islice(data, i, i + 10))
+        yield list(data[i:i + 10])
+
+
+# How many rendered pages each Paginator keeps around
+PAGE_CACHE_SIZE = 5
 
 
 class Paginator:
@@ -31,12 +35,16 @@ class Paginator:
     """
     def __init__(self, itx: Interaction):
         self.current = 0
-        self.embeds = []
         self.home = 0
         self.itx = itx
         self.msg: Optional['Message'] = None
-        self.original_timeout = 0
-        self.timeout = 0
+        self.page_count = 0
+
+        # Renders a page on demand, see run_lazy()
+        self._page_factory: Callable[[int], Awaitable[Embed]] = self._empty_page
+
+        # Most recently shown pages, oldest first
+        self._page_cache: OrderedDict[int, Embed] = OrderedDict()
 
     async def run(
         self,
@@ -48,53 +56,99 @@ class Paginator:
         """
         Sends the given embeds and adds controls to change pages if there's more than one.
         """
+        async def get_embed(page: int) -> Embed:
+            return embeds[page]
+
+        await self.run_lazy(
+            len(embeds),
+            get_embed,
+            start=start,
+            timeout=timeout,
+            callback=callback
+        )
+
+    async def run_lazy(
+        self,
+        page_count: int,
+        page_factory: Callable[[int], Awaitable[Embed]],
+        start: int = 0,
+        timeout: int = 0,
+        callback: Optional[Callable[[int], None]] = None
+    ):
+        """
+        Like run(), but only renders pages as they are shown, by awaiting
+        page_factory with the index of the page. The last few rendered pages
+        are cached, see PAGE_CACHE_SIZE.
+
+        page_factory is a coroutine function, so that it can load what a page
+        shows before rendering it without blocking the event loop.
+        """
+        self.page_count = page_count
+        self._page_factory = page_factory
+        self._page_cache.clear()
+
         # If there's only one page, just send it as is
-        if len(embeds) == 1:
-            msg = await self.itx.followup.send(embed=embeds[0], wait=True)
+        if page_count == 1:
+            msg = await self.itx.followup.send(embed=await page_factory(0), wait=True)
             if callback is not None:
                 callback(msg.id)
             return
 
-        timeout = timeout if timeout > 0 else 60
-        self.original_timeout = timeout
-        self.timeout = timeout
-
-        # Add footer and timestamp to every embed
-        for i, embed in enumerate(embeds):
-            embed.timestamp = self.itx.created_at
-            embed.set_footer(text=f'Page {i + 1} of {len(embeds)}')
-
-        # Send initial embed and call callback with message ID
+        # Send initial embed and call callback with message ID.
+        # The view removes the controls once they have not been used
+        # for `timeout` seconds, see on_timeout().
         self.home = start
         self.current = start
-        self.embeds = embeds
         msg = await self.itx.followup.send(
-            embed=self.embeds[start],
-            view=PaginatorView(self),
+            embed=await self._get_page(start),
+            view=PaginatorView(self, timeout=timeout if timeout > 0 else 60),
             wait=True
         )
         self.msg = await msg.channel.fetch_message(msg.id)
         if callback is not None:
             callback(msg.id)
 
-        # Remove controls if inactive for more than timeout amount
-        while True:
-            await sleep(1)
-            self.timeout -= 1
-            if self.timeout <= 0:
-                return await self.msg.edit(view=None)
+    async def on_timeout(self):
+        """
+        Removes the controls from the message. Called by PaginatorView
+        once the controls have not been used for a while.
+        """
+        if self.msg is not None:
+            try:
+                await self.msg.edit(view=None)
+            except (Forbidden, HTTPException):
+                pass
+
+    @staticmethod
+    async def _empty_page(_: int) -> Embed:
+        return Embed()
+
+    async def _get_page(self, page: int) -> Embed:
+        """
+        Returns a page from the cache, rendering it first if necessary.
+        """
+        if page in self._page_cache:
+            self._page_cache.move_to_end(page)
+            return self._page_cache[page]
+
+        # Add footer and timestamp
+        embed = await self._page_factory(page)
+        embed.timestamp = self.itx.created_at
+        embed.set_footer(text=f'Page {page + 1} of {self.page_count}')
+
+        self._page_cache[page] = embed
+        if len(self._page_cache) > PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+        return embed
 
     async def _switch_page(self, new_page: int) -> Optional['Message']:
-        self.current = new_page
+        self.current = new_page % self.page_count
         if self.msg is not None:
             try:
-                msg = await self.msg.edit(embed=self.embeds[self.current])
+                return await self.msg.edit(embed=await self._get_page(self.current))
             except (Forbidden, HTTPException):
                 return None
 
-            self.timeout = self.original_timeout
-            return msg
-
     async def first_page(self):
         """
         Switches to the first page.
@@ -124,4 +178,4 @@ class Paginator:
         """
         Switches to the last page.
         """
-        await self._switch_page(len(self.embeds) - 1)
+        await self._switch_page(self.page_count - 1)
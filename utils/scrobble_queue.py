@@ -0,0 +1,187 @@
+"""
+Queue for sending scrobbles to Last.fm in the background.
+"""
+
+from asyncio import Queue
+from asyncio import TimeoutError as AsyncioTimeoutError
+from asyncio import gather, get_event_loop, sleep, wait_for
+from time import monotonic, time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from pylast import PyLastError
+
+from dataclass.scrobble import Scrobble
+
+from .constants import (SCROBBLE_BATCH_DELAY, SCROBBLE_MAX_AGE,
+                        SCROBBLE_MAX_ATTEMPTS, SCROBBLE_RETRY_INTERVAL)
+from .logger import create_logger
+
+if TYPE_CHECKING:
+    from asyncio import Task
+
+    from dataclass.queue_item import QueueItem
+
+    from .blanco import BlancoBot
+
+
+class ScrobbleQueue:
+    """
+    Sends scrobbles to Last.fm from a single background task,
+    so that scrobbling never holds up playback.
+
+    Scrobbles that come in around the same time are grouped by user
+    and sent with one request per user, with the blocking Last.fm client
+    running in an executor. Scrobbles that could not be sent are saved
+    to the database and retried every SCROBBLE_RETRY_INTERVAL seconds.
+    """
+    def __init__(self, bot: 'BlancoBot', /):
+        self._bot = bot
+        self._queue: 'Queue[Scrobble]' = Queue()
+        self._task: Optional['Task'] = None
+        self._last_retry = 0.0
+
+        # Logger
+        self._logger = create_logger(self.__class__.__name__)
+
+    def start(self):
+        """
+        Starts the background task, if it isn't running yet.
+        Saved scrobbles are retried as soon as it starts.
+        """
+        if self._task is None or self._task.done():
+            self._task = get_event_loop().create_task(self._run())
+
+    def put(self, user_ids: Iterable[int], item: 'QueueItem'):
+        """
+        Queues a track to be scrobbled for the given users.
+        Users who have not linked their Last.fm accounts are skipped when sending.
+
+        :param user_ids: The IDs of the users who listened to the track.
+        :param item: The track to scrobble.
+        """
+        if item.artist is None or item.title is None:
+            self._logger.warning('Not scrobbling track with missing artist or title')
+            return
+
+        # Warn if MBID is not set
+        if item.mbid is None:
+            self._logger.warning(
+                'MBID not set for track `%s\'; scrobble might not be accurate.',
+                item.title
+            )
+
+        duration = item.duration
+        if item.lavalink_track is not None:
+            duration = item.lavalink_track.length
+
+        for user_id in user_ids:
+            self._queue.put_nowait(Scrobble(
+                user_id=user_id,
+                artist=item.artist,
+                title=item.title,
+                timestamp=item.start_time if item.start_time is not None else int(time()),
+                album=item.album,
+                duration=duration // 1000 if duration is not None else None,
+                mbid=item.mbid
+            ))
+
+        self.start()
+
+    async def _run(self):
+        """
+        Sends queued scrobbles in batches, and retries saved scrobbles periodically.
+        """
+        while True:
+            # Retry saved scrobbles if it's time.
+            # When sharded across processes, only one of them does this.
+            wait = self._last_retry + SCROBBLE_RETRY_INTERVAL - monotonic()
+            if wait <= 0:
+                self._last_retry = monotonic()
+                if self._bot.primary:
+                    await self._retry()
+                continue
+
+            # Wait for the first scrobble, then give others a moment to come in
+            try:
+                batch = [await wait_for(self._queue.get(), timeout=wait)]
+            except AsyncioTimeoutError:
+                continue
+            await sleep(SCROBBLE_BATCH_DELAY)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Save what could not be sent
+            failed = await self._send(batch)
+            if len(failed) > 0:
+                database = self._bot.database
+                await database.run(database.add_pending_scrobbles, failed)
+                self._logger.warning('Saved %d scrobble(s) to retry later', len(failed))
+
+    async def _retry(self):
+        """
+        Sends saved scrobbles again, and drops the ones that
+        are too old or have failed too many times.
+        """
+        database = self._bot.database
+        pending = await database.run(database.get_pending_scrobbles)
+        if len(pending) == 0:
+            return
+
+        # Drop scrobbles that Last.fm will not accept anymore
+        cutoff = int(time()) - SCROBBLE_MAX_AGE
+        expired = [
+            scrobble for scrobble in pending
+            if scrobble.timestamp < cutoff or scrobble.attempts >= SCROBBLE_MAX_ATTEMPTS
+        ]
+        expired_ids = {scrobble.row_id for scrobble in expired}
+        pending = [scrobble for scrobble in pending if scrobble.row_id not in expired_ids]
+
+        failed = await self._send(pending)
+        for scrobble in failed:
+            scrobble.attempts += 1
+        failed_ids = {scrobble.row_id for scrobble in failed}
+        await database.run(database.set_pending_scrobble_attempts, failed)
+        await database.run(database.delete_pending_scrobbles, [
+            scrobble.row_id for scrobble in expired + pending
+            if scrobble.row_id not in failed_ids
+        ])
+        self._logger.info(
+            'Retried %d saved scrobble(s): %d sent, %d failed, %d dropped',
+            len(pending),
+            len(pending) - len(failed),
+            len(failed),
+            len(expired)
+        )
+
+    async def _send(self, scrobbles: List[Scrobble]) -> List[Scrobble]:
+        """
+        Sends scrobbles for every user at the same time.
+
+        :return: The scrobbles that could not be sent.
+        """
+        by_user: Dict[int, List[Scrobble]] = {}
+        for scrobble in scrobbles:
+            by_user.setdefault(scrobble.user_id, []).append(scrobble)
+
+        results = await gather(*(
+            self._send_for_user(user_id, user_scrobbles)
+            for user_id, user_scrobbles in by_user.items()
+        ))
+        return [scrobble for failed in results for scrobble in failed]
+
+    async def _send_for_user(self, user_id: int, scrobbles: List[Scrobble]) -> List[Scrobble]:
+        """
+        Sends scrobbles for a single user in an executor.
+
+        :return: The scrobbles that could not be sent.
+        """
+        scrobbler = self._bot.get_scrobbler(user_id)
+        if scrobbler is None:
+            # User has not linked their account, or has unlinked it since
+            return []
+
+        try:
+            await get_event_loop().run_in_executor(None, scrobbler.scrobble_many, scrobbles)
+        except PyLastError:
+            return scrobbles
+        return []
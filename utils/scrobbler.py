@@ -2,9 +2,7 @@
 Last.fm scrobbling client.
 """
 
-from datetime import datetime
-from time import mktime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
 import pylast
 
@@ -13,7 +11,7 @@ if TYPE_CHECKING:
 
     from dataclass.config import Config
     from dataclass.oauth import LastfmAuth
-    from dataclass.queue_item import QueueItem
+    from dataclass.scrobble import Scrobble
 
 
 class Scrobbler:
@@ -39,44 +37,36 @@ class Scrobbler:
         self._logger = logger
         self._logger.debug('Created scrobbler for user %d', creds.user_id)
 
-    def scrobble(self, track: 'QueueItem'):
+    def scrobble_many(self, scrobbles: List['Scrobble']):
         """
-        Scrobbles a QueueItem from the music player.
-        """
-        timestamp = track.start_time
-        if timestamp is None:
-            timestamp = int(mktime(datetime.now().timetuple()))
-
-        duration = None
-        if track.duration is not None:
-            duration = track.duration // 1000
-
-        # Warn if MBID is not set
-        if track.mbid is None:
-            self._logger.warning(
-                'MBID not set for track `%s\'; scrobble might not be accurate.',
-                track.title
-            )
+        Scrobbles multiple tracks in as few requests as possible.
+        Blocks until Last.fm responds, so it should be run in an executor.
 
+        :raises pylast.PyLastError: If the scrobbles could not be sent.
+        """
         try:
-            self._net.scrobble(
-                artist=track.artist,
-                title=track.title,
-                timestamp=timestamp,
-                duration=duration,
-                mbid=track.mbid
-            )
+            self._net.scrobble_many([
+                {
+                    'artist': scrobble.artist,
+                    'title': scrobble.title,
+                    'timestamp': scrobble.timestamp,
+                    'album': scrobble.album,
+                    'duration': scrobble.duration,
+                    'mbid': scrobble.mbid
+                }
+                for scrobble in scrobbles
+            ])
         except pylast.PyLastError as err:
             self._logger.error(
-                'Error scrobbling `%s\' for user %d: %s',
-                track.title,
+                'Error scrobbling %d track(s) for user %d: %s',
+                len(scrobbles),
                 self._user_id,
                 err
             )
             raise
 
         self._logger.debug(
-            'Scrobbled `%s\' for user %d',
-            track.title,
+            'Scrobbled %d track(s) for user %d',
+            len(scrobbles),
             self._user_id
         )
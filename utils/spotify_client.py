@@ -20,6 +20,9 @@ from .time import human_readable_time
 # Retry logger
 RETRY_LOGGER = create_logger('spotify_retry')
 
+# Maximum number of track IDs per request to the Get Several Tracks endpoint
+TRACKS_BATCH_SIZE = 50
+
 
 def log_call(retry_state: RetryCallState) -> None:
     """
@@ -179,6 +182,99 @@ class Spotify:
 
         return extract_track_info(result)
 
+    @retry(
+        retry=retry_if_exception_type(RequestsConnectionError),
+        stop=stop_after_attempt(3),
+        wait=wait_fixed(1) + wait_random(0, 2),
+        before=log_call,
+        before_sleep=log_failure
+    )
+    def get_tracks_by_id(self, track_ids: List[str]) -> Dict[str, SpotifyTrack]:
+        """
+        Returns SpotifyTrack objects for a list of track IDs, keyed by track ID.
+        Tracks are fetched in batches of TRACKS_BATCH_SIZE, and tracks that
+        do not exist are left out.
+        """
+        tracks: Dict[str, SpotifyTrack] = {}
+
+        # Check cache
+        missing = []
+        for track_id in track_ids:
+            cached_track = REDIS.get_spotify_track(track_id) if REDIS is not None else None
+            if cached_track is not None:
+                tracks[track_id] = cached_track
+            else:
+                missing.append(track_id)
+
+        for i in range(0, len(missing), TRACKS_BATCH_SIZE):
+            response = self._client.tracks(missing[i:i + TRACKS_BATCH_SIZE])
+            if response is None:
+                continue
+
+            for result in response['tracks']:
+                if result is None:
+                    continue
+                track = extract_track_info(result)
+                tracks[track.spotify_id] = track
+
+                # Save to cache
+                if REDIS is not None:
+                    REDIS.set_spotify_track(track.spotify_id, track)
+
+        return tracks
+
+    @retry(
+        retry=retry_if_exception_type(RequestsConnectionError),
+        stop=stop_after_attempt(3),
+        wait=wait_fixed(1) + wait_random(0, 2),
+        before=log_call,
+        before_sleep=log_failure
+    )
+    def get_playlist_size(self, playlist_id: str) -> int:
+        """
+        Returns the number of tracks in a playlist.
+        """
+        response = self._client.playlist(playlist_id, fields='tracks.total')
+        if response is None:
+            raise SpotifyInvalidURLError(f'spotify:playlist:{playlist_id}')
+        return response['tracks']['total']
+
+    @retry(
+        retry=retry_if_exception_type(RequestsConnectionError),
+        stop=stop_after_attempt(3),
+        wait=wait_fixed(1) + wait_random(0, 2),
+        before=log_call,
+        before_sleep=log_failure
+    )
+    def get_playlist_track_ids(self, playlist_id: str) -> List[Tuple[str, int]]:
+        """
+        Returns the ID and duration in milliseconds of every track in a playlist,
+        without any other metadata. Use get_tracks_by_id() to get the rest.
+        May take a long time to complete if the playlist is large.
+        """
+        offset = 0
+        tracks = []
+        while True:
+            response = self._client.playlist_items(
+                playlist_id,
+                offset=offset,
+                fields='items.track.id,items.track.duration_ms',
+                additional_types=['track']
+            )
+            if response is None:
+                raise SpotifyInvalidURLError(f'spotify:playlist:{playlist_id}')
+            if len(response['items']) == 0:
+                break
+
+            tracks.extend(
+                (item['track']['id'], int(item['track']['duration_ms']))
+                for item in response['items']
+                if item['track'] is not None and item['track']['id'] is not None
+            )
+            offset = offset + len(response['items'])
+
+        return tracks
+
     @retry(
         retry=retry_if_exception_type(RequestsConnectionError),
         stop=stop_after_attempt(3),
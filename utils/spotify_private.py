@@ -5,24 +5,33 @@ the user has already authorized the application and wants to access
 their data through Blanco.
 """
 
+from asyncio import Lock
+from asyncio import TimeoutError as AsyncioTimeoutError
+from asyncio import get_event_loop, sleep
 from base64 import b64encode
 from time import time
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-import requests
-from requests import HTTPError, Timeout
+from aiohttp import ClientError, ClientResponseError, ClientTimeout
 
 from dataclass.oauth import OAuth
 from dataclass.spotify import SpotifyResult
 
 from .constants import (SPOTIFY_ACCOUNTS_BASE_URL, SPOTIFY_API_BASE_URL,
-                        USER_AGENT)
+                        SPOTIFY_CLIENT_IDLE_TIMEOUT,
+                        SPOTIFY_TOKEN_REFRESH_MARGIN, USER_AGENT)
 from .logger import create_logger
 
 if TYPE_CHECKING:
+    from asyncio import Task
+
+    from aiohttp import ClientSession
+
     from database import Database
     from dataclass.config import Config
 
+    from .credentials_cache import CredentialsCache
+
 
 class PrivateSpotify:
     """
@@ -30,144 +39,229 @@ class PrivateSpotify:
     obtained using the Authorization Code Flow. Used for instances where
     the user has already authorized the application and wants to access
     their data through Blanco.
+
+    Requests are made on the bot's shared HTTP session. While the client
+    is in use, a background task refreshes the access token
+    SPOTIFY_TOKEN_REFRESH_MARGIN seconds before it expires, so requests
+    don't have to wait for a refresh.
     """
-    def __init__(self, config: 'Config', database: 'Database', credentials: 'OAuth'):
+    def __init__(
+        self,
+        config: 'Config',
+        database: 'Database',
+        cache: 'CredentialsCache',
+        session: 'ClientSession',
+        credentials: 'OAuth'
+    ):
         self._client_id = config.spotify_client_id
         self._client_secret = config.spotify_client_secret
         self._credentials = credentials
         self._db = database
+        self._cache = cache
+        self._session = session
         self._logger = create_logger(self.__class__.__name__)
 
-    def _refresh_token(self):
+        # Token refresh
+        self._refresh_lock = Lock()
+        self._refresher: Optional['Task'] = None
+        self._last_used = time()
+
+    @property
+    def credentials(self) -> 'OAuth':
+        """
+        Gets the credentials currently used by this client.
+        """
+        return self._credentials
+
+    def close(self):
+        """
+        Stops refreshing the access token, e.g., when the client is being replaced.
+        """
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+
+    async def _refresh_token(self):
         """
         Refresh the access token for a user.
+
+        :raises aiohttp.ClientResponseError: If Spotify rejected the refresh.
+            The user's credentials are deleted if the refresh token was revoked.
+        :raises asyncio.TimeoutError: If Spotify did not respond in time.
         """
         auth_token = b64encode(f"{self._client_id}:{self._client_secret}".encode()).decode()
-        response = requests.post(
-            str(SPOTIFY_ACCOUNTS_BASE_URL / 'token'),
-            headers={
-                'Authorization': f'Basic {auth_token}',
-            },
-            data={
-                'grant_type': 'refresh_token',
-                'refresh_token': self._credentials.refresh_token
-            },
-            timeout=10
-        )
-
         try:
-            response.raise_for_status()
-        except HTTPError as err:
+            async with self._session.post(
+                str(SPOTIFY_ACCOUNTS_BASE_URL / 'token'),
+                headers={
+                    'Authorization': f'Basic {auth_token}',
+                },
+                data={
+                    'grant_type': 'refresh_token',
+                    'refresh_token': self._credentials.refresh_token
+                },
+                timeout=ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                parsed = await response.json()
+        except ClientResponseError as err:
             self._logger.error(
                 'Error refreshing Spotify access token for user %d: %s',
                 self._credentials.user_id,
                 err
             )
+
+            # The user revoked access, so delete their credentials
+            if err.status == 400:
+                self._cache.delete_oauth('spotify', self._credentials.user_id)
             raise
-        except Timeout:
+        except AsyncioTimeoutError:
             self._logger.error(
                 'Timed out while refreshing Spotify access token for user %d',
                 self._credentials.user_id
             )
-
-            # Delete the user's credentials from the database
-            self._db.delete_oauth('spotify', self._credentials.user_id)
             raise
 
         # Update the credentials
-        parsed = response.json()
         new_credentials = OAuth(
             user_id=self._credentials.user_id,
             username=self._credentials.username,
             access_token=parsed['access_token'],
-            refresh_token=self._credentials.refresh_token,
+            refresh_token=parsed.get('refresh_token', self._credentials.refresh_token),
             expires_at=int(time() + parsed['expires_in'])
         )
-        self._db.set_oauth('spotify', new_credentials)
+        self._cache.set_oauth('spotify', new_credentials)
         self._db.set_spotify_scopes(self._credentials.user_id, parsed['scope'].split(' '))
         self._credentials = new_credentials
 
-    def _ensure_auth(self):
+    def _needs_refresh(self) -> bool:
         """
-        Makes sure that the credentials are up to date.
+        Returns whether the access token is due to be refreshed in the background.
         """
+        return self._credentials.expires_at < time() + SPOTIFY_TOKEN_REFRESH_MARGIN
+
+    async def _ensure_auth(self):
+        """
+        Makes sure that the credentials are up to date,
+        and that they will be kept up to date in the background.
+        """
+        self._last_used = time()
+        if self._refresher is None or self._refresher.done():
+            self._refresher = get_event_loop().create_task(self._refresh_loop())
+
+        # Only happens if the client has been idle,
+        # since the refresher would have refreshed the token otherwise
         if self._credentials.expires_at < time() + 60:
-            # Refresh token
-            self._logger.debug(
-                'Refreshing Spotify token for user %d',
-                self._credentials.user_id
-            )
-            self._refresh_token()
+            async with self._refresh_lock:
+                if self._credentials.expires_at < time() + 60:
+                    self._logger.debug(
+                        'Refreshing Spotify token for user %d',
+                        self._credentials.user_id
+                    )
+                    await self._refresh_token()
 
-    def get_user_playlists(self) -> List[SpotifyResult]:
+    async def _refresh_loop(self):
         """
-        Gets a list of 25 of the user's playlists.
+        Refreshes the access token shortly before it expires,
+        until the client has been idle for SPOTIFY_CLIENT_IDLE_TIMEOUT seconds.
         """
-        self._ensure_auth()
-        response = requests.get(
-            str(SPOTIFY_API_BASE_URL / 'me' / 'playlists'),
-            headers={
-                'Authorization': f'Bearer {self._credentials.access_token}',
-                'User-Agent': USER_AGENT
-            },
-            params={
-                'limit': 25
-            },
-            timeout=10
+        while time() - self._last_used < SPOTIFY_CLIENT_IDLE_TIMEOUT:
+            due = self._credentials.expires_at - SPOTIFY_TOKEN_REFRESH_MARGIN
+            await sleep(max(0, due - time()))
+
+            async with self._refresh_lock:
+                if not self._needs_refresh():
+                    continue
+
+                self._logger.debug(
+                    'Refreshing Spotify token for user %d in the background',
+                    self._credentials.user_id
+                )
+                try:
+                    await self._refresh_token()
+                    continue
+                except ClientResponseError as err:
+                    if err.status == 400:
+                        # Credentials were deleted
+                        return
+                except (AsyncioTimeoutError, ClientError):
+                    pass
+
+            # Try again in a minute, without holding up requests
+            await sleep(60)
+
+        self._logger.debug(
+            'Stopped refreshing Spotify token for idle user %d',
+            self._credentials.user_id
         )
 
+    async def get_user_playlists(self) -> List[SpotifyResult]:
+        """
+        Gets a list of 25 of the user's playlists.
+        """
+        await self._ensure_auth()
         try:
-            response.raise_for_status()
-        except HTTPError as err:
+            async with self._session.get(
+                str(SPOTIFY_API_BASE_URL / 'me' / 'playlists'),
+                headers={
+                    'Authorization': f'Bearer {self._credentials.access_token}',
+                    'User-Agent': USER_AGENT
+                },
+                params={
+                    'limit': 25
+                },
+                timeout=ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                parsed = await response.json()
+        except ClientResponseError as err:
             self._logger.error(
                 'Error %d getting Spotify playlists for user %d.\n%s',
-                err.response.status_code if err.response is not None else -1,
+                err.status,
                 self._credentials.user_id,
                 err
             )
             raise
-        except Timeout:
+        except AsyncioTimeoutError:
             self._logger.error(
                 'Timed out while getting Spotify playlists for user %d',
                 self._credentials.user_id
             )
             return []
 
-        parsed = response.json()
         return [SpotifyResult(
             name=playlist['name'],
             description=f'{playlist["tracks"]["total"]} tracks',
             spotify_id=playlist['id']
         ) for playlist in parsed['items']]
 
-    def save_track(self, spotify_id: str):
+    async def save_track(self, spotify_id: str):
         """
         Adds a track to the user's Liked Songs.
         """
-        self._ensure_auth()
-        response = requests.put(
-            str(SPOTIFY_API_BASE_URL / 'me' / 'tracks'),
-            headers={
-                'Authorization': f'Bearer {self._credentials.access_token}',
-                'User-Agent': USER_AGENT
-            },
-            params={
-                'ids': spotify_id
-            },
-            timeout=10
-        )
-
+        await self._ensure_auth()
         try:
-            response.raise_for_status()
-        except HTTPError as err:
+            async with self._session.put(
+                str(SPOTIFY_API_BASE_URL / 'me' / 'tracks'),
+                headers={
+                    'Authorization': f'Bearer {self._credentials.access_token}',
+                    'User-Agent': USER_AGENT
+                },
+                params={
+                    'ids': spotify_id
+                },
+                timeout=ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+        except ClientResponseError as err:
             self._logger.error(
                 'Error %d while trying to Like track %s.\n%s',
-                err.response.status_code if err.response is not None else -1,
+                err.status,
                 spotify_id,
                 err
             )
             raise
-        except Timeout:
+        except AsyncioTimeoutError:
             self._logger.error(
                 'Timed out while liking track %s',
                 spotify_id
@@ -2,11 +2,12 @@
 Now Playing view for the player.
 """
 
+from asyncio import TimeoutError as AsyncioTimeoutError
 from typing import TYPE_CHECKING, Optional
 
+from aiohttp import ClientResponseError
 from nextcord import ButtonStyle
 from nextcord.ui import Button, View, button
-from requests.exceptions import HTTPError, Timeout
 
 from utils.constants import SPOTIFY_403_ERR_MSG
 from utils.embeds import create_error_embed, create_success_embed
@@ -71,7 +72,8 @@ class NowPlayingView(View):
         self._player = player
 
         # Add shuffle button
-        self.add_item(ShuffleButton(player.queue_manager.is_shuffling))
+        self._shuffle_button = ShuffleButton(player.queue_manager.is_shuffling)
+        self.add_item(self._shuffle_button)
 
     @property
     def cog(self) -> 'PlayerCog':
@@ -87,6 +89,20 @@ class NowPlayingView(View):
         """
         return self._player
 
+    def update(self, spotify_id: Optional[str] = None):
+        """
+        Rebinds the view to a new track, for when the now playing message
+        is edited in place instead of being sent again.
+
+        :param spotify_id: The Spotify ID of the new track, if any.
+        """
+        self._spotify_id = spotify_id
+        self._shuffle_button.label = 'Unshuffle' if self._player.queue_manager.is_shuffling \
+            else 'Shuffle'
+
+        # New tracks always start unpaused
+        self.toggle_pause.label = '⏸️' # type: ignore
+
     async def check_mutual_voice(self, interaction: 'Interaction') -> bool:
         """
         Check if the user is in the same voice channel as the bot.
@@ -171,20 +187,13 @@ class NowPlayingView(View):
 
         # Save track
         try:
-            spotify.save_track(self._spotify_id)
-        except HTTPError as err:
-            if err.response is not None:
-                if err.response.status_code == 403:
-                    message = SPOTIFY_403_ERR_MSG.format('Like this track')
-                else:
-                    message = ''.join([
-                        f'**Error {err.response.status_code}** while trying to Like this track.',
-                        'Please try again later.\n',
-                        f'```\n{err}```'
-                    ])
+            await spotify.save_track(self._spotify_id)
+        except ClientResponseError as err:
+            if err.status == 403:
+                message = SPOTIFY_403_ERR_MSG.format('Like this track')
             else:
                 message = ''.join([
-                    'Error while trying to Like this track.',
+                    f'**Error {err.status}** while trying to Like this track.',
                     'Please try again later.\n',
                     f'```\n{err}```'
                 ])
@@ -193,7 +202,7 @@ class NowPlayingView(View):
                 embed=create_error_embed(message),
                 ephemeral=True
             )
-        except Timeout as err:
+        except AsyncioTimeoutError as err:
             return await interaction.followup.send(
                 embed=create_error_embed('\n'.join([
                     'Timed out while trying to Like this track.',
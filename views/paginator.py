@@ -17,9 +17,17 @@ class PaginatorView(View):
     Controls for the Paginator. See utils/paginator.py for more information.
     """
     def __init__(self, paginator, timeout: int = 60):
-        super().__init__(timeout=None)
+        # nextcord restarts the timeout whenever a button is pressed,
+        # and sleeps until it runs out instead of polling
+        super().__init__(timeout=timeout)
         self.paginator = paginator
 
+    async def on_timeout(self):
+        """
+        Remove the controls once they have not been used for a while.
+        """
+        await self.paginator.on_timeout()
+
     @button(label='⏮️', style=ButtonStyle.grey)
     async def first_page(self, _b: 'Button', _i: 'Interaction'):
         """